@@ -34,6 +34,105 @@ CREATE TABLE Transactions (
     CONSTRAINT fk_account FOREIGN KEY (account_id) REFERENCES Accounts(account_id)
 );
 
+-- Cold tier of the ledger: BankDatabase.archive_transactions() moves rows
+-- older than the hot horizon here in batches. No counter trigger - the
+-- counters already include every archived row. Monthly interval
+-- partitions let whole cold months be compressed, moved or dropped.
+CREATE TABLE Transactions_Archive (
+    transaction_id NUMBER(15) PRIMARY KEY,
+    account_id NUMBER(10) NOT NULL,
+    transaction_type VARCHAR2(20) NOT NULL,
+    amount NUMBER(15,2) NOT NULL,
+    balance_after NUMBER(15,2) NOT NULL,
+    transaction_date DATE NOT NULL,
+    description VARCHAR2(200),
+    reference_account VARCHAR2(20),
+    CONSTRAINT fk_archive_account FOREIGN KEY (account_id) REFERENCES Accounts(account_id)
+)
+PARTITION BY RANGE (transaction_date) INTERVAL (NUMTOYMINTERVAL(1, 'MONTH'))
+(PARTITION p_archive_start VALUES LESS THAN (DATE '2000-01-01'));
+
+-- Running aggregates maintained by triggers in the same transaction as
+-- every posting, so the dashboards read counters instead of scanning.
+-- Bank-wide totals are striped over 16 slots (MOD(account_id, 16)) to
+-- avoid a single hot row; readers SUM the slots.
+CREATE TABLE Account_Counters (
+    account_id NUMBER(10) PRIMARY KEY,
+    transaction_count NUMBER(15) DEFAULT 0 NOT NULL,
+    CONSTRAINT fk_counter_account FOREIGN KEY (account_id) REFERENCES Accounts(account_id)
+);
+
+CREATE TABLE Bank_Totals (
+    slot NUMBER(3) PRIMARY KEY,
+    active_accounts NUMBER(10) DEFAULT 0 NOT NULL,
+    total_balance NUMBER(17,2) DEFAULT 0 NOT NULL,
+    total_transactions NUMBER(15) DEFAULT 0 NOT NULL
+);
+
+-- Interest posting runs (bank_interest.py): one row per period. The run
+-- advances last_account_id as each chunk commits, so an interrupted run
+-- resumes where it stopped and a Completed period is never posted twice.
+CREATE TABLE Interest_Runs (
+    period VARCHAR2(7) PRIMARY KEY, -- YYYY-MM
+    method VARCHAR2(10) NOT NULL CHECK (method IN ('monthly', 'daily')),
+    status VARCHAR2(10) NOT NULL CHECK (status IN ('Running', 'Completed')),
+    last_account_id NUMBER(10) DEFAULT 0 NOT NULL,
+    accounts_posted NUMBER(10) DEFAULT 0 NOT NULL,
+    total_interest NUMBER(17,2) DEFAULT 0 NOT NULL,
+    started_date DATE NOT NULL,
+    completed_date DATE
+);
+
+CREATE TABLE Interest_Run_Totals (
+    period VARCHAR2(7) NOT NULL,
+    account_type VARCHAR2(20) NOT NULL,
+    accounts_posted NUMBER(10) DEFAULT 0 NOT NULL,
+    total_interest NUMBER(17,2) DEFAULT 0 NOT NULL,
+    CONSTRAINT pk_interest_run_totals PRIMARY KEY (period, account_type),
+    CONSTRAINT fk_interest_run FOREIGN KEY (period) REFERENCES Interest_Runs(period)
+);
+
+INSERT INTO Bank_Totals (slot) SELECT LEVEL - 1 FROM DUAL CONNECT BY LEVEL <= 16;
+
+CREATE OR REPLACE TRIGGER trg_accounts_totals
+AFTER INSERT OR UPDATE OF balance, status ON Accounts
+FOR EACH ROW
+DECLARE
+    v_active_delta NUMBER := 0;
+BEGIN
+    IF INSERTING THEN
+        INSERT INTO Account_Counters (account_id, transaction_count)
+        VALUES (:NEW.account_id, 0);
+    END IF;
+
+    IF :NEW.status = 'Active' THEN
+        v_active_delta := 1;
+    END IF;
+    IF UPDATING AND :OLD.status = 'Active' THEN
+        v_active_delta := v_active_delta - 1;
+    END IF;
+
+    UPDATE Bank_Totals
+    SET active_accounts = active_accounts + v_active_delta,
+        total_balance = total_balance + :NEW.balance - NVL(:OLD.balance, 0)
+    WHERE slot = MOD(:NEW.account_id, 16);
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_transactions_counters
+AFTER INSERT ON Transactions
+FOR EACH ROW
+BEGIN
+    UPDATE Account_Counters
+    SET transaction_count = transaction_count + 1
+    WHERE account_id = :NEW.account_id;
+
+    UPDATE Bank_Totals
+    SET total_transactions = total_transactions + 1
+    WHERE slot = MOD(:NEW.account_id, 16);
+END;
+/
+
 CREATE SEQUENCE customer_seq START WITH 1001 INCREMENT BY 1;
 CREATE SEQUENCE account_seq START WITH 100001 INCREMENT BY 1;
 CREATE SEQUENCE transaction_seq START WITH 1 INCREMENT BY 1;
@@ -42,9 +141,17 @@ CREATE INDEX idx_account_number ON Accounts(account_number);
 
 CREATE INDEX idx_customer_email ON Customers(email);
 
-CREATE INDEX idx_transaction_account ON Transactions(account_id);
+-- Serves per-account history in date order and keyset pagination on
+-- (transaction_date, transaction_id)
+CREATE INDEX idx_transaction_account_date ON Transactions(account_id, transaction_date, transaction_id);
 
-CREATE INDEX idx_transaction_date ON Transactions(transaction_date);
+-- Oldest-first batches of the archive job
+CREATE INDEX idx_transaction_date ON Transactions(transaction_date, transaction_id);
+
+-- Global, so one account's archived history is a single range scan
+CREATE INDEX idx_archive_account_date ON Transactions_Archive(account_id, transaction_date, transaction_id);
+
+CREATE INDEX idx_archive_date ON Transactions_Archive(transaction_date) LOCAL;
 
 CREATE INDEX idx_account_customer ON Accounts(customer_id, status);
 
@@ -162,6 +269,7 @@ EXCEPTION
         ROLLBACK;
         RAISE;
 END;
+/
 
 CREATE OR REPLACE PROCEDURE deposit_money(
     p_account_number IN VARCHAR2,
@@ -172,15 +280,17 @@ CREATE OR REPLACE PROCEDURE deposit_money(
     v_new_balance NUMBER;
 BEGIN
 
-    SELECT account_id, balance INTO v_account_id, v_new_balance
-    FROM Accounts
-    WHERE account_number = p_account_number AND status = 'Active';
-
-    v_new_balance := v_new_balance + p_amount;
-
+    -- Lock, change and read back the balance in one statement, so
+    -- concurrent postings to the account queue on the row lock instead
+    -- of overwriting each other
     UPDATE Accounts
-    SET balance = v_new_balance
-    WHERE account_id = v_account_id;
+    SET balance = balance + p_amount
+    WHERE account_number = p_account_number AND status = 'Active'
+    RETURNING account_id, balance INTO v_account_id, v_new_balance;
+
+    IF SQL%ROWCOUNT = 0 THEN
+        RAISE NO_DATA_FOUND;
+    END IF;
 
     INSERT INTO Transactions VALUES (
         transaction_seq.NEXTVAL,
@@ -199,9 +309,11 @@ EXCEPTION
     WHEN NO_DATA_FOUND THEN
         DBMS_OUTPUT.PUT_LINE('Account not found or inactive');
         ROLLBACK;
+        RAISE_APPLICATION_ERROR(-20002, 'Account not found or inactive');
     WHEN OTHERS THEN
         DBMS_OUTPUT.PUT_LINE('Error: ' || SQLERRM);
         ROLLBACK;
+        RAISE;
 END;
 /
 
@@ -211,23 +323,26 @@ CREATE OR REPLACE PROCEDURE withdraw_money(
     p_description IN VARCHAR2 DEFAULT 'Cash Withdrawal'
 ) AS
     v_account_id NUMBER;
-    v_current_balance NUMBER;
     v_new_balance NUMBER;
+    v_found NUMBER;
 BEGIN
 
-    SELECT account_id, balance INTO v_account_id, v_current_balance
-    FROM Accounts
-    WHERE account_number = p_account_number AND status = 'Active';
-
-    IF v_current_balance < p_amount THEN
+    -- The balance check is part of the update, so it sees the locked row
+    UPDATE Accounts
+    SET balance = balance - p_amount
+    WHERE account_number = p_account_number AND status = 'Active'
+      AND balance >= p_amount
+    RETURNING account_id, balance INTO v_account_id, v_new_balance;
+
+    IF SQL%ROWCOUNT = 0 THEN
+        SELECT COUNT(*) INTO v_found
+        FROM Accounts
+        WHERE account_number = p_account_number AND status = 'Active';
+        IF v_found = 0 THEN
+            RAISE NO_DATA_FOUND;
+        END IF;
         RAISE_APPLICATION_ERROR(-20001, 'Insufficient balance');
     END IF;
-    
-    v_new_balance := v_current_balance - p_amount;
-
-    UPDATE Accounts
-    SET balance = v_new_balance
-    WHERE account_id = v_account_id;
 
     INSERT INTO Transactions VALUES (
         transaction_seq.NEXTVAL,
@@ -246,9 +361,11 @@ EXCEPTION
     WHEN NO_DATA_FOUND THEN
         DBMS_OUTPUT.PUT_LINE('Account not found or inactive');
         ROLLBACK;
+        RAISE_APPLICATION_ERROR(-20002, 'Account not found or inactive');
     WHEN OTHERS THEN
         DBMS_OUTPUT.PUT_LINE('Error: ' || SQLERRM);
         ROLLBACK;
+        RAISE;
 END;
 /
 
@@ -265,14 +382,36 @@ CREATE OR REPLACE PROCEDURE transfer_money(
     v_to_new_balance NUMBER;
 BEGIN
 
-    SELECT account_id, balance INTO v_from_id, v_from_balance
+    IF p_from_account = p_to_account THEN
+        RAISE_APPLICATION_ERROR(-20003, 'Cannot transfer to the same account');
+    END IF;
+
+    -- Lock both rows lowest account_id first, so opposite-direction
+    -- transfers between the same pair queue on the same first row instead
+    -- of each holding one and waiting for the other. One SELECT ... ORDER BY
+    -- ... FOR UPDATE would not guarantee that: Oracle locks the rows as the
+    -- cursor opens, in access-path order. So the ids are resolved without
+    -- locks, and each row is then locked by its own statement.
+    SELECT account_id INTO v_from_id
     FROM Accounts
     WHERE account_number = p_from_account AND status = 'Active';
- 
-    SELECT account_id, balance INTO v_to_id, v_to_balance
+
+    SELECT account_id INTO v_to_id
     FROM Accounts
     WHERE account_number = p_to_account AND status = 'Active';
 
+    IF v_from_id < v_to_id THEN
+        SELECT balance INTO v_from_balance FROM Accounts
+        WHERE account_id = v_from_id AND status = 'Active' FOR UPDATE;
+        SELECT balance INTO v_to_balance FROM Accounts
+        WHERE account_id = v_to_id AND status = 'Active' FOR UPDATE;
+    ELSE
+        SELECT balance INTO v_to_balance FROM Accounts
+        WHERE account_id = v_to_id AND status = 'Active' FOR UPDATE;
+        SELECT balance INTO v_from_balance FROM Accounts
+        WHERE account_id = v_from_id AND status = 'Active' FOR UPDATE;
+    END IF;
+
     IF v_from_balance < p_amount THEN
         RAISE_APPLICATION_ERROR(-20001, 'Insufficient balance for transfer');
     END IF;
@@ -318,9 +457,73 @@ EXCEPTION
     WHEN NO_DATA_FOUND THEN
         DBMS_OUTPUT.PUT_LINE('One or both accounts not found');
         ROLLBACK;
+        RAISE_APPLICATION_ERROR(-20002, 'One or both accounts not found');
     WHEN OTHERS THEN
         DBMS_OUTPUT.PUT_LINE('Transfer failed: ' || SQLERRM);
         ROLLBACK;
+        RAISE;
+END;
+/
+
+-- Bulk deposits/withdrawals: one call posts a whole batch bound as
+-- collections. Each row gets its own savepoint; p_errors(i) is NULL on
+-- success or the error text. The caller commits (no COMMIT here).
+CREATE OR REPLACE PROCEDURE post_many(
+    p_transaction_type IN VARCHAR2,
+    p_accounts IN SYS.ODCIVARCHAR2LIST,
+    p_amounts IN SYS.ODCINUMBERLIST,
+    p_descriptions IN SYS.ODCIVARCHAR2LIST,
+    p_errors OUT SYS.ODCIVARCHAR2LIST
+) AS
+    v_account_id NUMBER;
+    v_balance NUMBER;
+    v_found NUMBER;
+BEGIN
+    p_errors := SYS.ODCIVARCHAR2LIST();
+    p_errors.EXTEND(p_accounts.COUNT);
+
+    FOR i IN 1 .. p_accounts.COUNT LOOP
+        BEGIN
+            SAVEPOINT post_row;
+
+            -- Same single-statement update as deposit_money/withdraw_money
+            UPDATE Accounts
+            SET balance = balance + CASE p_transaction_type
+                                       WHEN 'Withdrawal' THEN -p_amounts(i)
+                                       ELSE p_amounts(i) END
+            WHERE account_number = p_accounts(i) AND status = 'Active'
+              AND (p_transaction_type <> 'Withdrawal' OR balance >= p_amounts(i))
+            RETURNING account_id, balance INTO v_account_id, v_balance;
+
+            IF SQL%ROWCOUNT = 0 THEN
+                SELECT COUNT(*) INTO v_found
+                FROM Accounts
+                WHERE account_number = p_accounts(i) AND status = 'Active';
+                IF v_found = 0 THEN
+                    RAISE NO_DATA_FOUND;
+                END IF;
+                RAISE_APPLICATION_ERROR(-20001, 'Insufficient balance');
+            END IF;
+
+            INSERT INTO Transactions VALUES (
+                transaction_seq.NEXTVAL,
+                v_account_id,
+                p_transaction_type,
+                p_amounts(i),
+                v_balance,
+                SYSDATE,
+                p_descriptions(i),
+                NULL
+            );
+        EXCEPTION
+            WHEN NO_DATA_FOUND THEN
+                ROLLBACK TO post_row;
+                p_errors(i) := 'Account ' || p_accounts(i) || ' not found or inactive';
+            WHEN OTHERS THEN
+                ROLLBACK TO post_row;
+                p_errors(i) := SQLERRM;
+        END;
+    END LOOP;
 END;
 /
 
@@ -333,9 +536,10 @@ SELECT
     a.account_type,
     a.balance,
     a.status,
-    (SELECT COUNT(*) FROM Transactions t WHERE t.account_id = a.account_id) as total_transactions
+    ac.transaction_count as total_transactions
 FROM Customers c
 JOIN Accounts a ON c.customer_id = a.customer_id
+JOIN Account_Counters ac ON ac.account_id = a.account_id
 WHERE c.status = 'Active';
 
 CREATE OR REPLACE VIEW recent_transactions AS
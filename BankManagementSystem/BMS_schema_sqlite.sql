@@ -0,0 +1,230 @@
+-- SQLite port of BMS_schema.sql used by SQLiteBackend (bank_backends.py).
+-- Tables, constraints, indexes, views and seed data mirror the Oracle script.
+-- Sequences are emulated by SQLiteBackend (nextval()) and the stored
+-- procedures are implemented in Python as atomic transactions.
+
+CREATE TABLE Customers(
+    customer_id NUMBER(10) PRIMARY KEY,
+    full_name VARCHAR2(100) NOT NULL,
+    email VARCHAR2(100) UNIQUE NOT NULL,
+    phone VARCHAR2(15) NOT NULL,
+    address VARCHAR2(200),
+    date_of_birth DATE,
+    created_date DATE DEFAULT (datetime('now', 'localtime')),
+    password_hash VARCHAR2(100) NOT NULL,
+    status VARCHAR2(20) DEFAULT 'Active' CHECK (status IN ('Active', 'Inactive', 'Suspended'))
+);
+
+CREATE TABLE Accounts (
+    account_id NUMBER(10) PRIMARY KEY,
+    customer_id NUMBER(10) NOT NULL,
+    account_number VARCHAR2(20) UNIQUE NOT NULL,
+    account_type VARCHAR2(20) NOT NULL CHECK (account_type IN ('Savings', 'Current', 'Fixed Deposit')),
+    balance NUMBER(15,2) DEFAULT 0 CHECK (balance >= 0),
+    interest_rate NUMBER(5,2) DEFAULT 0,
+    created_date DATE DEFAULT (datetime('now', 'localtime')),
+    status VARCHAR2(20) DEFAULT 'Active' CHECK (status IN ('Active', 'Closed', 'Frozen')),
+    CONSTRAINT fk_customer FOREIGN KEY (customer_id) REFERENCES Customers(customer_id)
+);
+
+CREATE TABLE Transactions (
+    transaction_id NUMBER(15) PRIMARY KEY,
+    account_id NUMBER(10) NOT NULL,
+    transaction_type VARCHAR2(20) NOT NULL CHECK (transaction_type IN ('Deposit', 'Withdrawal', 'Transfer-In', 'Transfer-Out', 'Interest')),
+    amount NUMBER(15,2) NOT NULL CHECK (amount > 0),
+    balance_after NUMBER(15,2) NOT NULL,
+    transaction_date DATE DEFAULT (datetime('now', 'localtime')),
+    description VARCHAR2(200),
+    reference_account VARCHAR2(20), -- For transfers
+    CONSTRAINT fk_account FOREIGN KEY (account_id) REFERENCES Accounts(account_id)
+);
+
+-- Cold tier of the ledger: BankDatabase.archive_transactions() moves rows
+-- older than the hot horizon here in batches. No counter trigger - the
+-- counters already include every archived row.
+CREATE TABLE Transactions_Archive (
+    transaction_id NUMBER(15) PRIMARY KEY,
+    account_id NUMBER(10) NOT NULL,
+    transaction_type VARCHAR2(20) NOT NULL,
+    amount NUMBER(15,2) NOT NULL,
+    balance_after NUMBER(15,2) NOT NULL,
+    transaction_date DATE NOT NULL,
+    description VARCHAR2(200),
+    reference_account VARCHAR2(20),
+    CONSTRAINT fk_archive_account FOREIGN KEY (account_id) REFERENCES Accounts(account_id)
+);
+
+-- Running aggregates maintained by triggers (see BMS_schema.sql)
+CREATE TABLE Account_Counters (
+    account_id NUMBER(10) PRIMARY KEY,
+    transaction_count NUMBER(15) DEFAULT 0 NOT NULL,
+    CONSTRAINT fk_counter_account FOREIGN KEY (account_id) REFERENCES Accounts(account_id)
+);
+
+CREATE TABLE Bank_Totals (
+    slot NUMBER(3) PRIMARY KEY,
+    active_accounts NUMBER(10) DEFAULT 0 NOT NULL,
+    total_balance NUMBER(17,2) DEFAULT 0 NOT NULL,
+    total_transactions NUMBER(15) DEFAULT 0 NOT NULL
+);
+
+-- Interest posting runs (bank_interest.py): one row per period. The run
+-- advances last_account_id as each chunk commits, so an interrupted run
+-- resumes where it stopped and a Completed period is never posted twice.
+CREATE TABLE Interest_Runs (
+    period VARCHAR2(7) PRIMARY KEY, -- YYYY-MM
+    method VARCHAR2(10) NOT NULL CHECK (method IN ('monthly', 'daily')),
+    status VARCHAR2(10) NOT NULL CHECK (status IN ('Running', 'Completed')),
+    last_account_id NUMBER(10) DEFAULT 0 NOT NULL,
+    accounts_posted NUMBER(10) DEFAULT 0 NOT NULL,
+    total_interest NUMBER(17,2) DEFAULT 0 NOT NULL,
+    started_date DATE NOT NULL,
+    completed_date DATE
+);
+
+CREATE TABLE Interest_Run_Totals (
+    period VARCHAR2(7) NOT NULL,
+    account_type VARCHAR2(20) NOT NULL,
+    accounts_posted NUMBER(10) DEFAULT 0 NOT NULL,
+    total_interest NUMBER(17,2) DEFAULT 0 NOT NULL,
+    CONSTRAINT pk_interest_run_totals PRIMARY KEY (period, account_type),
+    CONSTRAINT fk_interest_run FOREIGN KEY (period) REFERENCES Interest_Runs(period)
+);
+
+WITH RECURSIVE slots(n) AS (SELECT 0 UNION ALL SELECT n + 1 FROM slots WHERE n < 15)
+INSERT INTO Bank_Totals (slot) SELECT n FROM slots;
+
+CREATE TRIGGER trg_accounts_insert AFTER INSERT ON Accounts
+BEGIN
+    INSERT INTO Account_Counters (account_id, transaction_count) VALUES (NEW.account_id, 0);
+    UPDATE Bank_Totals
+    SET active_accounts = active_accounts + (NEW.status = 'Active'),
+        total_balance = total_balance + NEW.balance
+    WHERE slot = NEW.account_id % 16;
+END;
+
+CREATE TRIGGER trg_accounts_update AFTER UPDATE OF balance, status ON Accounts
+BEGIN
+    UPDATE Bank_Totals
+    SET active_accounts = active_accounts + (NEW.status = 'Active') - (OLD.status = 'Active'),
+        total_balance = total_balance + NEW.balance - OLD.balance
+    WHERE slot = NEW.account_id % 16;
+END;
+
+CREATE TRIGGER trg_transactions_insert AFTER INSERT ON Transactions
+BEGIN
+    UPDATE Account_Counters SET transaction_count = transaction_count + 1
+    WHERE account_id = NEW.account_id;
+    UPDATE Bank_Totals SET total_transactions = total_transactions + 1
+    WHERE slot = NEW.account_id % 16;
+END;
+
+-- Oracle's one-row DUAL table
+CREATE VIEW DUAL AS SELECT 'X' AS dummy;
+
+CREATE INDEX idx_account_number ON Accounts(account_number);
+
+CREATE INDEX idx_customer_email ON Customers(email);
+
+-- Serves per-account history in date order and keyset pagination on
+-- (transaction_date, transaction_id)
+CREATE INDEX idx_transaction_account_date ON Transactions(account_id, transaction_date, transaction_id);
+
+-- Oldest-first batches of the archive job
+CREATE INDEX idx_transaction_date ON Transactions(transaction_date, transaction_id);
+
+CREATE INDEX idx_archive_account_date ON Transactions_Archive(account_id, transaction_date, transaction_id);
+
+CREATE INDEX idx_archive_date ON Transactions_Archive(transaction_date);
+
+CREATE INDEX idx_account_customer ON Accounts(customer_id, status);
+
+INSERT INTO Customers VALUES (1001, 'Rahul Sharma', 'rahul.sharma@email.com',
+    '9876543210', 'Mumbai, Maharashtra', '1995-05-15 00:00:00', datetime('now', 'localtime'),
+    'hashed_password_123', 'Active');
+
+INSERT INTO Customers VALUES (1002, 'Priya Patel', 'priya.patel@email.com',
+    '9876543211', 'Delhi, India', '1998-08-22 00:00:00', datetime('now', 'localtime'),
+    'hashed_password_456', 'Active');
+
+INSERT INTO Customers VALUES (1003, 'Amit Kumar', 'amit.kumar@email.com',
+    '9876543212', 'Bangalore, Karnataka', '1990-12-10 00:00:00', datetime('now', 'localtime'),
+    'hashed_password_789', 'Active');
+
+INSERT INTO Customers VALUES (1004, 'Sneha Reddy', 'sneha.reddy@email.com',
+    '9876543213', 'Hyderabad, Telangana', '1993-03-25 00:00:00', datetime('now', 'localtime'),
+    'hashed_password_012', 'Active');
+
+INSERT INTO Customers VALUES (1005, 'Vikram Singh', 'vikram.singh@email.com',
+    '9876543214', 'Pune, Maharashtra', '1997-07-18 00:00:00', datetime('now', 'localtime'),
+    'hashed_password_345', 'Active');
+
+INSERT INTO Accounts VALUES (100001,1001,'ACC0000100001','Savings',50000.00,4.00,datetime('now', 'localtime', '-365 days'),'Active');
+
+INSERT INTO Accounts VALUES (100002,1001,'ACC0000100002','Current',120000.00,0.00,datetime('now', 'localtime', '-200 days'),'Active');
+
+INSERT INTO Accounts VALUES (100003,1002,'ACC0000100003','Savings',75000.00,4.00,datetime('now', 'localtime', '-180 days'),'Active');
+
+INSERT INTO Accounts VALUES (100004,1003,'ACC0000100004','Savings',30000.00,4.00,datetime('now', 'localtime', '-90 days'),'Active');
+
+INSERT INTO Accounts VALUES (100005,1004,'ACC0000100005','Savings',95000.00,4.00,datetime('now', 'localtime', '-120 days'),'Active');
+
+INSERT INTO Accounts VALUES (100006,1004,'ACC0000100006','Fixed Deposit',200000.00,6.50,datetime('now', 'localtime', '-60 days'),'Active');
+
+INSERT INTO Accounts VALUES (100007,1005,'ACC0000100007','Current',45000.00,0.00,datetime('now', 'localtime', '-30 days'),'Active');
+
+INSERT INTO Transactions VALUES (1,100001,'Deposit',10000.00,50000.00,datetime('now', 'localtime', '-10 days'),'ATM Deposit',NULL);
+
+INSERT INTO Transactions VALUES (2,100001,'Withdrawal',5000.00,45000.00,datetime('now', 'localtime', '-8 days'),'ATM Withdrawal',NULL);
+
+INSERT INTO Transactions VALUES (3,100001,'Transfer-Out',15000.00,30000.00,datetime('now', 'localtime', '-5 days'),'Transfer to Priya','ACC0000100003');
+
+INSERT INTO Transactions VALUES (4,100003,'Transfer-In',15000.00,75000.00,datetime('now', 'localtime', '-5 days'),'Transfer from Rahul','ACC0000100001');
+
+INSERT INTO Transactions VALUES (5,100003,'Withdrawal',8000.00,67000.00,datetime('now', 'localtime', '-3 days'),'Online Purchase',NULL);
+
+INSERT INTO Transactions VALUES (6,100004,'Deposit',20000.00,30000.00,datetime('now', 'localtime', '-7 days'),'Salary Credit',NULL);
+
+INSERT INTO Transactions VALUES (7,100004,'Withdrawal',5000.00,25000.00,datetime('now', 'localtime', '-2 days'),'ATM Withdrawal',NULL);
+
+CREATE VIEW customer_account_summary AS
+SELECT
+    c.customer_id,
+    c.full_name,
+    c.email,
+    a.account_number,
+    a.account_type,
+    a.balance,
+    a.status,
+    ac.transaction_count as total_transactions
+FROM Customers c
+JOIN Accounts a ON c.customer_id = a.customer_id
+JOIN Account_Counters ac ON ac.account_id = a.account_id
+WHERE c.status = 'Active';
+
+CREATE VIEW recent_transactions AS
+SELECT
+    c.full_name,
+    a.account_number,
+    t.transaction_type,
+    t.amount,
+    t.balance_after,
+    TO_CHAR(t.transaction_date, 'DD-MON-YYYY HH24:MI:SS') as transaction_time,
+    t.description
+FROM Transactions t
+JOIN Accounts a ON t.account_id = a.account_id
+JOIN Customers c ON a.customer_id = c.customer_id
+WHERE t.transaction_date >= datetime('now', 'localtime', '-30 days')
+ORDER BY t.transaction_date DESC;
+
+CREATE VIEW account_statistics AS
+SELECT
+    account_type,
+    COUNT(*) as total_accounts,
+    SUM(balance) as total_balance,
+    AVG(balance) as average_balance,
+    MAX(balance) as highest_balance,
+    MIN(balance) as lowest_balance
+FROM Accounts
+WHERE status = 'Active'
+GROUP BY account_type;
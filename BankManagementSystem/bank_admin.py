@@ -0,0 +1,84 @@
+"""
+Bank Account Management System - Admin Commands
+Maintenance jobs for BankDatabase, run from the command line
+
+Usage:
+    python bank_admin.py verify-aggregates [--sqlite PATH]
+    python bank_admin.py rebuild-aggregates [--sqlite PATH]
+    python bank_admin.py archive-transactions [--horizon-days 90] [--batch-size 5000] [--sqlite PATH]
+"""
+
+import argparse
+import sys
+
+from bank_database import BankDatabase
+from bank_metrics import configure_logging
+
+
+def open_database(args) -> BankDatabase:
+    """Build the BankDatabase selected by the common --sqlite option"""
+    if args.sqlite:
+        from bank_backends import SQLiteBackend
+        return BankDatabase(backend=SQLiteBackend(args.sqlite))
+    return BankDatabase("SYS", "oracle@express", "localhost:1521/XE")
+
+
+def verify_aggregates(db: BankDatabase, args) -> int:
+    report = db.verify_aggregates()
+    if report is None:
+        return 1
+    for key, value in report['counters'].items():
+        actual = report['actual'][key]
+        marker = '✅' if value == actual else '❌'
+        print(f"   {marker} {key}: counter={value} actual={actual}")
+    print(f"   {'✅' if report['drifted_accounts'] == 0 else '❌'} "
+          f"accounts with drifted transaction counts: {report['drifted_accounts']}")
+    return 0 if report['ok'] else 1
+
+
+def rebuild_aggregates(db: BankDatabase, args) -> int:
+    return 0 if db.rebuild_aggregates() else 1
+
+
+def archive_transactions(db: BankDatabase, args) -> int:
+    report = db.archive_transactions(args.horizon_days, args.batch_size)
+    return 0 if report is not None else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Bank maintenance commands")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def command(name, handler, help_text):
+        sub = commands.add_parser(name, help=help_text)
+        sub.add_argument('--sqlite', metavar='PATH', help="use an embedded SQLite database")
+        sub.add_argument('--log-json', action='store_true', help="log as JSON lines")
+        sub.set_defaults(handler=handler)
+        return sub
+
+    command('verify-aggregates', verify_aggregates,
+            "compare running counters with a full recount")
+    command('rebuild-aggregates', rebuild_aggregates,
+            "recompute running counters from the base tables")
+    archive = command('archive-transactions', archive_transactions,
+                      "move transactions older than the horizon to the archive tier")
+    archive.add_argument('--horizon-days', type=int, default=90,
+                         help="keep this many days in the hot tier (at least 31)")
+    archive.add_argument('--batch-size', type=int, default=5000, help="rows moved per commit")
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    configure_logging(json_format=args.log_json)
+    db = open_database(args)
+    if not db.connect():
+        return 1
+    try:
+        return args.handler(db, args)
+    finally:
+        db.disconnect()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
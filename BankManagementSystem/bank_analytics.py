@@ -0,0 +1,266 @@
+"""
+Bank Account Management System - Columnar Analytics
+Vectorized daily balances, cash flow and per-type metrics over NumPy columns
+
+The helpers work on the column dicts BankDatabase.ledger_columns() and
+account_columns() return - one NumPy array per column, the ledger ordered
+by account then date - so each is a handful of array passes however many
+rows there are, with no Python object per row:
+
+  daily_balances(ledger)         - one row per account and active day: the
+                                   end-of-day balance, inflow, outflow and
+                                   transaction count
+  rolling_flows(daily, days)     - inflow/outflow over the trailing window of
+                                   calendar days ending on each of those days
+  type_aggregates(accounts, ...) - the account_statistics view's per-type
+                                   metrics, plus the ledger's flows per type
+  as_dataframe(columns)          - any of the above as a pandas DataFrame
+
+Amounts are summed as integer paise, so totals are exact to the paisa.
+
+Usage:
+    python bank_analytics.py --from 2026-01-01 --to 2026-10-01 [--sqlite bank.db]
+    python bank_analytics.py --benchmark-rows 20000000     (synthetic columns, no database)
+"""
+
+import argparse
+import logging
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Dict
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+from bank_database import BankDatabase
+from bank_metrics import configure_logging
+from bank_sql import ACCOUNT_TYPES, INFLOW_TYPES, TRANSACTION_TYPES
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("numpy is required for columnar analytics (pip install numpy)")
+
+
+def _paise(amounts):
+    return np.rint(amounts * 100).astype(np.int64)
+
+
+def _segment_sums(values, ends):
+    """Sums of the consecutive segments of values ending (inclusive) at ends"""
+    # Differences of an integer running sum: exact, and far faster than
+    # np.add.reduceat when the segments are short
+    running = np.cumsum(values)[ends]
+    return np.diff(running, prepend=0)
+
+
+def daily_balances(ledger: Dict) -> Dict:
+    """Per (account, day) end-of-day balance, inflow, outflow and transaction count"""
+    _require_numpy()
+    account = ledger['account_id']
+    day = ledger['transaction_date'].astype('datetime64[D]')
+    if len(account) == 0:
+        return {'account_id': account, 'day': day, 'balance': ledger['balance_after'],
+                'inflow': ledger['amount'], 'outflow': ledger['amount'],
+                'transactions': np.empty(0, dtype=np.int64)}
+    first = np.empty(len(account), dtype=bool)
+    first[0] = True
+    np.not_equal(account[1:], account[:-1], out=first[1:])
+    first[1:] |= day[1:] != day[:-1]
+    starts = np.flatnonzero(first)
+    ends = np.append(starts[1:], len(account)) - 1
+
+    inflow = np.isin(ledger['transaction_type'],
+                     [TRANSACTION_TYPES.index(name) for name in INFLOW_TYPES])
+    paise = _paise(ledger['amount'])
+    return {
+        'account_id': account[starts],
+        'day': day[starts],
+        'balance': ledger['balance_after'][ends],
+        'inflow': _segment_sums(np.where(inflow, paise, 0), ends) / 100,
+        'outflow': _segment_sums(np.where(inflow, 0, paise), ends) / 100,
+        'transactions': ends - starts + 1,
+    }
+
+
+def rolling_flows(daily: Dict, window_days: int = 30) -> Dict:
+    """Inflow and outflow over the window_days calendar days ending on each daily row"""
+    _require_numpy()
+    # (account, day) as one sortable key; the daily rows are already in its order
+    key = daily['account_id'].astype(np.int64) * 1_000_000 + daily['day'].astype(np.int64)
+    window_start = np.searchsorted(key, key - (window_days - 1), side='left')
+    result = {'account_id': daily['account_id'], 'day': daily['day']}
+    for name in ('inflow', 'outflow'):
+        running = np.concatenate(([0], np.cumsum(_paise(daily[name]))))
+        result[name] = (running[1:] - running[window_start]) / 100
+    result['net'] = result['inflow'] - result['outflow']
+    return result
+
+
+def type_aggregates(accounts: Dict, ledger: Dict = None) -> Dict[str, Dict]:
+    """Per account type: the account_statistics metrics over active accounts, and ledger flows
+
+    total_accounts, total_balance, average_balance, highest_balance and
+    lowest_balance match the view; with a ledger slice each type also gets
+    its transactions, inflow and outflow in that slice.
+    """
+    _require_numpy()
+    active = accounts['active']
+    codes = accounts['account_type'][active]
+    balance = _paise(accounts['balance'][active])
+    size = len(ACCOUNT_TYPES)
+    counts = np.bincount(codes, minlength=size)
+    totals = np.bincount(codes, weights=balance, minlength=size)
+    if ledger is not None:
+        inflow = np.isin(ledger['transaction_type'],
+                         [TRANSACTION_TYPES.index(name) for name in INFLOW_TYPES])
+        paise = _paise(ledger['amount'])
+        ledger_codes = ledger['account_type']
+        transactions = np.bincount(ledger_codes, minlength=size)
+        inflows = np.bincount(ledger_codes, weights=np.where(inflow, paise, 0), minlength=size)
+        outflows = np.bincount(ledger_codes, weights=np.where(inflow, 0, paise), minlength=size)
+
+    result = {}
+    for code, account_type in enumerate(ACCOUNT_TYPES):
+        if counts[code] == 0:
+            continue
+        of_type = balance[codes == code]
+        metrics = {
+            'total_accounts': int(counts[code]),
+            'total_balance': round(totals[code] / 100, 2),
+            'average_balance': round(totals[code] / counts[code] / 100, 2),
+            'highest_balance': int(of_type.max()) / 100,
+            'lowest_balance': int(of_type.min()) / 100,
+        }
+        if ledger is not None:
+            metrics.update(transactions=int(transactions[code]),
+                           inflow=round(inflows[code] / 100, 2),
+                           outflow=round(outflows[code] / 100, 2))
+        result[account_type] = metrics
+    return result
+
+
+def as_dataframe(columns: Dict):
+    """A pandas DataFrame over a column dict (the arrays are not copied where pandas can avoid it)"""
+    if pd is None:
+        raise ImportError("pandas is required for DataFrame output (pip install pandas)")
+    return pd.DataFrame(columns, copy=False)
+
+
+# --- benchmark ---
+
+def synthetic_ledger(rows: int, accounts: int, days: int, seed: int = 7) -> Dict:
+    """Ledger columns shaped like ledger_columns() output, without a database"""
+    rng = np.random.default_rng(seed)
+    account = np.sort(rng.integers(100001, 100001 + accounts, rows))
+    date = (np.datetime64('2026-01-01T00:00:00')
+            + rng.integers(0, days * 86400, rows).astype('timedelta64[s]'))
+    order = np.lexsort((date, account))
+    return {
+        'account_id': account[order],
+        'account_type': ((account[order] - 100001) % len(ACCOUNT_TYPES)).astype(np.int8),
+        'transaction_type': rng.integers(0, len(TRANSACTION_TYPES), rows).astype(np.int8),
+        'amount': np.round(rng.uniform(1, 5000, rows), 2),
+        'balance_after': np.round(rng.uniform(0, 1_000_000, rows), 2),
+        'transaction_date': date[order],
+    }
+
+
+def benchmark(rows: int, accounts: int, days: int, window_days: int, repeat: int) -> int:
+    ledger = synthetic_ledger(rows, accounts, days)
+    codes = np.arange(accounts) % len(ACCOUNT_TYPES)
+    account_table = {'account_id': np.arange(100001, 100001 + accounts),
+                     'account_type': codes.astype(np.int8),
+                     'balance': np.round(np.random.default_rng(1).uniform(0, 1e6, accounts), 2),
+                     'interest_rate': np.zeros(accounts), 'active': np.ones(accounts, dtype=bool)}
+    print(f"{rows:,} synthetic ledger rows over {accounts:,} accounts and {days} days")
+
+    def timed(label, call):
+        # Best of repeat: the first passes also pay for faulting in fresh memory
+        best = float('inf')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            output = call()
+            best = min(best, time.perf_counter() - started)
+        print(f"   {label:<16} {best:7.2f}s  {rows / best:>14,.0f} ledger rows/sec")
+        return output
+
+    daily = timed('daily_balances', lambda: daily_balances(ledger))
+    timed('rolling_flows', lambda: rolling_flows(daily, window_days))
+    timed('type_aggregates', lambda: type_aggregates(account_table, ledger))
+    print(f"   {len(daily['day']):,} account-days")
+    return 0
+
+
+def report(db: BankDatabase, start_date: datetime, end_date: datetime, window_days: int):
+    started = time.perf_counter()
+    ledger = db.ledger_columns(start_date, end_date)
+    accounts = db.account_columns()
+    fetched = time.perf_counter() - started
+    daily = daily_balances(ledger)
+    rolling = rolling_flows(daily, window_days)
+    by_type = type_aggregates(accounts, ledger)
+    print(f"{len(ledger['account_id']):,} ledger rows and {len(accounts['account_id']):,} "
+          f"accounts fetched in {fetched:.2f}s; "
+          f"analysed in {time.perf_counter() - started - fetched:.2f}s")
+
+    print(f"\n{'Account type':<16}{'Accounts':>10}{'Total balance':>18}{'Average':>14}"
+          f"{'Transactions':>14}{'Inflow':>18}{'Outflow':>18}")
+    for account_type, metrics in by_type.items():
+        print(f"{account_type:<16}{metrics['total_accounts']:>10,}"
+              f"{metrics['total_balance']:>18,.2f}{metrics['average_balance']:>14,.2f}"
+              f"{metrics['transactions']:>14,}{metrics['inflow']:>18,.2f}"
+              f"{metrics['outflow']:>18,.2f}")
+    if len(rolling['net']):
+        top = np.argsort(rolling['net'])[-5:][::-1]
+        print(f"\nLargest {window_days}-day net inflows:")
+        for index in top:
+            print(f"   account {rolling['account_id'][index]}  to {rolling['day'][index]}  "
+                  f"₹{rolling['net'][index]:>14,.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Columnar cash-flow and balance analytics")
+    parser.add_argument('--from', dest='start', default=None, help="YYYY-MM-DD (default: 90 days ago)")
+    parser.add_argument('--to', dest='end', default=None, help="YYYY-MM-DD, exclusive (default: tomorrow)")
+    parser.add_argument('--window', type=int, default=30, help="rolling window in days")
+    parser.add_argument('--sqlite', metavar='PATH', help="analyse an embedded SQLite database")
+    parser.add_argument('--benchmark-rows', type=int,
+                        help="time the helpers on this many synthetic rows instead")
+    parser.add_argument('--benchmark-accounts', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=3, help="benchmark passes (best is reported)")
+    args = parser.parse_args()
+    _require_numpy()
+
+    if args.benchmark_rows:
+        return benchmark(args.benchmark_rows, args.benchmark_accounts, 365, args.window,
+                         args.repeat)
+
+    configure_logging(logging.WARNING)
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    start_date = datetime.strptime(args.start, '%Y-%m-%d') if args.start else today - timedelta(days=90)
+    end_date = datetime.strptime(args.end, '%Y-%m-%d') if args.end else today + timedelta(days=1)
+    if args.sqlite:
+        from bank_backends import SQLiteBackend
+        db = BankDatabase(backend=SQLiteBackend(args.sqlite))
+    else:
+        db = BankDatabase("SYS", "oracle@express", "localhost:1521/XE")
+    if not db.connect():
+        return 1
+    try:
+        report(db, start_date, end_date, args.window)
+    finally:
+        db.disconnect()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,494 @@
+"""
+Bank Account Management System - asyncio API
+Awaitable BankDatabase operations on python-oracledb's async pool
+
+AsyncBankDatabase mirrors the BankDatabase API as coroutines, so an
+asyncio service can run thousands of concurrent requests on one thread
+without parking a worker thread per call. Pass
+backend=AsyncSQLiteBackend() to run against the embedded stand-in.
+
+Usage (benchmark against the stand-in with 2 ms simulated round trips):
+    python bank_async.py --requests 5000 --latency 0.002
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from bank_backends import AsyncOracleBackend, AsyncSQLiteBackend, SQLiteBackend
+from bank_database import BankDatabase
+from bank_metrics import configure_logging, log_event
+from bank_sql import sql
+
+log = logging.getLogger('bank.async')
+
+
+class AsyncBankDatabase:
+    """Coroutine version of BankDatabase
+
+    Every method checks a connection out of the async pool for the duration
+    of one call, so concurrency is bounded by pool_max rather than by a
+    thread count. Results and error handling match BankDatabase.
+    """
+
+    def __init__(self, username: str = None, password: str = None, dsn: str = None,
+                 pool_min: int = 1, pool_max: int = 32, pool_increment: int = 1,
+                 pool_timeout: float = 10.0, ping_interval: int = 60, backend=None):
+        if backend is None:
+            backend = AsyncOracleBackend(username, password, dsn, pool_min=pool_min,
+                                         pool_max=pool_max, pool_increment=pool_increment,
+                                         pool_timeout=pool_timeout,
+                                         ping_interval=ping_interval)
+        self.backend = backend
+
+    async def connect(self) -> bool:
+        """Create the async connection pool"""
+        try:
+            await self.backend.connect()
+            log_event(log, logging.INFO, 'connected', "Connected to {backend} database (async)",
+                      backend=self.backend.name)
+            return True
+        except Exception as e:
+            log_event(log, logging.ERROR, 'connect_failed', "Connection failed: {error}", error=str(e))
+            return False
+
+    async def disconnect(self):
+        """Close the async connection pool"""
+        await self.backend.close()
+        log_event(log, logging.INFO, 'disconnected', "Disconnected from database")
+
+    def _sql(self, name: str) -> str:
+        """A bank_sql catalog statement, adapted to the backend"""
+        return self.backend.prepare(sql(name))
+
+    async def customer_login(self, email: str, password: str) -> Optional[Dict]:
+        """Authenticate customer login"""
+        try:
+            async with self.backend.session() as (connection, cursor):
+                await cursor.execute(self._sql('customer_login'),
+                                     {'email': email, 'password': password})
+                result = await cursor.fetchone()
+
+                if result:
+                    return {
+                        'customer_id': result[0],
+                        'full_name': result[1],
+                        'email': result[2],
+                        'phone': result[3],
+                        'address': result[4]
+                    }
+                return None
+        except Exception as e:
+            log_event(log, logging.ERROR, 'login_error', "Login error: {error}", error=str(e))
+            return None
+
+    async def register_customer(self, full_name: str, email: str, phone: str,
+                                address: str, dob: str, password: str) -> bool:
+        """Register a new customer"""
+        try:
+            async with self.backend.session() as (connection, cursor):
+                await cursor.execute(self._sql('register_customer'), {
+                    'full_name': full_name, 'email': email, 'phone': phone,
+                    'address': address, 'dob': dob, 'password': password
+                })
+                await connection.commit()
+                log_event(log, logging.INFO, 'customer_registered',
+                          "Customer {full_name} registered successfully", full_name=full_name)
+                return True
+        except self.backend.IntegrityError:
+            log_event(log, logging.ERROR, 'registration_rejected', "Email already exists")
+            return False
+        except Exception as e:
+            log_event(log, logging.ERROR, 'registration_failed', "Registration failed: {error}", error=str(e))
+            return False
+
+    async def create_account(self, customer_id: int, account_type: str,
+                             initial_deposit: float) -> Optional[str]:
+        """Create a new bank account"""
+        try:
+            async with self.backend.session() as (connection, cursor):
+                return await self.backend.open_account(cursor, customer_id, account_type,
+                                                       initial_deposit)
+        except Exception as e:
+            log_event(log, logging.ERROR, 'account_open_failed', "Account creation failed: {error}",
+                      customer_id=customer_id, error=str(e))
+            return None
+
+    async def get_customer_accounts(self, customer_id: int) -> List[Dict]:
+        """Get all accounts for a customer (JOIN query)"""
+        try:
+            async with self.backend.session() as (connection, cursor):
+                await cursor.execute(self._sql('customer_accounts'), {'customer_id': customer_id})
+                return [{
+                    'account_id': row[0],
+                    'account_number': row[1],
+                    'account_type': row[2],
+                    'balance': float(row[3]),
+                    'interest_rate': float(row[4]),
+                    'status': row[5],
+                    'created_date': row[6]
+                } for row in await cursor.fetchall()]
+        except Exception as e:
+            log_event(log, logging.ERROR, 'fetch_failed', "Error fetching accounts: {error}",
+                      customer_id=customer_id, error=str(e))
+            return []
+
+    async def get_account_details(self, account_number: str) -> Optional[Dict]:
+        """Get detailed account information with customer details (JOIN)"""
+        try:
+            async with self.backend.session() as (connection, cursor):
+                await cursor.execute(self._sql('account_details'),
+                                     {'account_number': account_number})
+                result = await cursor.fetchone()
+
+                if not result:
+                    return None
+                return {
+                    'customer_name': result[0],
+                    'email': result[1],
+                    'phone': result[2],
+                    'account_number': result[3],
+                    'account_type': result[4],
+                    'balance': float(result[5]),
+                    'interest_rate': float(result[6]),
+                    'status': result[7],
+                    'created_date': result[8],
+                    'customer_id': result[9]
+                }
+        except Exception as e:
+            log_event(log, logging.ERROR, 'fetch_failed', "Error fetching account: {error}",
+                      account_number=account_number, error=str(e))
+            return None
+
+    async def get_transaction_history(self, account_number: str, limit: int = 50) -> List[Dict]:
+        """Get transaction history for an account (hot tier first, then the archive)"""
+        try:
+            async with self.backend.session() as (connection, cursor):
+                transactions = []
+                for name in BankDatabase.HISTORY_STATEMENTS:
+                    await cursor.execute(self._sql(name),
+                                         {'account_number': account_number,
+                                          'limit': limit - len(transactions)})
+                    transactions += [{
+                        'transaction_id': row[0],
+                        'type': row[1],
+                        'amount': float(row[2]),
+                        'balance_after': float(row[3]),
+                        'description': row[4],
+                        'reference': row[5],
+                        'date': row[6]
+                    } for row in await cursor.fetchall()]
+                    if len(transactions) >= limit:
+                        break
+                return transactions
+        except Exception as e:
+            log_event(log, logging.ERROR, 'fetch_failed', "Error fetching transactions: {error}",
+                      account_number=account_number, error=str(e))
+            return []
+
+    async def iter_transaction_pages(self, account_number: str, page_size: int = 500,
+                                     cursor_token: str = None
+                                     ) -> AsyncIterator[Tuple[List[Dict], Optional[str]]]:
+        """Async generator over (page, next_token) pairs, newest first
+
+        Same keyset pagination and tokens as BankDatabase.iter_transaction_pages;
+        a pooled connection is only held while a page is being fetched.
+        """
+        last_date, last_id = (BankDatabase._decode_history_token(cursor_token)
+                              if cursor_token else BankDatabase._HISTORY_START)
+        queries = [self._sql(name) for name in BankDatabase.HISTORY_PAGE_STATEMENTS]
+        account_id = None
+        while True:
+            async with self.backend.session() as (connection, cursor):
+                if account_id is None:
+                    await cursor.execute(self._sql('account_id'),
+                                         {'account_number': account_number})
+                    row = await cursor.fetchone()
+                    if row is None:
+                        return
+                    account_id = row[0]
+                BankDatabase._tune_fetch(cursor, page_size)
+                rows = []
+                for query in queries:
+                    await cursor.execute(query, {'account_id': account_id, 'last_date': last_date,
+                                                 'last_id': last_id,
+                                                 'page_size': page_size - len(rows)})
+                    rows += await cursor.fetchall()
+                    if len(rows) >= page_size:
+                        break
+            if not rows:
+                return
+            page = [{
+                'transaction_id': row[0],
+                'type': row[1],
+                'amount': float(row[2]),
+                'balance_after': float(row[3]),
+                'description': row[4],
+                'reference': row[5],
+                'date': row[6].strftime('%d-%b-%Y %H:%M:%S').upper()
+            } for row in rows]
+            last_date, last_id = rows[-1][6], rows[-1][0]
+            next_token = (BankDatabase._encode_history_token(last_date, last_id)
+                          if len(rows) == page_size else None)
+            yield page, next_token
+            if next_token is None:
+                return
+
+    async def iter_transaction_history(self, account_number: str, page_size: int = 500,
+                                       cursor_token: str = None) -> AsyncIterator[Dict]:
+        """Async generator over an account's full history, one transaction at a time"""
+        async for page, _ in self.iter_transaction_pages(account_number, page_size,
+                                                         cursor_token):
+            for transaction in page:
+                yield transaction
+
+    async def get_mini_statement(self, account_number: str) -> List[Dict]:
+        """Get last 5 transactions (mini statement)"""
+        return await self.get_transaction_history(account_number, limit=5)
+
+    async def get_account_summary(self, customer_id: int) -> Dict:
+        """Get complete account summary for customer"""
+        try:
+            async with self.backend.session() as (connection, cursor):
+                await cursor.execute(self._sql('account_summary'), {'customer_id': customer_id})
+                result = await cursor.fetchone()
+
+                return {
+                    'total_accounts': result[0] or 0,
+                    'total_balance': round(float(result[1] or 0), 2),
+                    'total_transactions': int(result[2] or 0)
+                }
+        except Exception as e:
+            log_event(log, logging.ERROR, 'fetch_failed', "Error fetching account summary: {error}",
+                      customer_id=customer_id, error=str(e))
+            return {'total_accounts': 0, 'total_balance': 0, 'total_transactions': 0}
+
+    async def deposit_money(self, account_number: str, amount: float,
+                            description: str = "Cash Deposit") -> bool:
+        """Deposit money into account"""
+        try:
+            async with self.backend.session() as (connection, cursor):
+                await self.backend.deposit_money(cursor, account_number, amount, description)
+                log_event(log, logging.INFO, 'deposit', "Deposited ₹{amount:,.2f}",
+                          account_number=account_number, amount=amount)
+                return True
+        except Exception as e:
+            log_event(log, logging.ERROR, 'deposit_failed', "Deposit failed: {error}",
+                      account_number=account_number, amount=amount, error=str(e))
+            return False
+
+    async def withdraw_money(self, account_number: str, amount: float,
+                             description: str = "Cash Withdrawal") -> bool:
+        """Withdraw money from account"""
+        try:
+            async with self.backend.session() as (connection, cursor):
+                await self.backend.withdraw_money(cursor, account_number, amount, description)
+                log_event(log, logging.INFO, 'withdrawal', "Withdrawn ₹{amount:,.2f}",
+                          account_number=account_number, amount=amount)
+                return True
+        except Exception as e:
+            log_event(log, logging.ERROR, 'withdrawal_failed', "Withdrawal failed: {error}",
+                      account_number=account_number, amount=amount, error=str(e))
+            return False
+
+    async def transfer_money(self, from_account: str, to_account: str, amount: float) -> bool:
+        """Transfer money between accounts (atomic, in the transfer_money procedure)"""
+        try:
+            async with self.backend.session() as (connection, cursor):
+                await self.backend.transfer_money(cursor, from_account, to_account, amount)
+                log_event(log, logging.INFO, 'transfer',
+                          "Transferred ₹{amount:,.2f} from {from_account} to {to_account}",
+                          from_account=from_account, to_account=to_account, amount=amount)
+                return True
+        except Exception as e:
+            log_event(log, logging.ERROR, 'transfer_failed', "Transfer failed: {error}", from_account=from_account,
+                      to_account=to_account, amount=amount, error=str(e))
+            return False
+
+    async def get_bank_stats(self) -> Optional[Dict]:
+        """Fetch total active accounts, total balance and total transactions"""
+        try:
+            async with self.backend.session() as (connection, cursor):
+                await cursor.execute(self._sql('bank_totals'))
+                result = await cursor.fetchone()
+
+                if result:
+                    return {
+                        'total_active_accounts': int(result[0]),
+                        'total_balance': round(float(result[1]), 2),
+                        'total_transactions': int(result[2])
+                    }
+                return None
+        except Exception as e:
+            log_event(log, logging.ERROR, 'fetch_failed', "Error fetching bank statistics: {error}", error=str(e))
+            return None
+
+    async def update_customer_info(self, customer_id: int, phone: str = None,
+                                   address: str = None) -> bool:
+        """Update customer contact information (fields left empty keep their value)"""
+        if not phone and not address:
+            return False
+        try:
+            async with self.backend.session() as (connection, cursor):
+                await cursor.execute(self._sql('update_customer_contact'),
+                                     {'phone': phone or None, 'address': address or None,
+                                      'customer_id': customer_id})
+                await connection.commit()
+                log_event(log, logging.INFO, 'customer_updated', "Customer info updated",
+                          customer_id=customer_id)
+                return True
+        except Exception as e:
+            log_event(log, logging.ERROR, 'update_failed', "Update failed: {error}",
+                      customer_id=customer_id, error=str(e))
+            return False
+
+
+def _workload(count: int, accounts: List[str], seed: int = 7) -> List[Tuple]:
+    """Mixed read/write requests: (operation, args)"""
+    rng = random.Random(seed)
+    requests = []
+    for _ in range(count):
+        account = rng.choice(accounts)
+        roll = rng.random()
+        if roll < 0.5:
+            requests.append(('get_account_details', (account,)))
+        elif roll < 0.8:
+            requests.append(('get_transaction_history', (account, 20)))
+        elif roll < 0.9:
+            requests.append(('deposit_money', (account, 10.0, "Benchmark")))
+        else:
+            requests.append(('transfer_money', (account, rng.choice(accounts), 1.0)))
+    return requests
+
+
+async def _run_async(path: str, requests: List[Tuple], latency: float) -> Dict:
+    db = AsyncBankDatabase(backend=AsyncSQLiteBackend(path, latency=latency))
+    await db.connect()
+    try:
+        started = time.perf_counter()
+        await asyncio.gather(*(getattr(db, operation)(*args) for operation, args in requests))
+        return {'elapsed_seconds': time.perf_counter() - started}
+    finally:
+        await db.disconnect()
+
+
+class _RoundTripCursor:
+    """sqlite3 cursor that sleeps one simulated round trip per statement"""
+
+    def __init__(self, cursor, latency: float):
+        self._cursor = cursor
+        self._latency = latency
+
+    def execute(self, sql, params=()):
+        time.sleep(self._latency)
+        return self._cursor.execute(sql, params)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class _RoundTripBackend:
+    """SQLiteBackend for the threaded client, charged the same round trips
+    as AsyncSQLiteBackend: one per client statement and one per procedure"""
+
+    PROCEDURES = ('open_account', 'deposit_money', 'withdraw_money', 'transfer_money')
+
+    def __init__(self, engine: SQLiteBackend, latency: float):
+        self.engine = engine
+        self.latency = latency
+
+    @contextlib.contextmanager
+    def session(self):
+        with self.engine.session() as (connection, cursor):
+            yield connection, _RoundTripCursor(cursor, self.latency)
+
+    def __getattr__(self, name):
+        attribute = getattr(self.engine, name)
+        if name not in self.PROCEDURES:
+            return attribute
+
+        def call(cursor, *args):
+            time.sleep(self.latency)
+            return attribute(cursor._cursor, *args)
+        return call
+
+
+def _run_threaded(path: str, requests: List[Tuple], latency: float, threads: int) -> Dict:
+    # No metrics: the async client has none, and the procedures need the raw cursor
+    db = BankDatabase(backend=_RoundTripBackend(SQLiteBackend(path, pool_max=threads), latency),
+                      metrics=False)
+    db.connect()
+    try:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(lambda request: getattr(db, request[0])(*request[1]), requests))
+        return {'elapsed_seconds': time.perf_counter() - started}
+    finally:
+        db.disconnect()
+
+
+def benchmark(requests: int = 5000, latency: float = 0.002, threads: int = 32,
+              customers: int = 200) -> Dict:
+    """Run one mixed workload as concurrent coroutines and on a thread pool
+
+    Both clients run against copies of the same synthetic bank in a SQLite
+    file, with latency seconds of simulated round trip per statement.
+    """
+    from bank_synthetic import populate
+    directory = tempfile.mkdtemp(prefix='bms_async_')
+    report = {'requests': requests, 'latency_seconds': latency, 'threads': threads}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for client in ('async', 'threaded'):
+            path = os.path.join(directory, f'{client}.db')
+            seed_db = BankDatabase(backend=SQLiteBackend(path))
+            seed_db.connect()
+            populate(seed_db, customers=customers, accounts_per_customer=2,
+                     transactions_per_account=20)
+            with seed_db.backend.session() as (connection, cursor):
+                cursor.execute("SELECT account_number FROM Accounts WHERE status = 'Active'")
+                accounts = [row[0] for row in cursor]
+            seed_db.disconnect()
+            workload = _workload(requests, accounts)
+            if client == 'async':
+                result = asyncio.run(_run_async(path, workload, latency))
+            else:
+                result = _run_threaded(path, workload, latency, threads)
+            result['requests_per_second'] = requests / result['elapsed_seconds']
+            report[client] = result
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Async vs threaded client benchmark")
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--latency', type=float, default=0.002,
+                        help="simulated round trip per statement, in seconds")
+    parser.add_argument('--threads', type=int, default=32,
+                        help="worker threads for the sync client")
+    args = parser.parse_args()
+    # Benchmark output only; the operations' own log lines are noise here
+    configure_logging(logging.CRITICAL)
+
+    report = benchmark(args.requests, args.latency, args.threads)
+    print(f"{args.requests} mixed requests, {args.latency * 1000:.1f} ms per round trip")
+    for client in ('async', 'threaded'):
+        label = 'asyncio coroutines' if client == 'async' else f'{args.threads} threads'
+        print(f"   {label:<20} {report[client]['elapsed_seconds']:8.2f}s "
+              f"{report[client]['requests_per_second']:10,.0f} req/sec")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,875 @@
+"""
+Bank Account Management System - Storage Backends
+Oracle Database and an embedded SQLite engine behind one interface
+
+Every backend provides:
+  connect() / close()          - open and release connections (or a pool)
+  session()                    - context manager yielding (connection, cursor)
+  prepare(sql)                 - adapt Oracle-dialect SQL to the engine
+  open_account / deposit_money / withdraw_money / transfer_money
+                               - the stored procedures from BMS_schema.sql
+  post_many(cursor, type, rows) - post a batch of deposits or withdrawals in
+                                 one call, returning an error (or None) per
+                                 row; the caller decides when to commit
+  lock_accounts(cursor, numbers) - resolve and lock a set of active accounts,
+                                 lowest account_id first, so concurrent
+                                 batches cannot deadlock:
+                                 {number: (account_id, balance)}
+  string_list(cursor, values)  - bind value for a list of strings, queried
+                                 as (SELECT column_value FROM TABLE(:bind))
+  lock_tables(cursor, tables)  - block other writers until the next commit
+  allocate_ids(cursor, seq, n) - reserve a block of n sequence values
+  IntegrityError               - exception raised on constraint violations
+  retryable(error)             - True for deadlocks, serialization failures
+                                 and lock timeouts, where the whole
+                                 transaction can simply be run again
+  parse_counts(cursor)         - server parse/hard-parse/execution counts per
+                                 bank_sql catalog statement, or None
+  records(cursor, record, sql, params)
+                               - run a query and fetch its rows as
+                                 bank_rows records, amounts as Decimal
+  fetch_arrays(connection, cursor, sql, params, dtypes, batch_size)
+                               - run a query and fetch it as one NumPy
+                                 array per column (needs numpy)
+
+Statement caches (oracledb stmtcachesize, sqlite3 cached_statements) are
+sized to bank_sql.STATEMENT_CACHE_SIZE so the whole catalog stays cached.
+
+AsyncOracleBackend and AsyncSQLiteBackend offer the same connect/close,
+session, prepare and procedure calls as coroutines (session() is an async
+context manager and cursor execute/fetch calls are awaited), for
+AsyncBankDatabase in bank_async.py.
+"""
+
+import asyncio
+import decimal
+import json
+import os
+import queue
+import re
+import sqlite3
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import oracledb
+except ImportError:
+    oracledb = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+from bank_sql import STATEMENT_CACHE_SIZE, sql
+
+
+class ProcedureError(Exception):
+    """Business rule violation raised by a procedure (RAISE_APPLICATION_ERROR)"""
+
+
+def _fetch_arrays(cursor, statement: str, params, dtypes, batch_size: int) -> Dict:
+    """Column arrays of a query via fetchmany: only one batch of row tuples is alive at a time"""
+    if np is None:
+        raise ImportError("numpy is required for columnar fetches (pip install numpy)")
+    cursor.arraysize = batch_size
+    cursor.execute(statement, params)
+    chunks = [[] for _ in dtypes]
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        for chunk, values, (_, dtype) in zip(chunks, zip(*rows), dtypes):
+            chunk.append(np.array(values, dtype=dtype))
+    return {name: np.concatenate(chunk) if chunk else np.empty(0, dtype=dtype)
+            for chunk, (name, dtype) in zip(chunks, dtypes)}
+
+
+def _decimal_numbers(cursor, metadata):
+    """oracledb output type handler: NUMBER(p,s) columns with s > 0 as Decimal"""
+    if metadata.type_code is oracledb.DB_TYPE_NUMBER and (metadata.scale or 0) > 0:
+        return cursor.var(decimal.Decimal, arraysize=cursor.arraysize)
+    return None
+
+
+class OracleBackend:
+    """Oracle Database backend - business logic runs in the PL/SQL procedures"""
+
+    name = 'oracle'
+
+    def __init__(self, username: str, password: str, dsn: str,
+                 pooled: bool = False, pool_min: int = 1, pool_max: int = 8,
+                 pool_increment: int = 1, pool_timeout: float = 10.0,
+                 ping_interval: int = 60):
+        if oracledb is None:
+            raise ImportError("python-oracledb is required for OracleBackend")
+        self.username = username
+        self.password = password
+        self.dsn = dsn
+        self.pooled = pooled
+        self.pool_min = pool_min
+        self.pool_max = pool_max
+        self.pool_increment = pool_increment
+        self.pool_timeout = pool_timeout
+        self.ping_interval = ping_interval
+        self.pool = None
+        self.connection = None
+        self.cursor = None
+        self._lock = threading.RLock()
+
+    @property
+    def IntegrityError(self):
+        return oracledb.IntegrityError
+
+    # ORA-00060 deadlock detected, ORA-08177 can't serialize access,
+    # ORA-00054 / ORA-30006 resource busy (NOWAIT / WAIT timeout expired)
+    RETRYABLE_ERRORS = {60, 8177, 54, 30006}
+
+    def retryable(self, error: Exception) -> bool:
+        if not isinstance(error, oracledb.DatabaseError) or not error.args:
+            return False
+        return getattr(error.args[0], 'code', None) in self.RETRYABLE_ERRORS
+
+    def parse_counts(self, cursor) -> Dict[str, Dict]:
+        """Shared-pool counters of the catalog statements (needs SELECT on V$SQLAREA)"""
+        cursor.execute(sql('statement_parse_counts'))
+        return {name: {'parse_calls': int(parse_calls), 'hard_parses': int(loads),
+                       'server_executions': int(executions)}
+                for name, parse_calls, loads, executions in cursor}
+
+    @staticmethod
+    def records(cursor, record, statement: str, params) -> List:
+        """Execute a query and fetch every row as a record, money as Decimal"""
+        # The shared cursor outlives this call, so the handler is only set for it
+        cursor.outputtypehandler = _decimal_numbers
+        try:
+            cursor.execute(statement, params)
+            # oracledb resets rowfactory on every execute
+            cursor.rowfactory = lambda *row: record.from_row(row)
+            return cursor.fetchall()
+        finally:
+            cursor.outputtypehandler = None
+
+    @staticmethod
+    def fetch_arrays(connection, cursor, statement: str, params, dtypes,
+                     batch_size: int) -> Dict:
+        """Column arrays of a query, dtypes as (name, dtype) pairs in select-list order
+
+        With pyarrow installed the rows are fetched with python-oracledb's
+        DataFrame fetch straight into Arrow buffers, so no Python object is
+        built per row; otherwise they come through fetchmany.
+        """
+        if pa is None or not hasattr(connection, 'fetch_df_all'):
+            return _fetch_arrays(cursor, statement, params, dtypes, batch_size)
+        if np is None:
+            raise ImportError("numpy is required for columnar fetches (pip install numpy)")
+        table = pa.table(connection.fetch_df_all(statement, params, arraysize=batch_size))
+        return {name: table.column(index).to_numpy().astype(dtype, copy=False)
+                for index, (name, dtype) in enumerate(dtypes)}
+
+    def connect(self):
+        """Open the shared connection, or the session pool in pooled mode"""
+        if self.pooled:
+            self.pool = oracledb.create_pool(
+                user=self.username,
+                password=self.password,
+                dsn=self.dsn,
+                mode=oracledb.SYSDBA,
+                min=self.pool_min,
+                max=self.pool_max,
+                increment=self.pool_increment,
+                getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+                wait_timeout=int(self.pool_timeout * 1000),
+                ping_interval=self.ping_interval,
+                stmtcachesize=STATEMENT_CACHE_SIZE
+            )
+        else:
+            self.connection = oracledb.connect(
+                user=self.username,
+                password=self.password,
+                dsn=self.dsn,
+                mode=oracledb.SYSDBA,
+                stmtcachesize=STATEMENT_CACHE_SIZE
+            )
+            self.cursor = self.connection.cursor()
+
+    def close(self):
+        if self.cursor:
+            self.cursor.close()
+        if self.connection:
+            self.connection.close()
+        if self.pool:
+            self.pool.close()
+
+    @contextmanager
+    def session(self):
+        """Yield (connection, cursor) for the duration of one operation
+
+        Pooled mode checks a connection out of the pool and returns it
+        afterwards; otherwise the shared connection is locked for the call.
+        Uncommitted work is rolled back if the operation raises.
+        """
+        if self.pool is not None:
+            with self.pool.acquire() as connection:
+                with connection.cursor() as cursor:
+                    try:
+                        yield connection, cursor
+                    except Exception:
+                        connection.rollback()
+                        raise
+        else:
+            with self._lock:
+                try:
+                    yield self.connection, self.cursor
+                except Exception:
+                    self.connection.rollback()
+                    raise
+
+    def prepare(self, sql: str) -> str:
+        return sql
+
+    def open_account(self, cursor, customer_id: int, account_type: str,
+                     initial_deposit: float) -> str:
+        account_number = cursor.var(str)
+        cursor.callproc('open_account',
+                        [customer_id, account_type, initial_deposit, account_number])
+        return account_number.getvalue()
+
+    def deposit_money(self, cursor, account_number: str, amount: float,
+                      description: str):
+        cursor.callproc('deposit_money', [account_number, amount, description])
+
+    def withdraw_money(self, cursor, account_number: str, amount: float,
+                       description: str):
+        cursor.callproc('withdraw_money', [account_number, amount, description])
+
+    def transfer_money(self, cursor, from_account: str, to_account: str,
+                       amount: float):
+        cursor.callproc('transfer_money', [from_account, to_account, amount])
+
+    def post_many(self, cursor, transaction_type: str, rows: List[Tuple]) -> List[Optional[str]]:
+        """Array-bind a batch into the post_many procedure (one round trip)"""
+        connection = cursor.connection
+        text_list = connection.gettype('SYS.ODCIVARCHAR2LIST')
+        number_list = connection.gettype('SYS.ODCINUMBERLIST')
+        errors = cursor.var(text_list)
+        cursor.callproc('post_many', [
+            transaction_type,
+            text_list.newobject([row[0] for row in rows]),
+            number_list.newobject([row[1] for row in rows]),
+            text_list.newobject([row[2] for row in rows]),
+            errors
+        ])
+        return errors.getvalue().aslist()
+
+    def string_list(self, cursor, values: List[str]):
+        return cursor.connection.gettype('SYS.ODCIVARCHAR2LIST').newobject(list(values))
+
+    def allocate_ids(self, cursor, sequence: str, count: int) -> List[int]:
+        cursor.execute(sql('allocate_' + sequence), {'count': count})
+        return [row[0] for row in cursor]
+
+    def lock_tables(self, cursor, tables: List[str]):
+        for table in tables:
+            cursor.execute(sql('lock_table_' + table.lower()))
+
+    def lock_accounts(self, cursor, account_numbers: List[str]) -> Dict[str, Tuple]:
+        # A single SELECT ... ORDER BY account_id FOR UPDATE would lock rows as
+        # its cursor opens, in access-path order, so the ids are resolved first
+        # and locked one row at a time in ascending order, as transfer_money does
+        cursor.execute(sql('lock_accounts_resolve'),
+                       {'numbers': self.string_list(cursor, account_numbers)})
+        ids = cursor.connection.gettype('SYS.ODCINUMBERLIST').newobject(
+            [row[0] for row in cursor])
+        cursor.execute(sql('lock_accounts_in_order'), {'ids': ids})
+        # Locked now; an account closed since it was resolved drops out here
+        cursor.execute(sql('locked_accounts'), {'ids': ids})
+        return {row[0]: (row[1], row[2]) for row in cursor}
+
+
+# Oracle format masks used by the module, mapped to strftime directives
+_DATE_MASKS = [('YYYY', '%Y'), ('HH24', '%H'), ('MON', '%b'), ('MM', '%m'),
+               ('DD', '%d'), ('MI', '%M'), ('SS', '%S')]
+
+_SQLITE_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def _oracle_mask(mask: str) -> str:
+    for token, directive in _DATE_MASKS:
+        mask = mask.replace(token, directive)
+    return mask
+
+
+def _parse_date(value) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    if isinstance(value, bytes):
+        value = value.decode()
+    return datetime.fromisoformat(value)
+
+
+def _to_char(value, mask: str = None):
+    if value is None:
+        return None
+    if mask is None:
+        return str(value)
+    text = _parse_date(value).strftime(_oracle_mask(mask))
+    return text.upper() if 'MON' in mask else text
+
+
+def _to_date(value: str, mask: str) -> Optional[str]:
+    if value is None:
+        return None
+    parsed = datetime.strptime(value, _oracle_mask(mask))
+    return parsed.strftime(_SQLITE_DATE_FORMAT)
+
+
+def _lpad(value, width: int, fill: str = ' ') -> str:
+    return str(value).rjust(int(width), fill)
+
+
+sqlite3.register_adapter(datetime, lambda d: d.strftime(_SQLITE_DATE_FORMAT))
+sqlite3.register_converter('DATE', _parse_date)
+
+
+class SQLiteBackend:
+    """Embedded SQLite backend - the PL/SQL procedures re-implemented in Python
+
+    Each procedure runs as one BEGIN IMMEDIATE ... COMMIT transaction, so it
+    is atomic and serialized against other writers exactly like the Oracle
+    versions. Sequences are emulated with in-process counters seeded from
+    the current key maxima. A file database runs in WAL mode and hands out
+    up to pool_max connections; ':memory:' always uses a single connection.
+    trace, if given, receives every SQL statement executed (with binds
+    expanded), which the plan checker uses to capture the module's SQL.
+    """
+
+    name = 'sqlite'
+    IntegrityError = sqlite3.IntegrityError
+
+    @staticmethod
+    def retryable(error: Exception) -> bool:
+        # SQLITE_BUSY (5) and SQLITE_LOCKED (6), including their extended codes
+        return (isinstance(error, sqlite3.OperationalError)
+                and (getattr(error, 'sqlite_errorcode', 0) & 0xff) in (5, 6))
+
+    @staticmethod
+    def parse_counts(cursor) -> None:
+        # sqlite3 keeps no per-statement prepare counts
+        return None
+
+    @staticmethod
+    def records(cursor, record, statement: str, params) -> List:
+        """Execute a query and fetch every row as a record; REAL amounts become Decimal"""
+        cursor.execute(statement, params)
+        return [record.from_row(row) for row in cursor.fetchall()]
+
+    @staticmethod
+    def fetch_arrays(connection, cursor, statement: str, params, dtypes,
+                     batch_size: int) -> Dict:
+        """Column arrays of a query via fetchmany (sqlite3 has no columnar fetch)"""
+        return _fetch_arrays(cursor, statement, params, dtypes, batch_size)
+
+    SCHEMA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               'BMS_schema_sqlite.sql')
+
+    # sequence name -> (tables, key column, START WITH)
+    SEQUENCES = {
+        'customer_seq': (('Customers',), 'customer_id', 1001),
+        'account_seq': (('Accounts',), 'account_id', 100001),
+        'transaction_seq': (('Transactions', 'Transactions_Archive'), 'transaction_id', 1),
+    }
+
+    _TRANSLATIONS = [
+        (re.compile(r'\b(\w+)\.NEXTVAL\b', re.IGNORECASE), r"nextval('\1')"),
+        (re.compile(r'\bSYSDATE\b', re.IGNORECASE), 'sysdate()'),
+        (re.compile(r'\bFETCH\s+FIRST\s+(\S+)\s+ROWS\s+ONLY\b', re.IGNORECASE), r'LIMIT \1'),
+        (re.compile(r'\bOFFSET\s+(\S+)\s+ROWS\s+FETCH\s+NEXT\s+(\S+)\s+ROWS\s+ONLY\b',
+                    re.IGNORECASE), r'LIMIT \2 OFFSET \1'),
+        # collection binds (see string_list) become JSON arrays
+        (re.compile(r'\bTABLE\((:\w+)\)', re.IGNORECASE), r'json_each(\1)'),
+        (re.compile(r'\bcolumn_value\b', re.IGNORECASE), 'value'),
+    ]
+
+    def __init__(self, database: str = ':memory:', pool_max: int = 8,
+                 timeout: float = 30.0, create_schema: bool = True,
+                 trace: Callable[[str], None] = None):
+        self.database = database
+        self.pool_max = 1 if database == ':memory:' else pool_max
+        self.timeout = timeout
+        self.create_schema = create_schema
+        self.trace = trace
+        self._idle = None
+        self._created = 0
+        self._pool_lock = threading.Lock()
+        self._sequences: Dict[str, int] = {}
+        self._sequence_lock = threading.Lock()
+        self._prepared: Dict[str, str] = {}
+
+    def connect(self):
+        self._idle = queue.LifoQueue()
+        self._created = 1
+        connection = self._new_connection()
+        try:
+            exists = connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'Accounts'"
+            ).fetchone()
+            if not exists and self.create_schema:
+                with open(self.SCHEMA_FILE, encoding='utf-8') as schema:
+                    connection.executescript(schema.read())
+            tables = {row[0] for row in connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'")}
+            for name, (owners, column, start) in self.SEQUENCES.items():
+                current = 0
+                for table in owners:
+                    if table in tables:
+                        (value,) = connection.execute(f"SELECT MAX({column}) FROM {table}").fetchone()
+                        current = max(current, value or 0)
+                self._sequences[name] = max(start, current + 1)
+        except Exception:
+            connection.close()
+            raise
+        self._idle.put(connection)
+
+    def close(self):
+        if self._idle is None:
+            return
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        self._idle = None
+
+    def _new_connection(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.database, timeout=self.timeout,
+                                     check_same_thread=False,
+                                     detect_types=sqlite3.PARSE_DECLTYPES,
+                                     cached_statements=STATEMENT_CACHE_SIZE)
+        connection.execute(f"PRAGMA busy_timeout = {int(self.timeout * 1000)}")
+        connection.execute("PRAGMA foreign_keys = ON")
+        if self.database != ':memory:':
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+        connection.create_function('nextval', 1, self.nextval)
+        connection.create_function('sysdate', 0,
+                                   lambda: datetime.now().strftime(_SQLITE_DATE_FORMAT))
+        connection.create_function('nvl', 2, lambda a, b: b if a is None else a,
+                                   deterministic=True)
+        connection.create_function('to_char', 1, _to_char, deterministic=True)
+        connection.create_function('to_char', 2, _to_char, deterministic=True)
+        connection.create_function('to_date', 2, _to_date, deterministic=True)
+        connection.create_function('lpad', 3, _lpad, deterministic=True)
+        if self.trace is not None:
+            connection.set_trace_callback(self.trace)
+        return connection
+
+    def nextval(self, name: str, count: int = 1) -> int:
+        """Return the next value of an emulated sequence (reserving count values)"""
+        with self._sequence_lock:
+            value = self._sequences[name]
+            self._sequences[name] = value + count
+            return value
+
+    @contextmanager
+    def session(self):
+        """Check a connection out of the pool for one operation"""
+        connection = self._checkout()
+        cursor = connection.cursor()
+        try:
+            yield connection, cursor
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            cursor.close()
+            if connection.in_transaction:
+                connection.rollback()
+            self._idle.put(connection)
+
+    def _checkout(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._pool_lock:
+            if self._created < self.pool_max:
+                self._created += 1
+                return self._new_connection()
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError("Timed out waiting for a free SQLite connection")
+
+    def prepare(self, sql: str) -> str:
+        """Translate the Oracle idioms the module uses into SQLite syntax"""
+        prepared = self._prepared.get(sql)
+        if prepared is None:
+            prepared = sql
+            for pattern, replacement in self._TRANSLATIONS:
+                prepared = pattern.sub(replacement, prepared)
+            self._prepared[sql] = prepared
+        return prepared
+
+    @contextmanager
+    def _transaction(self, cursor):
+        """BEGIN IMMEDIATE ... COMMIT, rolled back on any error (like the PL/SQL handlers)"""
+        connection = cursor.connection
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+
+    def _active_account(self, cursor, account_number: str):
+        cursor.execute("""
+            SELECT account_id, balance FROM Accounts
+            WHERE account_number = ? AND status = 'Active'
+            """, (account_number,))
+        row = cursor.fetchone()
+        if row is None:
+            raise ProcedureError(f"Account {account_number} not found or inactive")
+        return row
+
+    def _apply(self, cursor, account_number: str, transaction_type: str, amount: float):
+        """Move an active account's balance in one conditional UPDATE ... RETURNING
+
+        Withdrawals only match while the balance covers the amount. Returns
+        (account_id, new balance); a miss is diagnosed afterwards.
+        """
+        withdrawal = transaction_type == 'Withdrawal'
+        cursor.execute("""
+            UPDATE Accounts SET balance = round(balance + ?, 2)
+            WHERE account_number = ? AND status = 'Active' AND (? = 0 OR balance >= ?)
+            RETURNING account_id, balance
+            """, (-amount if withdrawal else amount, account_number, withdrawal, amount))
+        row = cursor.fetchone()
+        if row is None:
+            self._active_account(cursor, account_number)
+            raise ProcedureError("Insufficient balance")
+        return row
+
+    def _post(self, cursor, account_id: int, transaction_type: str, amount: float,
+              balance_after: float, description: str, reference: str = None):
+        cursor.execute("""
+            INSERT INTO Transactions VALUES (nextval('transaction_seq'), ?, ?, ?, ?, sysdate(), ?, ?)
+            """, (account_id, transaction_type, amount, balance_after, description, reference))
+
+    def open_account(self, cursor, customer_id: int, account_type: str,
+                     initial_deposit: float) -> str:
+        interest_rate = {'Savings': 4.00, 'Fixed Deposit': 6.50}.get(account_type, 0)
+        with self._transaction(cursor):
+            account_id = self.nextval('account_seq')
+            account_number = 'ACC' + _lpad(account_id, 10, '0')
+            cursor.execute("""
+                INSERT INTO Accounts VALUES (?, ?, ?, ?, ?, ?, sysdate(), 'Active')
+                """, (account_id, customer_id, account_number, account_type,
+                      initial_deposit, interest_rate))
+            if initial_deposit > 0:
+                self._post(cursor, account_id, 'Deposit', initial_deposit,
+                           initial_deposit, 'Account Opening Deposit')
+        return account_number
+
+    def post_many(self, cursor, transaction_type: str, rows: List[Tuple]) -> List[Optional[str]]:
+        """Post a batch inside the open transaction, one savepoint per row"""
+        if not cursor.connection.in_transaction:
+            cursor.execute("BEGIN IMMEDIATE")
+        errors = []
+        for account_number, amount, description in rows:
+            cursor.execute("SAVEPOINT post_row")
+            try:
+                account_id, new_balance = self._apply(cursor, account_number,
+                                                      transaction_type, amount)
+                self._post(cursor, account_id, transaction_type, amount, new_balance,
+                           description)
+                errors.append(None)
+            except (ProcedureError, sqlite3.IntegrityError) as e:
+                cursor.execute("ROLLBACK TO post_row")
+                errors.append(str(e))
+            cursor.execute("RELEASE post_row")
+        return errors
+
+    def string_list(self, cursor, values: List[str]) -> str:
+        return json.dumps(list(values))
+
+    def allocate_ids(self, cursor, sequence: str, count: int) -> List[int]:
+        first = self.nextval(sequence, count)
+        return list(range(first, first + count))
+
+    def lock_tables(self, cursor, tables: List[str]):
+        # SQLite has one writer lock for the whole database
+        if not cursor.connection.in_transaction:
+            cursor.execute("BEGIN IMMEDIATE")
+
+    def lock_accounts(self, cursor, account_numbers: List[str]) -> Dict[str, Tuple]:
+        if not cursor.connection.in_transaction:
+            cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute(self.prepare(sql('locked_accounts_by_number')),
+                       {'numbers': self.string_list(cursor, account_numbers)})
+        return {row[0]: (row[1], row[2]) for row in cursor}
+
+    def deposit_money(self, cursor, account_number: str, amount: float,
+                      description: str):
+        with self._transaction(cursor):
+            account_id, new_balance = self._apply(cursor, account_number, 'Deposit', amount)
+            self._post(cursor, account_id, 'Deposit', amount, new_balance, description)
+
+    def withdraw_money(self, cursor, account_number: str, amount: float,
+                       description: str):
+        with self._transaction(cursor):
+            account_id, new_balance = self._apply(cursor, account_number, 'Withdrawal',
+                                                  amount)
+            self._post(cursor, account_id, 'Withdrawal', amount, new_balance, description)
+
+    def transfer_money(self, cursor, from_account: str, to_account: str,
+                       amount: float):
+        if from_account == to_account:
+            raise ProcedureError("Cannot transfer to the same account")
+        with self._transaction(cursor):
+            locked = self.lock_accounts(cursor, [from_account, to_account])
+            for account_number in (from_account, to_account):
+                if account_number not in locked:
+                    raise ProcedureError(f"Account {account_number} not found or inactive")
+            from_id, from_balance = locked[from_account]
+            to_id, to_balance = locked[to_account]
+            if from_balance < amount:
+                raise ProcedureError("Insufficient balance for transfer")
+            from_new_balance = round(from_balance - amount, 2)
+            to_new_balance = round(to_balance + amount, 2)
+            cursor.execute("UPDATE Accounts SET balance = ? WHERE account_id = ?",
+                           (from_new_balance, from_id))
+            cursor.execute("UPDATE Accounts SET balance = ? WHERE account_id = ?",
+                           (to_new_balance, to_id))
+            self._post(cursor, from_id, 'Transfer-Out', amount, from_new_balance,
+                       'Transfer to ' + to_account, to_account)
+            self._post(cursor, to_id, 'Transfer-In', amount, to_new_balance,
+                       'Transfer from ' + from_account, from_account)
+
+
+class AsyncOracleBackend:
+    """Oracle Database backend on python-oracledb's asyncio pool (thin mode)"""
+
+    name = 'oracle'
+
+    def __init__(self, username: str, password: str, dsn: str,
+                 pool_min: int = 1, pool_max: int = 32, pool_increment: int = 1,
+                 pool_timeout: float = 10.0, ping_interval: int = 60):
+        if oracledb is None:
+            raise ImportError("python-oracledb is required for AsyncOracleBackend")
+        self.username = username
+        self.password = password
+        self.dsn = dsn
+        self.pool_min = pool_min
+        self.pool_max = pool_max
+        self.pool_increment = pool_increment
+        self.pool_timeout = pool_timeout
+        self.ping_interval = ping_interval
+        self.pool = None
+
+    @property
+    def IntegrityError(self):
+        return oracledb.IntegrityError
+
+    async def connect(self):
+        self.pool = oracledb.create_pool_async(
+            user=self.username,
+            password=self.password,
+            dsn=self.dsn,
+            mode=oracledb.SYSDBA,
+            min=self.pool_min,
+            max=self.pool_max,
+            increment=self.pool_increment,
+            getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+            wait_timeout=int(self.pool_timeout * 1000),
+            ping_interval=self.ping_interval,
+            stmtcachesize=STATEMENT_CACHE_SIZE
+        )
+
+    async def close(self):
+        if self.pool:
+            await self.pool.close()
+            self.pool = None
+
+    @asynccontextmanager
+    async def session(self):
+        """Check a connection out of the async pool for one operation"""
+        async with self.pool.acquire() as connection:
+            with connection.cursor() as cursor:
+                try:
+                    yield connection, cursor
+                except Exception:
+                    await connection.rollback()
+                    raise
+
+    def prepare(self, sql: str) -> str:
+        return sql
+
+    async def open_account(self, cursor, customer_id: int, account_type: str,
+                           initial_deposit: float) -> str:
+        account_number = cursor.var(str)
+        await cursor.callproc('open_account',
+                              [customer_id, account_type, initial_deposit, account_number])
+        return account_number.getvalue()
+
+    async def deposit_money(self, cursor, account_number: str, amount: float,
+                            description: str):
+        await cursor.callproc('deposit_money', [account_number, amount, description])
+
+    async def withdraw_money(self, cursor, account_number: str, amount: float,
+                             description: str):
+        await cursor.callproc('withdraw_money', [account_number, amount, description])
+
+    async def transfer_money(self, cursor, from_account: str, to_account: str,
+                             amount: float):
+        await cursor.callproc('transfer_money', [from_account, to_account, amount])
+
+
+class _AsyncSQLiteConnection:
+    """Per-session connection handle of AsyncSQLiteBackend"""
+
+    def __init__(self, backend: 'AsyncSQLiteBackend'):
+        self.backend = backend
+        self.writing = False
+
+    async def begin_write(self):
+        if not self.writing:
+            await self.backend._write_lock.acquire()
+            self.writing = True
+
+    def end_write(self):
+        if self.writing:
+            self.writing = False
+            self.backend._write_lock.release()
+
+    async def commit(self):
+        await self.backend._round_trip()
+        self.backend._connection.commit()
+        self.end_write()
+
+    async def rollback(self):
+        self.backend._connection.rollback()
+        self.end_write()
+
+
+class _AsyncSQLiteCursor:
+    """Awaitable cursor over the shared sqlite3 connection"""
+
+    def __init__(self, connection: _AsyncSQLiteConnection):
+        self.connection = connection
+        self._cursor = connection.backend._connection.cursor()
+        self.arraysize = 1
+
+    async def execute(self, sql: str, params=()):
+        await self.connection.backend._round_trip()
+        if not sql.lstrip().upper().startswith('SELECT'):
+            await self.connection.begin_write()
+        self._cursor.execute(sql, params)
+
+    async def fetchone(self):
+        return self._cursor.fetchone()
+
+    async def fetchmany(self, size: int = None):
+        return self._cursor.fetchmany(size or self.arraysize)
+
+    async def fetchall(self):
+        return self._cursor.fetchall()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        row = self._cursor.fetchone()
+        if row is None:
+            raise StopAsyncIteration
+        return row
+
+    def close(self):
+        self._cursor.close()
+
+
+class AsyncSQLiteBackend:
+    """Async stand-in for AsyncOracleBackend, for tests and benchmarks
+
+    Wraps a SQLiteBackend and runs every statement on the event-loop thread
+    against one shared connection, so there are no worker threads. Each
+    statement, commit and procedure call awaits one simulated network round
+    trip of latency seconds (0 just yields to the loop). Procedures are
+    atomic and a session that writes with plain DML holds a write lock
+    until it commits or rolls back, which serializes writers much like row
+    locks would; reads never wait.
+    """
+
+    name = 'sqlite'
+    IntegrityError = sqlite3.IntegrityError
+
+    def __init__(self, database: str = ':memory:', latency: float = 0.0,
+                 create_schema: bool = True):
+        self.engine = SQLiteBackend(database, pool_max=1, create_schema=create_schema)
+        self.latency = latency
+        self._connection = None
+        self._write_lock = None
+
+    async def connect(self):
+        self.engine.connect()
+        self._connection = self.engine._checkout()
+        self._write_lock = asyncio.Lock()
+
+    async def close(self):
+        if self._connection is not None:
+            self.engine._idle.put(self._connection)
+            self._connection = None
+        self.engine.close()
+
+    async def _round_trip(self):
+        await asyncio.sleep(self.latency)
+
+    @asynccontextmanager
+    async def session(self):
+        connection = _AsyncSQLiteConnection(self)
+        cursor = _AsyncSQLiteCursor(connection)
+        try:
+            yield connection, cursor
+        except Exception:
+            await connection.rollback()
+            raise
+        finally:
+            cursor.close()
+            if connection.writing:
+                await connection.rollback()
+
+    def prepare(self, sql: str) -> str:
+        return self.engine.prepare(sql)
+
+    async def _call(self, cursor: _AsyncSQLiteCursor, procedure: Callable, *args):
+        await self._round_trip()
+        async with self._write_lock:
+            return procedure(cursor._cursor, *args)
+
+    async def open_account(self, cursor, customer_id: int, account_type: str,
+                           initial_deposit: float) -> str:
+        return await self._call(cursor, self.engine.open_account, customer_id,
+                                account_type, initial_deposit)
+
+    async def deposit_money(self, cursor, account_number: str, amount: float,
+                            description: str):
+        await self._call(cursor, self.engine.deposit_money, account_number, amount,
+                         description)
+
+    async def withdraw_money(self, cursor, account_number: str, amount: float,
+                             description: str):
+        await self._call(cursor, self.engine.withdraw_money, account_number, amount,
+                         description)
+
+    async def transfer_money(self, cursor, from_account: str, to_account: str,
+                             amount: float):
+        await self._call(cursor, self.engine.transfer_money, from_account, to_account,
+                         amount)
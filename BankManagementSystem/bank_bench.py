@@ -0,0 +1,354 @@
+"""
+Bank Account Management System - Micro-Benchmark Suite
+Latency percentiles and throughput for every public BankDatabase method
+
+A synthetic bank (bank_synthetic.py) is generated in an embedded SQLite
+file at the requested scale, or reused if the file already holds one, and
+each method is called repeatedly with randomized arguments drawn from the
+population. Rows older than --archive-days are moved to the archive tier
+once, when the file is built or first reused, so history reads that reach
+back that far measure the tiered path. Results (p50/p95/p99 latency,
+mean, ops/sec) are written as JSON; given a baseline file, any method
+whose p95 latency grew by more than the threshold is reported and the run
+exits non-zero.
+
+Usage:
+    python bank_bench.py --customers 100000 --accounts-per-customer 3 \\
+        --transactions-per-account 33 --database bench.db
+    python bank_bench.py --database bench.db --baseline bench_baseline.json
+"""
+
+import argparse
+import contextlib
+import csv
+import inspect
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Tuple
+
+from bank_backends import SQLiteBackend
+from bank_database import BankDatabase
+from bank_metrics import configure_logging
+from bank_sql import HISTORY_SORT_COLUMNS
+from bank_synthetic import populate
+
+# Public methods that are not database operations, or not repeatable ones
+NOT_BENCHMARKED = {'connect', 'disconnect', 'cache_stats',
+                   'archive_transactions'}  # one-shot job; see bank_tiering.py
+
+# Whole-ledger jobs are far slower than everything else; cap their iterations
+HEAVY = {'verify_aggregates', 'rebuild_aggregates', 'ledger_columns', 'account_columns'}
+HEAVY_ITERATIONS = 10
+
+# Rows a busy admin dashboard poll folds in (get_dashboard_delta case)
+DELTA_POSTINGS = 1000
+DELTA_ACCOUNTS = 10
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(0, min(len(ordered) - 1, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def summarize(samples: List[float]) -> Dict:
+    """Latency percentiles (ms) and throughput for one method's samples (seconds)"""
+    ordered = sorted(samples)
+    total = sum(ordered)
+    return {
+        'iterations': len(ordered),
+        'ops_per_sec': len(ordered) / total if total > 0 else 0.0,
+        'mean_ms': total / len(ordered) * 1000,
+        'p50_ms': percentile(ordered, 0.50) * 1000,
+        'p95_ms': percentile(ordered, 0.95) * 1000,
+        'p99_ms': percentile(ordered, 0.99) * 1000,
+    }
+
+
+def open_bank(path: str, customers: int, accounts_per_customer: int,
+              transactions_per_account: int,
+              archive_days: int = 365) -> Tuple[BankDatabase, Dict]:
+    """Open a scratch copy of the bank at path, generating (and tiering) it first if needed
+
+    The benchmark writes (deposits, new customers, ...), so it runs on a
+    copy: every run against the same file starts from the same state and
+    results stay comparable with a saved baseline.
+    """
+    db = BankDatabase(backend=SQLiteBackend(path))
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        db.connect()
+    try:
+        with db.backend.session() as (connection, cursor):
+            cursor.execute("SELECT COUNT(*) FROM Customers WHERE email LIKE '%@synthetic.bank'")
+            existing = cursor.fetchone()[0]
+        if not existing:
+            started = time.perf_counter()
+            print(f"Generating {customers:,} customers x {accounts_per_customer} accounts x "
+                  f"{transactions_per_account} transactions...")
+            populate(db, customers=customers, accounts_per_customer=accounts_per_customer,
+                     transactions_per_account=transactions_per_account)
+            with db.backend.session() as (connection, cursor):
+                cursor.execute("ANALYZE")
+                connection.commit()
+            print(f"   done in {time.perf_counter() - started:.1f}s")
+        with db.backend.session() as (connection, cursor):
+            cursor.execute("SELECT COUNT(*) FROM Transactions_Archive")
+            archived = cursor.fetchone()[0]
+        if archive_days and not archived:
+            started = time.perf_counter()
+            print(f"Archiving transactions older than {archive_days} days...")
+            db.archive_transactions(horizon_days=archive_days)
+            with db.backend.session() as (connection, cursor):
+                cursor.execute("ANALYZE")
+                connection.commit()
+            print(f"   done in {time.perf_counter() - started:.1f}s")
+        scratch = os.path.join(tempfile.mkdtemp(prefix='bms_bench_'), 'bench.db')
+        with db.backend.session() as (connection, cursor):
+            target = sqlite3.connect(scratch)
+            connection.backup(target)
+            target.close()
+    finally:
+        with contextlib.redirect_stdout(open(os.devnull, 'w')):
+            db.disconnect()
+
+    db = BankDatabase(backend=SQLiteBackend(scratch))
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        db.connect()
+    with db.backend.session() as (connection, cursor):
+        scale = {}
+        for table in ('Customers', 'Accounts', 'Transactions', 'Transactions_Archive'):
+            cursor.execute(f"SELECT COUNT(*) FROM {table}")
+            scale[table.lower()] = cursor.fetchone()[0]
+    return db, scale
+
+
+def build_cases(db: BankDatabase, rng: random.Random, workdir: str) -> Dict[str, Callable]:
+    """One zero-argument callable per benchmarked method, drawing fresh arguments each call"""
+    with db.backend.session() as (connection, cursor):
+        cursor.execute("""
+            SELECT a.account_number, a.customer_id FROM Accounts a
+            JOIN Customers c ON c.customer_id = a.customer_id
+            WHERE a.status = 'Active' AND c.email LIKE '%@synthetic.bank'
+            """)
+        owned = cursor.fetchall()
+    accounts = [row[0] for row in owned]
+    customers = sorted({row[1] for row in owned})
+    since = datetime.now() - timedelta(days=30)
+    until = datetime.now() + timedelta(days=1)
+    serial = iter(range(10**9))
+    sorts = sorted(HISTORY_SORT_COLUMNS)
+
+    def account():
+        return rng.choice(accounts)
+
+    def customer():
+        return rng.choice(customers)
+
+    # The admin dashboard resyncs with a snapshot and polls deltas in between.
+    # A busy poll folds in the DELTA_POSTINGS newest ledger rows (new postings
+    # are always in the hot tier) before a recent snapshot; the steady poll
+    # starts where the previous one stopped.
+    snapshot = db.get_dashboard_snapshot()
+    with db.backend.session() as (connection, cursor):
+        cursor.execute("SELECT MIN(transaction_id) FROM (SELECT transaction_id FROM Transactions "
+                       "ORDER BY transaction_id DESC LIMIT ?)", (DELTA_POSTINGS,))
+        busy_poll = ((cursor.fetchone()[0] or 1) - 1,
+                     max(0, snapshot['last_account_id'] - DELTA_ACCOUNTS))
+    polled = {'ids': (snapshot['last_transaction_id'], snapshot['last_account_id'])}
+
+    def dashboard_poll():
+        delta = db.get_dashboard_delta(*polled['ids'])
+        polled['ids'] = delta['last_transaction_id'], delta['last_account_id']
+        return delta
+
+    transfer_csv = os.path.join(workdir, 'bench_transfers.csv')
+
+    def transfer_file():
+        with open(transfer_csv, 'w', newline='', encoding='utf-8') as handle:
+            writer = csv.writer(handle)
+            writer.writerow(['from_account', 'to_account', 'amount', 'description'])
+            writer.writerows((account(), account(), 1, 'bench') for _ in range(100))
+        return db.transfer_file(transfer_csv)
+
+    return {
+        'customer_login': lambda: db.customer_login(
+            f"customer{customer()}@synthetic.bank", 'synthetic'),
+        'register_customer': lambda: db.register_customer(
+            'Bench Customer', f"bench{next(serial)}.{time.time_ns()}@bench.bank",
+            '9000000000', 'Benchmark', '1990-01-01', 'bench'),
+        'create_account': lambda: db.create_account(customer(), 'Savings', 100),
+        'get_customer_accounts': lambda: db.get_customer_accounts(customer()),
+        'get_account_details': lambda: db.get_account_details(account()),
+        'get_transaction_history': lambda: db.get_transaction_history(account()),
+        'get_mini_statement': lambda: db.get_mini_statement(account()),
+        # A history screen view: any offset, sort and direction, over the whole
+        # history (both tiers) or the last 30 days (hot tier only)
+        'get_transaction_page': lambda: db.get_transaction_page(
+            account(), offset=rng.randrange(40), sort=rng.choice(sorts),
+            descending=rng.random() < 0.5, start_date=rng.choice((None, since))),
+        'count_transactions': lambda: db.count_transactions(
+            account(), start_date=rng.choice((None, since))),
+        'iter_transaction_pages': lambda: next(db.iter_transaction_pages(account(), page_size=50),
+                                               None),
+        'iter_transaction_history': lambda: sum(1 for _ in db.iter_transaction_history(account())),
+        'iter_statement_batches': lambda: sum(len(batch) for batch in db.iter_statement_batches(
+            since, until, [account() for _ in range(10)])),
+        # The bank-wide 30-day slice bank_analytics reports on
+        'ledger_columns': lambda: db.ledger_columns(since, until),
+        'account_columns': lambda: db.account_columns(),
+        'get_account_summary': lambda: db.get_account_summary(customer()),
+        'get_bank_stats': lambda: db.get_bank_stats(),
+        'get_dashboard_snapshot': lambda: db.get_dashboard_snapshot(),
+        'get_dashboard_delta': lambda: db.get_dashboard_delta(*busy_poll),
+        'dashboard_steady_poll': dashboard_poll,
+        'deposit_money': lambda: db.deposit_money(account(), 10, 'bench'),
+        'withdraw_money': lambda: db.withdraw_money(account(), 1, 'bench'),
+        'transfer_money': lambda: db.transfer_money(account(), account(), 1),
+        'deposit_many': lambda: db.deposit_many([(account(), 10, 'bench') for _ in range(100)]),
+        'withdraw_many': lambda: db.withdraw_many([(account(), 1, 'bench') for _ in range(100)]),
+        'transfer_many': lambda: db.transfer_many([(account(), account(), 1) for _ in range(100)]),
+        'transfer_file': transfer_file,
+        'post_group': lambda: db.post_group(
+            [(rng.choice(('Deposit', 'Withdrawal')), (account(), 1, 'bench')) for _ in range(50)]
+            + [('Transfer', (account(), account(), 1)) for _ in range(50)]),
+        'update_customer_info': lambda: db.update_customer_info(
+            customer(), phone=f"9{rng.randrange(10**9):09d}"),
+        'statement_stats': lambda: db.statement_stats(),
+        'verify_aggregates': lambda: db.verify_aggregates(),
+        'rebuild_aggregates': lambda: db.rebuild_aggregates(),
+    }
+
+
+def run_benchmarks(db: BankDatabase, iterations: int, warmup: int = 5,
+                   only: List[str] = None, seed: int = 1234) -> Dict[str, Dict]:
+    """Time every case; returns {method: summary}"""
+    rng = random.Random(seed)
+    cases = build_cases(db, rng, os.path.dirname(os.path.abspath(db.backend.database)))
+    public = {name for name, _ in inspect.getmembers(BankDatabase, inspect.isfunction)
+              if not name.startswith('_')}
+    missing = sorted(public - NOT_BENCHMARKED - set(cases))
+    if missing:
+        print(f"⚠️  Not benchmarked: {', '.join(missing)}")
+
+    results = {}
+    with open(os.devnull, 'w') as devnull:
+        for name, call in cases.items():
+            if only and name not in only:
+                continue
+            count = min(iterations, HEAVY_ITERATIONS) if name in HEAVY else iterations
+            samples = []
+            with contextlib.redirect_stdout(devnull):
+                for _ in range(warmup if name not in HEAVY else 1):
+                    call()
+                for _ in range(count):
+                    started = time.perf_counter()
+                    call()
+                    samples.append(time.perf_counter() - started)
+            results[name] = summarize(samples)
+            print(f"   {name:<26} p50 {results[name]['p50_ms']:9.3f} ms   "
+                  f"p95 {results[name]['p95_ms']:9.3f} ms   "
+                  f"p99 {results[name]['p99_ms']:9.3f} ms   "
+                  f"{results[name]['ops_per_sec']:10,.1f} ops/sec")
+    return results
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float,
+            min_delta_ms: float = 0.25) -> List[Dict]:
+    """Methods slower than the baseline at both p50 and p95
+    
+    A percentile counts as slower when it grew by more than threshold and
+    by at least min_delta_ms; requiring both keeps a single stall (a WAL
+    checkpoint, a GC pause) in the tail from failing the run.
+    """
+    def slower(current, previous, key):
+        return (current[key] - previous[key] >= min_delta_ms
+                and current[key] > previous[key] * (1 + threshold))
+
+    regressions = []
+    for name, current in sorted(results.items()):
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if slower(current, previous, 'p50_ms') and slower(current, previous, 'p95_ms'):
+            regressions.append({'method': name, 'baseline_p95_ms': previous['p95_ms'],
+                                'p95_ms': current['p95_ms'],
+                                'change': current['p95_ms'] / previous['p95_ms'] - 1})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BankDatabase micro-benchmarks")
+    parser.add_argument('--database', help="SQLite file to build or reuse (default: temporary)")
+    parser.add_argument('--customers', type=int, default=10000)
+    parser.add_argument('--accounts-per-customer', type=int, default=3)
+    parser.add_argument('--transactions-per-account', type=int, default=20)
+    parser.add_argument('--archive-days', type=int, default=365,
+                        help="archive older rows once when building the bank (0: never)")
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--method', action='append', help="only run this method (repeatable)")
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--baseline', help="results file to compare against")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="allowed latency growth over the baseline (0.25 = 25%%)")
+    parser.add_argument('--min-delta-ms', type=float, default=0.25,
+                        help="ignore latency changes smaller than this")
+    args = parser.parse_args()
+    # Benchmark output only; the operations' own log lines are noise here
+    configure_logging(logging.CRITICAL)
+
+    path = args.database or os.path.join(tempfile.mkdtemp(prefix='bms_bench_'), 'bench.db')
+    db, scale = open_bank(path, args.customers, args.accounts_per_customer,
+                          args.transactions_per_account, args.archive_days)
+    print(f"Benchmarking on {scale['customers']:,} customers, {scale['accounts']:,} accounts, "
+          f"{scale['transactions']:,} transactions + {scale['transactions_archive']:,} archived "
+          f"({args.iterations} iterations)")
+    try:
+        results = run_benchmarks(db, args.iterations, only=args.method)
+    finally:
+        with contextlib.redirect_stdout(open(os.devnull, 'w')):
+            db.disconnect()
+        shutil.rmtree(os.path.dirname(db.backend.database), ignore_errors=True)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'backend': 'sqlite',
+            'sqlite_version': sqlite3.sqlite_version,
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'scale': scale,
+            'iterations': args.iterations,
+        },
+        'results': results,
+    }
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as handle:
+            baseline = json.load(handle)
+        regressions = compare(results, baseline['results'], args.threshold,
+                              args.min_delta_ms)
+        report['baseline'] = {'file': args.baseline, 'threshold': args.threshold,
+                              'regressions': regressions}
+    with open(args.output, 'w', encoding='utf-8') as handle:
+        json.dump(report, handle, indent=2)
+    print(f"Results written to {args.output}")
+
+    for regression in regressions:
+        print(f"❌ {regression['method']}: p95 {regression['baseline_p95_ms']:.3f} -> "
+              f"{regression['p95_ms']:.3f} ms ({regression['change']:+.0%})")
+    if args.baseline and not regressions:
+        print(f"✅ No p95 regressions beyond {args.threshold:.0%} of {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
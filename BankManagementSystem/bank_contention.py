@@ -0,0 +1,264 @@
+"""
+Bank Account Management System - Hot Account Contention Benchmark
+Throughput of many concurrent writers on few accounts, and drift checks
+
+postings: --writers threads post deposits and withdrawals to the same
+account for --seconds. A second, nearly empty account is then hit with
+more withdrawals than it can cover. The run checks that:
+
+  - the final balance equals the opening balance plus every successful
+    deposit minus every successful withdrawal, as counted by the writers
+  - the account's ledger rows form an unbroken chain: each balance_after
+    is the previous one plus (or minus) that row's amount
+  - the drained account ends at exactly zero, never below, with one
+    successful withdrawal per unit of its opening balance
+
+transfers: --writers threads move money in both directions between
+random pairs of --transfer-accounts accounts for --seconds, so A->B and
+B->A transfers constantly overlap. The run reports transfers/sec overall
+and for the slowest whole second, and checks that:
+
+  - no transfer failed and none needed a deadlock retry
+  - the accounts' total balance is unchanged
+  - every account's ledger chain is unbroken
+
+Both phases also require verify_aggregates() to report no counter drift.
+The run exits non-zero if any check fails.
+
+Usage:
+    python bank_contention.py --writers 64 --seconds 10 [--phases transfers]
+"""
+
+import argparse
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from typing import List
+
+from bank_backends import SQLiteBackend
+from bank_bench import summarize
+from bank_database import BankDatabase
+from bank_metrics import configure_logging
+
+HOT_OPENING_BALANCE = 1_000_000.00
+TRANSFER_OPENING_BALANCE = 100_000.00
+
+
+class Writer(threading.Thread):
+    """Posts to one account until stop is set, counting what succeeded"""
+
+    def __init__(self, db: BankDatabase, account_number: str, stop: threading.Event,
+                 seed: int, withdraw_only: bool = False):
+        super().__init__(daemon=True)
+        self.db = db
+        self.account_number = account_number
+        self.stop = stop
+        self.rng = random.Random(seed)
+        self.withdraw_only = withdraw_only
+        self.deposited = 0
+        self.withdrawn = 0
+        self.rejected = 0
+        self.samples: List[float] = []
+
+    def run(self):
+        while not self.stop.is_set():
+            # Whole rupees keep the expected balance exact
+            amount = self.rng.randint(1, 500) if not self.withdraw_only else 1
+            deposit = not self.withdraw_only and self.rng.random() < 0.5
+            started = time.perf_counter()
+            if deposit:
+                ok = self.db.deposit_money(self.account_number, amount, "Contention deposit")
+            else:
+                ok = self.db.withdraw_money(self.account_number, amount, "Contention withdrawal")
+            self.samples.append(time.perf_counter() - started)
+            if not ok:
+                self.rejected += 1
+            elif deposit:
+                self.deposited += amount
+            else:
+                self.withdrawn += amount
+
+
+def run_writers(db: BankDatabase, account_number: str, writers: int, seconds: float,
+                withdraw_only: bool = False) -> List[Writer]:
+    stop = threading.Event()
+    threads = [Writer(db, account_number, stop, seed, withdraw_only) for seed in range(writers)]
+    for thread in threads:
+        thread.start()
+    stop.wait(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return threads
+
+
+def ledger_chain(db: BankDatabase, account_number: str):
+    """(opening balance_after, final balance_after, breaks) for the account's ledger"""
+    with db.backend.session() as (connection, cursor):
+        cursor.execute(db.backend.prepare("""
+            SELECT t.transaction_type, t.amount, t.balance_after
+            FROM Transactions t JOIN Accounts a ON a.account_id = t.account_id
+            WHERE a.account_number = :account_number
+            ORDER BY t.transaction_id
+            """), {'account_number': account_number})
+        rows = cursor.fetchall()
+    breaks = 0
+    for (_, _, previous), (transaction_type, amount, balance_after) in zip(rows, rows[1:]):
+        signed = -amount if transaction_type in ('Withdrawal', 'Transfer-Out') else amount
+        if abs(previous + signed - balance_after) > 0.005:
+            breaks += 1
+    return rows[0][2], rows[-1][2], breaks
+
+
+class Transferrer(threading.Thread):
+    """Moves money between random pairs of accounts until stop is set"""
+
+    def __init__(self, db: BankDatabase, accounts: List[str], stop: threading.Event,
+                 seed: int):
+        super().__init__(daemon=True)
+        self.db = db
+        self.accounts = accounts
+        self.stop = stop
+        self.rng = random.Random(seed)
+        self.failed = 0
+        self.samples: List[float] = []
+        self.finished: List[float] = []
+
+    def run(self):
+        while not self.stop.is_set():
+            from_account, to_account = self.rng.sample(self.accounts, 2)
+            started = time.perf_counter()
+            if not self.db.transfer_money(from_account, to_account, self.rng.randint(1, 500)):
+                self.failed += 1
+            self.finished.append(time.perf_counter())
+            self.samples.append(self.finished[-1] - started)
+
+
+def check(name: str, ok: bool, detail: str) -> bool:
+    print(f"{'✅' if ok else '❌'} {name}: {detail}")
+    return ok
+
+
+def run_transfers(db: BankDatabase, writers: int, seconds: float, account_count: int) -> bool:
+    accounts = [db.create_account(1001 + index % 5, 'Current', TRANSFER_OPENING_BALANCE)
+                for index in range(account_count)]
+    retries_before = db.metrics.retries.get('transfer_money', 0)
+    stop = threading.Event()
+    threads = [Transferrer(db, accounts, stop, seed) for seed in range(writers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    stop.wait(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    samples = [sample for thread in threads for sample in thread.samples]
+    stats = summarize(samples)
+    per_second = [0] * int(elapsed)
+    for thread in threads:
+        for finished in thread.finished:
+            second = int(finished - started)
+            if second < len(per_second):
+                per_second[second] += 1
+    print(f"{writers} writers transferring among {account_count} accounts for {elapsed:.1f}s: "
+          f"{len(samples):,} transfers, {len(samples) / elapsed:,.0f} transfers/sec "
+          f"(slowest second {min(per_second, default=0):,}), "
+          f"p50 {stats['p50_ms']:.2f} ms, p95 {stats['p95_ms']:.2f} ms, "
+          f"p99 {stats['p99_ms']:.2f} ms")
+
+    failed = sum(thread.failed for thread in threads)
+    retries = db.metrics.retries.get('transfer_money', 0) - retries_before
+    total = sum(db.get_account_details(account)['balance'] for account in accounts)
+    breaks = sum(ledger_chain(db, account)[2] for account in accounts)
+    expected = TRANSFER_OPENING_BALANCE * account_count
+    return all([
+        check("transfer deadlocks", failed == 0 and retries == 0,
+              f"{failed} failed, {retries} retried"),
+        check("conserved balance", abs(total - expected) < 0.005,
+              f"₹{total:,.2f} across {account_count} accounts (expected ₹{expected:,.2f})"),
+        check("transfer ledger chains", breaks == 0, f"{breaks} breaks"),
+    ])
+
+
+def run_postings(db: BankDatabase, writers: int, seconds: float, drain_balance: int) -> bool:
+    hot = db.create_account(1001, 'Current', HOT_OPENING_BALANCE)
+    drained = db.create_account(1002, 'Current', drain_balance)
+
+    started = time.perf_counter()
+    threads = run_writers(db, hot, writers, seconds)
+    elapsed = time.perf_counter() - started
+    samples = [sample for thread in threads for sample in thread.samples]
+    stats = summarize(samples)
+    print(f"{writers} writers on one account for {elapsed:.1f}s: "
+          f"{len(samples):,} postings, {len(samples) / elapsed:,.0f} ops/sec, "
+          f"p50 {stats['p50_ms']:.2f} ms, p95 {stats['p95_ms']:.2f} ms, "
+          f"p99 {stats['p99_ms']:.2f} ms")
+
+    deposited = sum(thread.deposited for thread in threads)
+    withdrawn = sum(thread.withdrawn for thread in threads)
+    rejected = sum(thread.rejected for thread in threads)
+    expected = HOT_OPENING_BALANCE + deposited - withdrawn
+    balance = db.get_account_details(hot)['balance']
+    opening, final, breaks = ledger_chain(db, hot)
+
+    drain_threads = run_writers(db, drained, writers, min(seconds, 2.0), withdraw_only=True)
+    drain_ok = sum(thread.withdrawn for thread in drain_threads)
+    drain_balance_now = db.get_account_details(drained)['balance']
+    return all([
+        check("hot balance", abs(balance - expected) < 0.005 and rejected == 0,
+              f"₹{balance:,.2f} (expected ₹{expected:,.2f}, {rejected} rejected)"),
+        check("ledger chain", opening == HOT_OPENING_BALANCE and final == balance and breaks == 0,
+              f"{breaks} breaks, last balance_after ₹{final:,.2f}"),
+        check("drained account", drain_balance_now == 0 and drain_ok == drain_balance,
+              f"₹{drain_balance_now:,.2f} left after {drain_ok} of {drain_balance} "
+              f"possible ₹1 withdrawals succeeded"),
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent writers on few hot accounts")
+    parser.add_argument('--writers', type=int, default=64)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--phases', nargs='+', choices=('postings', 'transfers'),
+                        default=['postings', 'transfers'])
+    parser.add_argument('--drain-balance', type=int, default=500,
+                        help="opening balance of the account drained by ₹1 withdrawals")
+    parser.add_argument('--transfer-accounts', type=int, default=8,
+                        help="accounts the transfer phase moves money between")
+    parser.add_argument('--database', help="SQLite file to use (default: a scratch file)")
+    args = parser.parse_args()
+    # Benchmark output only; the operations' own log lines are noise here
+    configure_logging(logging.CRITICAL)
+
+    directory = tempfile.mkdtemp(prefix='bms_contention_')
+    try:
+        path = args.database or os.path.join(directory, 'contention.db')
+        db = BankDatabase(backend=SQLiteBackend(path, pool_max=args.writers))
+        db.connect()
+        try:
+            results = []
+            if 'postings' in args.phases:
+                results.append(run_postings(db, args.writers, args.seconds, args.drain_balance))
+            if 'transfers' in args.phases:
+                results.append(run_transfers(db, args.writers, args.seconds,
+                                             args.transfer_accounts))
+            aggregates = db.verify_aggregates()
+            results.append(check("aggregates", aggregates is not None and aggregates['ok'],
+                                 f"{aggregates['drifted_accounts'] if aggregates else '?'} "
+                                 f"drifted accounts"))
+        finally:
+            db.disconnect()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+"""
+Bank Account Management System - Live Admin Dashboard Data
+Keeps the admin dashboard's totals current from small deltas
+
+LiveBankStats starts from a full snapshot (get_bank_stats' counters and
+the account_statistics view per type) and remembers the highest
+transaction_id and account_id it has seen. Each refresh() after that
+only asks get_dashboard_delta() for the ledger rows and accounts above
+those ids - two primary-key range scans, however big the bank - and
+folds them in:
+
+  - every ledger row adds to the transaction count, and moves the bank
+    and per-type balance by its amount (Deposit, Transfer-In and
+    Interest up; Withdrawal and Transfer-Out down)
+  - every new active account adds to the account counts (its opening
+    deposit is a ledger row, so the balance arrives with the postings)
+  - the rows of each poll feed a one-minute window for the rate card
+
+Every resync_seconds the next refresh() takes a fresh snapshot instead,
+which corrects anything a delta cannot see: accounts closed or
+reactivated, highest/lowest balances, and rows whose ids committed out of
+order. Amounts are folded as integer paise, so the totals do not drift.
+
+    stats = LiveBankStats(db, resync_seconds=300)
+    view = stats.refresh()      # call on a worker thread, every few seconds
+
+Usage (headless check: folded totals against a full recount):
+    python bank_dashboard.py --polls 20
+"""
+
+import argparse
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections import deque
+from typing import Dict, Optional
+
+from bank_bench import summarize
+from bank_database import BankDatabase
+from bank_metrics import configure_logging
+from bank_sql import INFLOW_TYPES
+
+RATE_WINDOW_SECONDS = 60
+
+
+def _paise(amount: float) -> int:
+    return int(round(amount * 100))
+
+
+class LiveBankStats:
+    """Dashboard totals kept current by delta polls and periodic full resyncs"""
+
+    def __init__(self, db: BankDatabase, resync_seconds: float = 300.0, clock=time.monotonic):
+        self.db = db
+        self.resync_seconds = resync_seconds
+        self.clock = clock
+        self.resyncs = 0
+        self.polls = 0
+        self._snapshot_at: Optional[float] = None
+        self._started: Optional[float] = None
+        self._rates = deque()
+
+    def refresh(self) -> Optional[Dict]:
+        """Poll for a delta, or resync if one is due; the current view (None on failure)"""
+        now = self.clock()
+        due = self._snapshot_at is None or now - self._snapshot_at >= self.resync_seconds
+        if not (self.resync(now) if due else self.poll(now)):
+            return None
+        return self.view(now)
+
+    def resync(self, now: float = None) -> bool:
+        """Replace the folded totals with a full snapshot"""
+        now = self.clock() if now is None else now
+        snapshot = self.db.get_dashboard_snapshot()
+        if snapshot is None:
+            return False
+        totals = snapshot['totals']
+        if self._snapshot_at is not None:
+            # Rows since the last poll reach the rate through the counter
+            self._count(now, totals['total_transactions'] - self._transactions)
+        else:
+            self._started = now
+        self._accounts = totals['total_active_accounts']
+        self._balance = _paise(totals['total_balance'])
+        self._transactions = totals['total_transactions']
+        self._by_type = {account_type: {
+            'total_accounts': metrics['total_accounts'],
+            'balance': _paise(metrics['total_balance']),
+            'highest_balance': metrics['highest_balance'],
+            'lowest_balance': metrics['lowest_balance']
+        } for account_type, metrics in snapshot['by_type'].items()}
+        self._last_transaction_id = snapshot['last_transaction_id']
+        self._last_account_id = snapshot['last_account_id']
+        self._snapshot_at = now
+        self.resyncs += 1
+        return True
+
+    def poll(self, now: float = None) -> bool:
+        """Fold in the ledger rows and accounts added since the last poll"""
+        now = self.clock() if now is None else now
+        delta = self.db.get_dashboard_delta(self._last_transaction_id, self._last_account_id)
+        if delta is None:
+            return False
+        rows = 0
+        for posting in delta['postings']:
+            signed = _paise(posting['amount'])
+            if posting['transaction_type'] not in INFLOW_TYPES:
+                signed = -signed
+            rows += posting['count']
+            self._balance += signed
+            if posting['active']:
+                self._type(posting['account_type'])['balance'] += signed
+        for account_type, opened in delta['new_accounts'].items():
+            self._accounts += opened
+            if opened:
+                self._type(account_type)['total_accounts'] += opened
+        self._transactions += rows
+        self._count(now, rows)
+        self._last_transaction_id = delta['last_transaction_id']
+        self._last_account_id = delta['last_account_id']
+        self.polls += 1
+        return True
+
+    def view(self, now: float = None) -> Dict:
+        """The dashboard's numbers, in the shapes get_bank_stats and account_statistics use"""
+        now = self.clock() if now is None else now
+        by_type = {}
+        for account_type, metrics in sorted(self._by_type.items()):
+            count = metrics['total_accounts']
+            by_type[account_type] = {
+                'total_accounts': count,
+                'total_balance': metrics['balance'] / 100,
+                'average_balance': round(metrics['balance'] / count / 100, 2) if count else 0.0,
+                'highest_balance': metrics['highest_balance'],
+                'lowest_balance': metrics['lowest_balance']
+            }
+        return {
+            'totals': {
+                'total_active_accounts': self._accounts,
+                'total_balance': self._balance / 100,
+                'total_transactions': self._transactions
+            },
+            'by_type': by_type,
+            'transactions_per_minute': self._per_minute(now),
+            'last_transaction_id': self._last_transaction_id,
+            'seconds_since_resync': now - self._snapshot_at
+        }
+
+    def _type(self, account_type: str) -> Dict:
+        # A type with no active accounts at the snapshot has no view row yet
+        return self._by_type.setdefault(account_type, {
+            'total_accounts': 0, 'balance': 0,
+            'highest_balance': None, 'lowest_balance': None})
+
+    def _count(self, now: float, rows: int):
+        if rows > 0:
+            self._rates.append((now, rows))
+
+    def _per_minute(self, now: float) -> float:
+        while self._rates and self._rates[0][0] <= now - RATE_WINDOW_SECONDS:
+            self._rates.popleft()
+        # Until a full minute has been watched, scale up what has been
+        span = min(RATE_WINDOW_SECONDS, now - self._started)
+        if span <= 0:
+            return 0.0
+        return sum(rows for _, rows in self._rates) * 60 / span
+
+
+# --- headless check ---
+
+def recount(db: BankDatabase) -> Dict:
+    """What a full refresh would show right now"""
+    snapshot = db.get_dashboard_snapshot()
+    return {'totals': snapshot['totals'],
+            'by_type': {account_type: {key: metrics[key] for key in
+                                       ('total_accounts', 'total_balance', 'average_balance')}
+                        for account_type, metrics in snapshot['by_type'].items()}}
+
+
+def folded(view: Dict) -> Dict:
+    return {'totals': view['totals'],
+            'by_type': {account_type: {key: metrics[key] for key in
+                                       ('total_accounts', 'total_balance', 'average_balance')}
+                        for account_type, metrics in view['by_type'].items()
+                        if metrics['total_accounts']}}
+
+
+def post_activity(db: BankDatabase, accounts, rng: random.Random, postings: int) -> int:
+    """Random deposits, withdrawals, transfers and openings; the ledger rows they wrote"""
+    rows = 0
+    for _ in range(postings):
+        account, other = rng.sample(accounts, 2)
+        choice = rng.random()
+        if choice < 0.35:
+            rows += bool(db.deposit_money(account, rng.randint(1, 50000) / 100))
+        elif choice < 0.7:
+            rows += bool(db.withdraw_money(account, rng.randint(1, 5000) / 100))
+        elif choice < 0.9:
+            rows += 2 * bool(db.transfer_money(account, other, rng.randint(1, 5000) / 100))
+        else:
+            account_type = rng.choice(('Savings', 'Current', 'Fixed Deposit'))
+            opened = db.create_account(1001 + rng.randrange(5), account_type, rng.randint(0, 3) * 500)
+            if opened:
+                accounts.append(opened)
+                rows += db.get_account_details(opened)['balance'] > 0
+    return rows
+
+
+def check_dashboard(polls: int, postings: int, customers: int) -> bool:
+    from bank_backends import SQLiteBackend
+    from bank_synthetic import populate
+
+    directory = tempfile.mkdtemp(prefix='bms_dashboard_')
+    try:
+        db = BankDatabase(backend=SQLiteBackend(os.path.join(directory, 'dashboard.db')))
+        db.connect()
+        try:
+            populate(db, customers=customers, accounts_per_customer=3,
+                     transactions_per_account=10)
+            rng = random.Random(11)
+            accounts = [db.create_account(1001 + index % 5, 'Savings', 10_000)
+                        for index in range(20)]
+            clock = {'now': 0.0}
+            stats = LiveBankStats(db, resync_seconds=3600, clock=lambda: clock['now'])
+            started = time.perf_counter()
+            stats.refresh()
+            resync_seconds = time.perf_counter() - started
+
+            mismatches, poll_samples, expected_rows = 0, [], 0
+            for _ in range(polls):
+                clock['now'] += 5
+                expected_rows += post_activity(db, accounts, rng, postings)
+                started = time.perf_counter()
+                view = stats.refresh()
+                poll_samples.append(time.perf_counter() - started)
+                mismatches += folded(view) != recount(db)
+            rate_seconds = min(RATE_WINDOW_SECONDS, polls * 5)
+            window_rows = sum(rows for _, rows in stats._rates)
+        finally:
+            db.disconnect()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    poll_stats = summarize(poll_samples)
+    ok_match = mismatches == 0 and stats.resyncs == 1 and stats.polls == polls
+    ok_rate = abs(view['transactions_per_minute'] - window_rows * 60 / rate_seconds) < 1e-9
+    ok_fast = poll_stats['p50_ms'] < resync_seconds * 1000
+    print(f"   {'✅' if ok_match else '❌'} Folded totals matched a full recount after "
+          f"{polls - mismatches} of {polls} delta polls ({expected_rows:,} ledger rows, "
+          f"{stats.resyncs} resync)")
+    print(f"   {'✅' if ok_rate else '❌'} Rate card: {view['transactions_per_minute']:,.0f} "
+          f"transactions/min over the last {rate_seconds}s")
+    print(f"   {'✅' if ok_fast else '❌'} Delta poll p50 {poll_stats['p50_ms']:.2f} ms "
+          f"vs full resync {resync_seconds * 1000:.2f} ms")
+    return ok_match and ok_rate and ok_fast
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the live dashboard's delta folding")
+    parser.add_argument('--polls', type=int, default=20)
+    parser.add_argument('--postings', type=int, default=25, help="operations between polls")
+    parser.add_argument('--customers', type=int, default=2000)
+    args = parser.parse_args()
+    # Check output only; the operations' own log lines are noise here
+    configure_logging(logging.CRITICAL)
+    return 0 if check_dashboard(args.polls, args.postings, args.customers) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
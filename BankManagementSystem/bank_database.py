@@ -4,152 +4,318 @@ Complete CRUD operations with Oracle Database
 MATCHES THE BANK SCHEMA (Customers, Accounts, Transactions)
 """
 
-import oracledb
-from datetime import datetime
-from typing import List, Tuple, Optional, Dict
+import csv
+import logging
+import random
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from decimal import Decimal
+from itertools import groupby, islice
+from typing import Iterable, Iterator, List, Tuple, Optional, Dict
+
+from bank_backends import OracleBackend, SQLiteBackend
+from bank_cache import TTLCache
+from bank_metrics import Metrics, configure_logging, instrumented, log_event
+from bank_rows import AccountRow, TransactionRow
+from bank_sql import HISTORY_SORT_COLUMNS, STATEMENT_CACHE_SIZE, STATEMENTS, sql
+
+log = logging.getLogger('bank.database')
+
+# Accounts whose owner is remembered for cache invalidation, per cache entry
+OWNERS_PER_CACHE_ENTRY = 4
 
 class BankDatabase:
-    """Main database class for bank operations"""
+    """Main database class for bank operations
+    
+    Storage is delegated to a backend (see bank_backends.py). By default an
+    OracleBackend is built from the credentials; pass backend=SQLiteBackend()
+    to run the same operations on the embedded engine instead.
+    
+    With pooled=True the Oracle backend creates a session pool and every
+    method checks out its own connection, so one instance can be driven
+    from many worker threads at once.
+    
+    cache_size > 0 enables a read-through cache (LRU, cache_ttl seconds)
+    for get_customer_accounts and get_account_details. Entries are
+    invalidated by this instance's own writes to the affected accounts or
+    customer; writes made elsewhere become visible after cache_ttl.
     
-    def __init__(self, username: str, password: str, dsn: str):
+    Every public method records calls, errors and latency, and every SQL
+    statement its executions, round trips and rows, in self.metrics (see
+    bank_metrics.py; pass metrics=False to turn it off, or a shared Metrics
+    instance). slow_query_ms logs statements at least that slow to
+    'bank.sql' with their bind values redacted. Outcomes are logged to
+    'bank.database' rather than printed.
+    
+    typed_rows=True makes get_customer_accounts, get_transaction_history
+    and the history iterators return AccountRow / TransactionRow records
+    (bank_rows.py) with Decimal amounts instead of dicts; record.as_dict()
+    gives the dict the default mode returns.
+    """
+    
+    def __init__(self, username: str = None, password: str = None, dsn: str = None,
+                 pooled: bool = False, pool_min: int = 1, pool_max: int = 8,
+                 pool_increment: int = 1, pool_timeout: float = 10.0,
+                 ping_interval: int = 60, backend=None,
+                 cache_size: int = 0, cache_ttl: float = 30.0,
+                 metrics=True, slow_query_ms: float = None, typed_rows: bool = False):
         self.username = username
         self.password = password
         self.dsn = dsn
-        self.connection = None
-        self.cursor = None
+        if backend is None:
+            backend = OracleBackend(username, password, dsn, pooled=pooled,
+                                    pool_min=pool_min, pool_max=pool_max,
+                                    pool_increment=pool_increment,
+                                    pool_timeout=pool_timeout,
+                                    ping_interval=ping_interval)
+        self.backend = backend
+        self.typed_rows = typed_rows
+        self.cache = TTLCache(cache_size, cache_ttl) if cache_size > 0 else None
+        # account_number -> customer_id, learned from cache fills, so a write
+        # to an account can also drop its owner's cached account list (LRU,
+        # bounded like the cache it serves; see _learn_owners)
+        self._account_owners: "OrderedDict[str, int]" = OrderedDict()
+        self._owners_max = OWNERS_PER_CACHE_ENTRY * cache_size
+        self._owners_lock = threading.Lock()
+        if isinstance(metrics, Metrics):
+            if slow_query_ms is not None:
+                metrics.slow_query_ms = slow_query_ms
+            self.metrics = metrics
+        else:
+            self.metrics = Metrics(slow_query_ms) if metrics else None
+    
+    def cache_stats(self) -> Optional[Dict]:
+        """Hit/miss/eviction/invalidation counters of the account cache"""
+        return self.cache.stats() if self.cache is not None else None
+    
+    def statement_stats(self) -> Optional[Dict]:
+        """Executions of each catalog statement, with server parse counts where available
+        
+        Client-side counts come from the metrics; 'parse_calls' and
+        'hard_parses' are added on Oracle (from V$SQLAREA, all sessions)
+        and are None on SQLite. With the statement cache sized to the
+        catalog, parse calls stay flat while executions grow.
+        """
+        if self.metrics is None:
+            return None
+        statements = {name: {'executions': stats['executions'], 'parse_calls': None,
+                             'hard_parses': None}
+                      for name, stats in self.metrics.snapshot()['statements'].items()
+                      if name in STATEMENTS}
+        try:
+            with self.backend.session() as (connection, cursor):
+                parses = self.backend.parse_counts(cursor)
+        except Exception as e:
+            log_event(log, logging.WARNING, 'parse_counts_failed',
+                      "Server parse counts unavailable: {error}", error=str(e))
+            parses = None
+        for name, counts in (parses or {}).items():
+            if name in statements:
+                statements[name]['parse_calls'] = counts['parse_calls']
+                statements[name]['hard_parses'] = counts['hard_parses']
+        return {'cache_size': STATEMENT_CACHE_SIZE, 'statements': statements}
+    
+    def _invalidate_accounts(self, *account_numbers: str):
+        if self.cache is None:
+            return
+        keys = []
+        with self._owners_lock:
+            for account_number in account_numbers:
+                keys.append(('details', account_number))
+                owner = self._account_owners.get(account_number)
+                if owner is not None:
+                    keys.append(('accounts', owner))
+        self.cache.invalidate(*keys)
+    
+    def _invalidate_customer(self, customer_id: int):
+        if self.cache is None:
+            return
+        with self._owners_lock:
+            owned = [number for number, owner in self._account_owners.items()
+                     if owner == customer_id]
+        self.cache.invalidate(('accounts', customer_id),
+                              *[('details', number) for number in owned])
+    
+    def _learn_owners(self, customer_id: int, *account_numbers: str):
+        """Remember who owns these accounts, forgetting the least recently learned
+        
+        A forgotten account's cached details and its owner's cached list are
+        dropped with it, since a later write could no longer find them.
+        """
+        forgotten = []
+        with self._owners_lock:
+            for account_number in account_numbers:
+                self._account_owners[account_number] = customer_id
+                self._account_owners.move_to_end(account_number)
+            while len(self._account_owners) > self._owners_max:
+                forgotten.append(self._account_owners.popitem(last=False))
+        if forgotten:
+            self.cache.discard(*[key for number, owner in forgotten
+                                 for key in (('details', number), ('accounts', owner))])
+    
+    def _failed(self, event: str, message: str, **fields):
+        """Log a handled failure and count it as an error of the running method"""
+        if self.metrics is not None:
+            self.metrics.mark_failed()
+        log_event(log, logging.ERROR, event, message, **fields)
     
+    @instrumented
     def connect(self) -> bool:
-        """Connect to Oracle Database"""
+        """Connect to the database (single connection or session pool)"""
         try:
-            self.connection = oracledb.connect(
-                user=self.username,
-                password=self.password,
-                dsn=self.dsn,
-                mode=oracledb.SYSDBA
-            )
-            self.cursor = self.connection.cursor()
-            print("✅ Connected to Oracle Database")
+            self.backend.connect()
+            log_event(log, logging.INFO, 'connected', "Connected to {backend} database",
+                      backend=self.backend.name)
             return True
         except Exception as e:
-            print(f"❌ Connection failed: {e}")
+            self._failed('connect_failed', "Connection failed: {error}", error=str(e))
             return False
     
+    def _session(self):
+        """Yield (connection, cursor) for the duration of one operation"""
+        if self.metrics is None:
+            return self.backend.session()
+        return self.metrics.session(self.backend.session())
+    
+    def _sql(self, name: str) -> str:
+        """A bank_sql catalog statement, adapted to the backend"""
+        return self.backend.prepare(sql(name))
+    
+    @instrumented
     def disconnect(self):
         """Close database connection"""
-        if self.cursor:
-            self.cursor.close()
-        if self.connection:
-            self.connection.close()
-        print("Disconnected from database")
-    
+        self.backend.close()
+        log_event(log, logging.INFO, 'disconnected', "Disconnected from database")
     
+    @instrumented
     def customer_login(self, email: str, password: str) -> Optional[Dict]:
         """Authenticate customer login"""
         try:
-            query = """
-            SELECT customer_id, full_name, email, phone, address
-            FROM Customers
-            WHERE email = :1 AND password_hash = :2 AND status = 'Active'
-            """
-            self.cursor.execute(query, (email, password))
-            result = self.cursor.fetchone()
+            with self._session() as (connection, cursor):
+                cursor.execute(self._sql('customer_login'),
+                               {'email': email, 'password': password})
+                result = cursor.fetchone()
             
-            if result:
-                return {
-                    'customer_id': result[0],
-                    'full_name': result[1],
-                    'email': result[2],
-                    'phone': result[3],
-                    'address': result[4]
-                }
-            return None
+                if result:
+                    return {
+                        'customer_id': result[0],
+                        'full_name': result[1],
+                        'email': result[2],
+                        'phone': result[3],
+                        'address': result[4]
+                    }
+                return None
         except Exception as e:
-            print(f"Login error: {e}")
+            self._failed('login_error', "Login error: {error}", error=str(e))
             return None
     
-    
+    @instrumented
     def register_customer(self, full_name: str, email: str, phone: str, 
                          address: str, dob: str, password: str) -> bool:
         """Register a new customer"""
         try:
-            query = """
-            INSERT INTO Customers 
-            (customer_id, full_name, email, phone, address, date_of_birth, 
-             created_date, password_hash, status)
-            VALUES (customer_seq.NEXTVAL, :1, :2, :3, :4, TO_DATE(:5, 'YYYY-MM-DD'), 
-                    SYSDATE, :6, 'Active')
-            """
-            self.cursor.execute(query, (full_name, email, phone, address, dob, password))
-            self.connection.commit()
-            print(f"✅ Customer {full_name} registered successfully")
-            return True
-        except oracledb.IntegrityError:
-            print("❌ Email already exists")
+            with self._session() as (connection, cursor):
+                cursor.execute(self._sql('register_customer'), {
+                    'full_name': full_name, 'email': email, 'phone': phone,
+                    'address': address, 'dob': dob, 'password': password
+                })
+                connection.commit()
+                log_event(log, logging.INFO, 'customer_registered',
+                          "Customer {full_name} registered successfully", full_name=full_name)
+                return True
+        except self.backend.IntegrityError:
+            self._failed('registration_rejected', "Email already exists")
             return False
         except Exception as e:
-            print(f"❌ Registration failed: {e}")
-            self.connection.rollback()
+            self._failed('registration_failed', "Registration failed: {error}", error=str(e))
             return False
     
+    @instrumented
     def create_account(self, customer_id: int, account_type: str, 
                       initial_deposit: float) -> Optional[str]:
         """Create a new bank account"""
         try:
-            account_number = self.cursor.var(str)
-            self.cursor.callproc('open_account', 
-                               [customer_id, account_type, initial_deposit, account_number])
-            return account_number.getvalue()
+            with self._session() as (connection, cursor):
+                account_number = self.backend.open_account(cursor, customer_id, account_type,
+                                                           initial_deposit)
+            self._invalidate_customer(customer_id)
+            return account_number
         except Exception as e:
-            print(f"❌ Account creation failed: {e}")
+            self._failed('account_open_failed', "Account creation failed: {error}",
+                         customer_id=customer_id, error=str(e))
             return None
     
-    
+    @instrumented
     def get_customer_accounts(self, customer_id: int) -> List[Dict]:
         """Get all accounts for a customer (JOIN query)"""
+        if self.cache is not None:
+            cached = self.cache.get(('accounts', customer_id))
+            if cached is not None:
+                if self.typed_rows:
+                    return list(cached)
+                return [dict(account) for account in cached]
+            token = self.cache.fill_token()
+        if self.typed_rows:
+            return self._account_records(customer_id, token if self.cache is not None else None)
         try:
-            query = """
-            SELECT a.account_id, a.account_number, a.account_type, 
-                   a.balance, a.interest_rate, a.status,
-                   TO_CHAR(a.created_date, 'DD-MON-YYYY') as created_date
-            FROM Accounts a
-            WHERE a.customer_id = :1
-            ORDER BY a.created_date DESC
-            """
-            self.cursor.execute(query, (customer_id,))
+            with self._session() as (connection, cursor):
+                cursor.execute(self._sql('customer_accounts'), {'customer_id': customer_id})
             
-            accounts = []
-            for row in self.cursor:
-                accounts.append({
-                    'account_id': row[0],
-                    'account_number': row[1],
-                    'account_type': row[2],
-                    'balance': float(row[3]),
-                    'interest_rate': float(row[4]),
-                    'status': row[5],
-                    'created_date': row[6]
-                })
+                accounts = []
+                for row in cursor:
+                    accounts.append({
+                        'account_id': row[0],
+                        'account_number': row[1],
+                        'account_type': row[2],
+                        'balance': float(row[3]),
+                        'interest_rate': float(row[4]),
+                        'status': row[5],
+                        'created_date': row[6]
+                    })
+            if self.cache is not None:
+                self._learn_owners(customer_id, *[account['account_number'] for account in accounts])
+                self.cache.put(('accounts', customer_id),
+                               [dict(account) for account in accounts], token)
             return accounts
         except Exception as e:
-            print(f"Error fetching accounts: {e}")
+            self._failed('fetch_failed', "Error fetching accounts: {error}",
+                         customer_id=customer_id, error=str(e))
+            return []
+    
+    def _account_records(self, customer_id: int, token) -> List[AccountRow]:
+        """get_customer_accounts in typed_rows mode (records are immutable, so cached as is)"""
+        try:
+            with self._session() as (connection, cursor):
+                accounts = self.backend.records(cursor, AccountRow, self._sql('customer_accounts'),
+                                                {'customer_id': customer_id})
+            if self.cache is not None:
+                self._learn_owners(customer_id, *[account.account_number for account in accounts])
+                self.cache.put(('accounts', customer_id), accounts, token)
+            return list(accounts)
+        except Exception as e:
+            self._failed('fetch_failed', "Error fetching accounts: {error}",
+                         customer_id=customer_id, error=str(e))
             return []
     
+    @instrumented
     def get_account_details(self, account_number: str) -> Optional[Dict]:
         """Get detailed account information with customer details (JOIN)"""
+        if self.cache is not None:
+            cached = self.cache.get(('details', account_number))
+            if cached is not None:
+                return dict(cached)
+            token = self.cache.fill_token()
         try:
-            query = """
-            SELECT c.full_name, c.email, c.phone,
-                   a.account_number, a.account_type, a.balance, 
-                   a.interest_rate, a.status,
-                   TO_CHAR(a.created_date, 'DD-MON-YYYY') as created
-            FROM Accounts a
-            JOIN Customers c ON a.customer_id = c.customer_id
-            WHERE a.account_number = :1
-            """
-            self.cursor.execute(query, (account_number,))
-            result = self.cursor.fetchone()
+            with self._session() as (connection, cursor):
+                cursor.execute(self._sql('account_details'), {'account_number': account_number})
+                result = cursor.fetchone()
             
-            if result:
-                return {
+                if not result:
+                    return None
+                details = {
                     'customer_name': result[0],
                     'email': result[1],
                     'phone': result[2],
@@ -158,171 +324,915 @@ class BankDatabase:
                     'balance': float(result[5]),
                     'interest_rate': float(result[6]),
                     'status': result[7],
-                    'created_date': result[8]
+                    'created_date': result[8],
+                    'customer_id': result[9]
                 }
-            return None
+            if self.cache is not None:
+                self._learn_owners(details['customer_id'], account_number)
+                self.cache.put(('details', account_number), dict(details), token)
+            return details
         except Exception as e:
-            print(f"Error: {e}")
+            self._failed('fetch_failed', "Error fetching account: {error}",
+                         account_number=account_number, error=str(e))
             return None
     
+    # Hot and cold tiers of the ledger, newest first. archive_transactions()
+    # moves a whole date prefix and postings are stamped SYSDATE, so every
+    # archived row is older than every hot one: a newest-first read only
+    # continues into the archive once the hot tier runs out of rows.
+    LEDGER_TIERS = ('Transactions', 'Transactions_Archive')
+    
+    # The catalog statements reading each tier, in LEDGER_TIERS order
+    HISTORY_STATEMENTS = ('transaction_history', 'transaction_history_archive')
+    HISTORY_PAGE_STATEMENTS = ('history_page', 'history_page_archive')
+    HISTORY_ROWS_STATEMENTS = ('history_rows', 'history_rows_archive')
+    
+    @instrumented
     def get_transaction_history(self, account_number: str, limit: int = 50) -> List[Dict]:
-        """Get transaction history for an account"""
+        """Get transaction history for an account (reads the archive only if the hot tier is short)"""
+        if self.typed_rows:
+            return self._history_records(account_number, limit)
         try:
-            query = """
-            SELECT t.transaction_id, t.transaction_type, t.amount, 
-                   t.balance_after, t.description, t.reference_account,
-                   TO_CHAR(t.transaction_date, 'DD-MON-YYYY HH24:MI:SS') as trans_date
-            FROM Transactions t
-            JOIN Accounts a ON t.account_id = a.account_id
-            WHERE a.account_number = :1
-            ORDER BY t.transaction_date DESC
-            FETCH FIRST :2 ROWS ONLY
-            """
-            self.cursor.execute(query, (account_number, limit))
-            
-            transactions = []
-            for row in self.cursor:
-                transactions.append({
-                    'transaction_id': row[0],
-                    'type': row[1],
-                    'amount': float(row[2]),
-                    'balance_after': float(row[3]),
-                    'description': row[4],
-                    'reference': row[5],
-                    'date': row[6]
-                })
-            return transactions
+            with self._session() as (connection, cursor):
+                transactions = []
+                for name in self.HISTORY_STATEMENTS:
+                    cursor.execute(self._sql(name),
+                                   {'account_number': account_number,
+                                    'limit': limit - len(transactions)})
+                    for row in cursor:
+                        transactions.append({
+                            'transaction_id': row[0],
+                            'type': row[1],
+                            'amount': float(row[2]),
+                            'balance_after': float(row[3]),
+                            'description': row[4],
+                            'reference': row[5],
+                            'date': row[6]
+                        })
+                    if len(transactions) >= limit:
+                        break
+                return transactions
+        except Exception as e:
+            self._failed('fetch_failed', "Error fetching transactions: {error}",
+                         account_number=account_number, error=str(e))
+            return []
+    
+    def _history_records(self, account_number: str, limit: int) -> List[TransactionRow]:
+        """get_transaction_history in typed_rows mode"""
+        try:
+            with self._session() as (connection, cursor):
+                self._tune_fetch(cursor, min(limit, 5000))
+                transactions = []
+                for name in self.HISTORY_ROWS_STATEMENTS:
+                    transactions += self.backend.records(
+                        cursor, TransactionRow, self._sql(name),
+                        {'account_number': account_number, 'limit': limit - len(transactions)})
+                    if len(transactions) >= limit:
+                        break
+                return transactions
+        except Exception as e:
+            self._failed('fetch_failed', "Error fetching transactions: {error}",
+                         account_number=account_number, error=str(e))
+            return []
+    
+    # Keyset start point for the first page: later than any real row
+    _HISTORY_START = (datetime(9999, 12, 31), 10**15)
+    
+    @instrumented
+    def iter_transaction_pages(self, account_number: str, page_size: int = 500,
+                               cursor_token: str = None) -> Iterator[Tuple[List[Dict], Optional[str]]]:
+        """Stream an account's history newest-first as (page, next_token) pairs
+        
+        Uses keyset pagination on (transaction_date, transaction_id), so each
+        page is an index range scan and memory stays at one page however
+        long the history is. Pass a next_token back as cursor_token to resume
+        after that page; it is None once the history is exhausted. A
+        connection is only held while a page is being fetched. Database
+        errors propagate rather than silently truncating the stream. Pages
+        continue from the hot tier into the archive without a seam.
+        """
+        last_date, last_id = (self._decode_history_token(cursor_token)
+                              if cursor_token else self._HISTORY_START)
+        queries = [self._sql(name) for name in self.HISTORY_PAGE_STATEMENTS]
+        account_id = None
+        while True:
+            with self._session() as (connection, cursor):
+                if account_id is None:
+                    cursor.execute(self._sql('account_id'), {'account_number': account_number})
+                    row = cursor.fetchone()
+                    if row is None:
+                        return
+                    account_id = row[0]
+                self._tune_fetch(cursor, page_size)
+                rows = []
+                for query in queries:
+                    params = {'account_id': account_id, 'last_date': last_date,
+                              'last_id': last_id, 'page_size': page_size - len(rows)}
+                    if self.typed_rows:
+                        rows += self.backend.records(cursor, TransactionRow, query, params)
+                    else:
+                        cursor.execute(query, params)
+                        rows += cursor.fetchall()
+                    if len(rows) >= page_size:
+                        break
+            if not rows:
+                return
+            last_date, last_id = rows[-1][6], rows[-1][0]
+            next_token = (self._encode_history_token(last_date, last_id)
+                          if len(rows) == page_size else None)
+            page = rows if self.typed_rows else [self._history_dict(row) for row in rows]
+            yield page, next_token
+            if next_token is None:
+                return
+    
+    @instrumented
+    def iter_transaction_history(self, account_number: str, page_size: int = 500,
+                                 cursor_token: str = None) -> Iterator[Dict]:
+        """Stream an account's full history newest-first, one transaction at a time"""
+        for page, _ in self.iter_transaction_pages(account_number, page_size, cursor_token):
+            yield from page
+    
+    # Bounds bound in place of a missing date filter
+    _HISTORY_FLOOR = datetime(1900, 1, 1)
+    _HISTORY_CEILING = datetime(9999, 12, 31)
+    
+    @instrumented
+    def count_transactions(self, account_number: str, start_date: datetime = None,
+                           end_date: datetime = None) -> Optional[int]:
+        """Number of ledger rows (both tiers) for an account in [start_date, end_date)"""
+        params = {'start_date': start_date or self._HISTORY_FLOOR,
+                  'end_date': end_date or self._HISTORY_CEILING}
+        try:
+            with self._session() as (connection, cursor):
+                cursor.execute(self._sql('account_id'), {'account_number': account_number})
+                row = cursor.fetchone()
+                if row is None:
+                    return 0
+                params['account_id'] = row[0]
+                total = 0
+                for name in ('history_count', 'history_count_archive'):
+                    cursor.execute(self._sql(name), params)
+                    total += int(cursor.fetchone()[0])
+                return total
         except Exception as e:
-            print(f"Error fetching transactions: {e}")
+            self._failed('fetch_failed', "Error counting transactions: {error}",
+                         account_number=account_number, error=str(e))
+            return None
+    
+    @instrumented
+    def get_transaction_page(self, account_number: str, offset: int = 0, limit: int = 200,
+                             sort: str = 'date', descending: bool = True,
+                             start_date: datetime = None, end_date: datetime = None) -> List[Dict]:
+        """Rows offset..offset+limit of an account's history, sorted and filtered in the database
+        
+        sort is a key of bank_sql.HISTORY_SORT_COLUMNS (ties go by
+        transaction_id in the same direction, so pages never overlap) and
+        the dates bound [start_date, end_date). Offsets let a view jump to
+        any position; only the page itself crosses the network. The archive
+        is unioned in only when the date range reaches it.
+        """
+        if sort not in HISTORY_SORT_COLUMNS:
+            raise ValueError(f"Unknown history sort column: {sort!r}")
+        params = {'start_date': start_date or self._HISTORY_FLOOR,
+                  'end_date': end_date or self._HISTORY_CEILING}
+        try:
+            with self._session() as (connection, cursor):
+                cursor.execute(self._sql('account_id'), {'account_number': account_number})
+                row = cursor.fetchone()
+                if row is None:
+                    return []
+                cursor.execute(self._sql('archive_range_probe'), params)
+                tier = '' if cursor.fetchone() is None else '_tiered'
+                name = f"history_window{tier}_{sort}_{'desc' if descending else 'asc'}"
+                params.update(account_id=row[0], offset=offset, limit=limit)
+                self._tune_fetch(cursor, limit)
+                if self.typed_rows:
+                    return self.backend.records(cursor, TransactionRow, self._sql(name), params)
+                cursor.execute(self._sql(name), params)
+                return [self._history_dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            self._failed('fetch_failed', "Error fetching transactions: {error}",
+                         account_number=account_number, error=str(e))
             return []
     
+    @staticmethod
+    def _history_dict(row: Tuple) -> Dict:
+        """A history row with its raw date, as the dict the default mode returns"""
+        return {
+            'transaction_id': row[0],
+            'type': row[1],
+            'amount': float(row[2]),
+            'balance_after': float(row[3]),
+            'description': row[4],
+            'reference': row[5],
+            'date': row[6].strftime('%d-%b-%Y %H:%M:%S').upper()
+        }
+    
+    @staticmethod
+    def _encode_history_token(transaction_date: datetime, transaction_id: int) -> str:
+        return f"{transaction_date:%Y%m%d%H%M%S}.{transaction_id}"
+    
+    @staticmethod
+    def _decode_history_token(token: str) -> Tuple[datetime, int]:
+        try:
+            stamp, transaction_id = token.split('.')
+            return datetime.strptime(stamp, '%Y%m%d%H%M%S'), int(transaction_id)
+        except ValueError:
+            raise ValueError(f"Invalid history cursor token: {token!r}")
+    
+    @staticmethod
+    def _tune_fetch(cursor, rows: int):
+        """Fetch a whole page per round trip (prefetchrows is oracledb-only)"""
+        cursor.arraysize = rows
+        if hasattr(cursor, 'prefetchrows'):
+            cursor.prefetchrows = rows + 1
+    
+    STATEMENT_COLUMNS = ('transaction_id', 'transaction_date', 'account_number',
+                         'account_type', 'customer_id', 'customer_name',
+                         'transaction_type', 'amount', 'balance_after',
+                         'description', 'reference_account')
+    
+    @instrumented
+    def iter_statement_batches(self, start_date: datetime, end_date: datetime,
+                               account_numbers: Iterable[str] = None,
+                               batch_size: int = 5000) -> Iterator[List[Tuple]]:
+        """Stream statement rows (STATEMENT_COLUMNS) for [start_date, end_date)
+        
+        Rows come grouped by account in date order, batch_size at a time via
+        fetchmany, optionally restricted to a set of account numbers. One
+        connection is held for the whole stream; dates are returned raw.
+        The archive tier is only read when it holds rows in the range.
+        """
+        params = {'start_date': start_date, 'end_date': end_date}
+        with self._session() as (connection, cursor):
+            cursor.execute(self._sql('archive_range_probe'), params)
+            name = 'statement_rows' if cursor.fetchone() is None else 'statement_rows_tiered'
+            if account_numbers is not None:
+                name += '_for_accounts'
+                params['accounts'] = self.backend.string_list(cursor, account_numbers)
+            self._tune_fetch(cursor, batch_size)
+            cursor.execute(self._sql(name), params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+    
+    # Column dtypes of the columnar statements, in select-list order. Type
+    # columns are codes: indexes into bank_sql.ACCOUNT_TYPES / TRANSACTION_TYPES.
+    LEDGER_DTYPES = (('account_id', 'int64'), ('account_type', 'int8'),
+                     ('transaction_type', 'int8'), ('amount', 'float64'),
+                     ('balance_after', 'float64'), ('transaction_date', 'datetime64[s]'))
+    ACCOUNT_DTYPES = (('account_id', 'int64'), ('account_type', 'int8'),
+                      ('balance', 'float64'), ('interest_rate', 'float64'), ('active', 'bool'))
+    
+    @instrumented
+    def ledger_columns(self, start_date: datetime, end_date: datetime,
+                       account_numbers: Iterable[str] = None,
+                       batch_size: int = 100_000) -> Dict:
+        """Ledger rows for [start_date, end_date) as NumPy arrays, one per LEDGER_DTYPES column
+        
+        Rows are ordered by account, then date, which is what the
+        bank_analytics helpers expect. On Oracle with pyarrow installed the
+        slice is fetched columnar (python-oracledb DataFrame fetch) without a
+        Python object per row. Needs numpy; database errors propagate.
+        """
+        params = {'start_date': start_date, 'end_date': end_date}
+        with self._session() as (connection, cursor):
+            cursor.execute(self._sql('archive_range_probe'), params)
+            name = 'ledger_columns' if cursor.fetchone() is None else 'ledger_columns_tiered'
+            if account_numbers is not None:
+                name += '_for_accounts'
+                params['accounts'] = self.backend.string_list(cursor, account_numbers)
+            return self.backend.fetch_arrays(connection, cursor, self._sql(name), params,
+                                             self.LEDGER_DTYPES, batch_size)
+    
+    @instrumented
+    def account_columns(self, batch_size: int = 100_000) -> Dict:
+        """Every account as NumPy arrays, one per ACCOUNT_DTYPES column, in account_id order"""
+        with self._session() as (connection, cursor):
+            return self.backend.fetch_arrays(connection, cursor, self._sql('account_columns'),
+                                             {}, self.ACCOUNT_DTYPES, batch_size)
+    
+    @instrumented
     def get_mini_statement(self, account_number: str) -> List[Dict]:
         """Get last 5 transactions (mini statement)"""
         return self.get_transaction_history(account_number, limit=5)
     
+    @instrumented
     def get_account_summary(self, customer_id: int) -> Dict:
         """Get complete account summary for customer"""
         try:
-            query = """
-            SELECT COUNT(a.account_id) as total_accounts,
-                   SUM(a.balance) as total_balance,
-                   (SELECT COUNT(*) FROM Transactions t 
-                    JOIN Accounts a2 ON t.account_id = a2.account_id 
-                    WHERE a2.customer_id = :1) as total_transactions
-            FROM Accounts a
-            WHERE a.customer_id = :1 AND a.status = 'Active'
-            """
-            self.cursor.execute(query, (customer_id,))
-            result = self.cursor.fetchone()
+            with self._session() as (connection, cursor):
+                cursor.execute(self._sql('account_summary'), {'customer_id': customer_id})
+                result = cursor.fetchone()
             
-            return {
-                'total_accounts': result[0] or 0,
-                'total_balance': float(result[1] or 0),
-                'total_transactions': result[2] or 0
-            }
+                return {
+                    'total_accounts': result[0] or 0,
+                    'total_balance': round(float(result[1] or 0), 2),
+                    'total_transactions': int(result[2] or 0)
+                }
         except Exception as e:
-            print(f"Error: {e}")
+            self._failed('fetch_failed', "Error fetching account summary: {error}",
+                         customer_id=customer_id, error=str(e))
             return {'total_accounts': 0, 'total_balance': 0, 'total_transactions': 0}
     
-    
+    @instrumented
     def deposit_money(self, account_number: str, amount: float, 
                      description: str = "Cash Deposit") -> bool:
         """Deposit money into account"""
         try:
-            self.cursor.callproc('deposit_money', [account_number, amount, description])
-            print(f"✅ Deposited ₹{amount:,.2f}")
-            return True
+            with self._session() as (connection, cursor):
+                self.backend.deposit_money(cursor, account_number, amount, description)
+                self._invalidate_accounts(account_number)
+                log_event(log, logging.INFO, 'deposit', "Deposited ₹{amount:,.2f}",
+                          account_number=account_number, amount=amount)
+                return True
         except Exception as e:
-            print(f"❌ Deposit failed: {e}")
+            self._failed('deposit_failed', "Deposit failed: {error}",
+                         account_number=account_number, amount=amount, error=str(e))
             return False
     
+    @instrumented
     def withdraw_money(self, account_number: str, amount: float,
                       description: str = "Cash Withdrawal") -> bool:
         """Withdraw money from account"""
         try:
-            self.cursor.callproc('withdraw_money', [account_number, amount, description])
-            print(f"✅ Withdrawn ₹{amount:,.2f}")
-            return True
+            with self._session() as (connection, cursor):
+                self.backend.withdraw_money(cursor, account_number, amount, description)
+                self._invalidate_accounts(account_number)
+                log_event(log, logging.INFO, 'withdrawal', "Withdrawn ₹{amount:,.2f}",
+                          account_number=account_number, amount=amount)
+                return True
         except Exception as e:
-            print(f"❌ Withdrawal failed: {e}")
+            self._failed('withdrawal_failed', "Withdrawal failed: {error}",
+                         account_number=account_number, amount=amount, error=str(e))
             return False
+    
+    @instrumented
+    def deposit_many(self, postings: Iterable[Tuple], batch_size: int = 1000,
+                     commit_every: int = None) -> List[Dict]:
+        """Post many deposits - (account_number, amount, description) tuples
+        
+        Rows are sent batch_size at a time in one array call each and
+        committed every commit_every rows (default: every batch). Returns
+        one result dict per input row, in input order - also when the batch
+        aborts: rows since the last commit then carry the error, and rows
+        after the failure are reported as not attempted.
+        """
+        return self._post_many('Deposit', postings, "Cash Deposit",
+                               batch_size, commit_every)
+    
+    @instrumented
+    def withdraw_many(self, postings: Iterable[Tuple], batch_size: int = 1000,
+                      commit_every: int = None) -> List[Dict]:
+        """Post many withdrawals - same contract as deposit_many"""
+        return self._post_many('Withdrawal', postings, "Cash Withdrawal",
+                               batch_size, commit_every)
+    
+    def _post_many(self, transaction_type: str, postings: Iterable[Tuple],
+                   default_description: str, batch_size: int,
+                   commit_every: Optional[int]) -> List[Dict]:
+        commit_every = commit_every or batch_size
+        results = []
+        uncommitted = 0
+        postings = iter(postings)
+        chunk, start = [], 0
+        try:
+            with self._session() as (connection, cursor):
+                while True:
+                    # Cleared first, so a failing read never reports the last chunk twice
+                    chunk, start = [], len(results)
+                    chunk = list(islice(postings, batch_size))
+                    if not chunk:
+                        break
+                    results.extend(self._post_batch(cursor, transaction_type, chunk,
+                                                    default_description))
+                    uncommitted += len(chunk)
+                    if uncommitted >= commit_every:
+                        connection.commit()
+                        uncommitted = 0
+                connection.commit()
+        except Exception as e:
+            # Everything since the last commit was rolled back
+            for result in results[len(results) - uncommitted:]:
+                result['success'] = False
+                result['error'] = str(e)
+            # and the rest of the input was never reached
+            for posting in chunk[len(results) - start:] + self._unread(postings):
+                account_number, amount = self._fields(posting, 2)
+                results.append({'account_number': account_number, 'amount': amount,
+                                'success': False, 'error': f"Not attempted: batch aborted ({e})"})
+            self._failed('batch_aborted', "Batch {transaction_type} aborted: {error}",
+                         transaction_type=transaction_type.lower(), error=str(e))
+        self._invalidate_accounts(*{result['account_number'] for result in results
+                                    if result['success']})
+        posted = sum(1 for result in results if result['success'])
+        log_event(log, logging.INFO, 'batch_posted',
+                  "{transaction_type} batch: {posted}/{rows} rows posted",
+                  transaction_type=transaction_type, posted=posted, rows=len(results))
+        return results
+    
+    def _post_batch(self, cursor, transaction_type: str, chunk: List[Tuple],
+                    default_description: str) -> List[Dict]:
+        """Validate and post one batch of deposit/withdrawal rows (no commit)"""
+        results = []
+        batch = []
+        for posting in chunk:
+            account_number, amount = posting[0], posting[1]
+            description = posting[2] if len(posting) > 2 else default_description
+            result = {'account_number': account_number, 'amount': amount,
+                      'success': False, 'error': None}
+            try:
+                valid = float(amount) > 0
+            except (TypeError, ValueError):
+                valid = False
+            if valid:
+                batch.append((result, (account_number, amount, description)))
+            else:
+                result['error'] = "Amount must be a positive number"
+            results.append(result)
+        if batch:
+            errors = self.backend.post_many(cursor, transaction_type,
+                                            [row for _, row in batch])
+            for (result, _), error in zip(batch, errors):
+                result['success'] = error is None
+                result['error'] = error
+        return results
+    
+    @instrumented
     def get_bank_stats(self) -> Optional[Dict]:
         """Fetch total number of active accounts, total balance, and total transactions across the bank."""
         try:
-            # Note: We count only 'Active' accounts for a relevant dashboard total.
-            query = """
-            SELECT
-                (SELECT COUNT(account_id) FROM Accounts WHERE status = 'Active') AS total_active_accounts,
-                (SELECT NVL(SUM(balance), 0) FROM Accounts) AS total_balance,
-                (SELECT COUNT(transaction_id) FROM Transactions) AS total_transactions
-            FROM DUAL
-            """
-            self.cursor.execute(query)
-            result = self.cursor.fetchone()
+            with self._session() as (connection, cursor):
+                # Note: We count only 'Active' accounts for a relevant dashboard total.
+                cursor.execute(self._sql('bank_totals'))
+                result = cursor.fetchone()
             
-            if result:
-                return {
-                    'total_active_accounts': int(result[0]),
-                    'total_balance': float(result[1]),
-                    'total_transactions': int(result[2])
-                }
+                if result:
+                    return {
+                        'total_active_accounts': int(result[0]),
+                        'total_balance': round(float(result[1]), 2),
+                        'total_transactions': int(result[2])
+                    }
+                return None
+        except Exception as e:
+            self._failed('fetch_failed', "Error fetching bank statistics: {error}", error=str(e))
             return None
+    
+    @instrumented
+    def get_dashboard_snapshot(self) -> Optional[Dict]:
+        """Bank totals, account_statistics per type, and the ids a delta poll starts after
+        
+        The per-type view scans Accounts, so this is the periodic full
+        resync; get_dashboard_delta() covers the time in between.
+        """
+        try:
+            with self._session() as (connection, cursor):
+                # View first: a posting committed in between is then missed
+                # until the next resync rather than counted twice
+                cursor.execute(self._sql('dashboard_type_stats'))
+                by_type = {row[0]: {
+                    'total_accounts': int(row[1]),
+                    'total_balance': round(float(row[2]), 2),
+                    'average_balance': round(float(row[3]), 2),
+                    'highest_balance': float(row[4]),
+                    'lowest_balance': float(row[5])
+                } for row in cursor.fetchall()}
+                cursor.execute(self._sql('dashboard_snapshot'))
+                active, balance, transactions, last_transaction, last_account = cursor.fetchone()
+            return {
+                'totals': {
+                    'total_active_accounts': int(active),
+                    'total_balance': round(float(balance), 2),
+                    'total_transactions': int(transactions)
+                },
+                'by_type': by_type,
+                'last_transaction_id': int(last_transaction),
+                'last_account_id': int(last_account)
+            }
         except Exception as e:
-            print(f"Error fetching bank statistics: {e}")
-            return Nones    
+            self._failed('fetch_failed', "Error fetching dashboard snapshot: {error}", error=str(e))
+            return None
     
-    def transfer_money(self, from_account: str, to_account: str, amount: float) -> bool:
-        """Transfer money between accounts - DEMONSTRATES ACID PROPERTIES"""
+    @instrumented
+    def get_dashboard_delta(self, since_transaction_id: int, since_account_id: int) -> Optional[Dict]:
+        """Ledger rows and accounts added after the given ids, grouped by type
+        
+        'postings' has one entry per (account_type, transaction_type, active)
+        with its row count and amount; 'new_accounts' counts the active
+        accounts opened per type. The returned ids are where the next poll
+        starts (unchanged if nothing arrived).
+        """
         try:
-            self.cursor.callproc('transfer_money', [from_account, to_account, amount])
-            print(f"✅ Transferred ₹{amount:,.2f} from {from_account} to {to_account}")
-            return True
+            with self._session() as (connection, cursor):
+                cursor.execute(self._sql('dashboard_ledger_delta'), {'since': since_transaction_id})
+                postings = []
+                last_transaction_id = since_transaction_id
+                for account_type, transaction_type, active, count, amount, last in cursor:
+                    postings.append({
+                        'account_type': account_type,
+                        'transaction_type': transaction_type,
+                        'active': bool(active),
+                        'count': int(count),
+                        'amount': round(float(amount), 2)
+                    })
+                    last_transaction_id = max(last_transaction_id, int(last))
+                cursor.execute(self._sql('dashboard_new_accounts'), {'since': since_account_id})
+                new_accounts = {}
+                last_account_id = since_account_id
+                for account_type, active, last in cursor:
+                    new_accounts[account_type] = int(active)
+                    last_account_id = max(last_account_id, int(last))
+            return {
+                'postings': postings,
+                'new_accounts': new_accounts,
+                'last_transaction_id': last_transaction_id,
+                'last_account_id': last_account_id
+            }
         except Exception as e:
-            print(f" Transfer failed: {e}")
+            self._failed('fetch_failed', "Error fetching dashboard delta: {error}", error=str(e))
+            return None
+    
+    @instrumented
+    def verify_aggregates(self) -> Optional[Dict]:
+        """Compare the running counters with a full recount (slow - scans the ledger)
+        
+        Returns the counter and actual values of the bank totals, the number
+        of accounts whose transaction counter has drifted, and 'ok'.
+        """
+        try:
+            stats = self.get_bank_stats()
+            with self._session() as (connection, cursor):
+                cursor.execute(self._sql('actual_totals'))
+                active, balance, transactions = cursor.fetchone()
+                cursor.execute(self._sql('counter_drift'))
+                (drifted_accounts,) = cursor.fetchone()
+            actual = {
+                'total_active_accounts': int(active),
+                'total_balance': round(float(balance), 2),
+                'total_transactions': int(transactions)
+            }
+            return {
+                'counters': stats,
+                'actual': actual,
+                'drifted_accounts': int(drifted_accounts),
+                'ok': stats == actual and drifted_accounts == 0
+            }
+        except Exception as e:
+            self._failed('verify_failed', "Error verifying aggregates: {error}", error=str(e))
+            return None
+    
+    @instrumented
+    def rebuild_aggregates(self) -> bool:
+        """Recompute Account_Counters and Bank_Totals from the base tables
+        
+        Accounts and both ledger tiers are locked against writers for the
+        duration so the recount cannot race with new postings.
+        """
+        try:
+            with self._session() as (connection, cursor):
+                self.backend.lock_tables(cursor, ['Accounts', 'Transactions',
+                                                  'Transactions_Archive'])
+                cursor.execute(self._sql('clear_account_counters'))
+                cursor.execute(self._sql('rebuild_account_counters'))
+                cursor.execute(self._sql('actual_totals'))
+                active, balance, transactions = cursor.fetchone()
+                # Totals go into slot 0; the readers only ever SUM the slots
+                rows = [{'slot': slot,
+                         'active': active if slot == 0 else 0,
+                         'balance': balance if slot == 0 else 0,
+                         'transactions': transactions if slot == 0 else 0}
+                        for slot in range(16)]
+                cursor.execute(self._sql('clear_bank_totals'))
+                cursor.executemany(self._sql('insert_bank_totals'), rows)
+                connection.commit()
+                log_event(log, logging.INFO, 'aggregates_rebuilt', "Aggregates rebuilt")
+                return True
+        except Exception as e:
+            self._failed('rebuild_failed', "Aggregate rebuild failed: {error}", error=str(e))
             return False
     
+    @instrumented
+    def archive_transactions(self, horizon_days: int = 90, batch_size: int = 5000) -> Optional[Dict]:
+        """Move transactions older than horizon_days into Transactions_Archive
+        
+        Rows move oldest first, batch_size per transaction: each batch is
+        copied and deleted under one commit, so the job can be interrupted
+        and rerun at any point. Counters are lifetime totals and are not
+        touched. The horizon must cover the 30 days of recent_transactions.
+        Returns rows moved, batches, the cutoff and rows/second.
+        """
+        if horizon_days < 31:
+            self._failed('archive_failed', "Archive horizon must be at least 31 days, got {horizon_days}",
+                         horizon_days=horizon_days)
+            return None
+        started = time.perf_counter()
+        cutoff = datetime.now().replace(microsecond=0) - timedelta(days=horizon_days)
+        report = {'cutoff': cutoff, 'moved': 0, 'batches': 0}
+        next_batch = self._sql('archive_next_batch')
+        copy = self._sql('archive_copy_batch')
+        delete = self._sql('archive_delete_batch')
+        try:
+            with self._session() as (connection, cursor):
+                while True:
+                    cursor.execute(next_batch, {'cutoff': cutoff, 'batch_size': batch_size})
+                    keys = cursor.fetchall()
+                    if not keys:
+                        break
+                    last_date, last_id = keys[-1]
+                    bounds = {'last_date': last_date, 'last_id': last_id}
+                    cursor.execute(copy, bounds)
+                    cursor.execute(delete, bounds)
+                    moved = cursor.rowcount
+                    connection.commit()
+                    report['moved'] += moved
+                    report['batches'] += 1
+        except Exception as e:
+            self._failed('archive_failed', "Archiving stopped after {moved} rows: {error}",
+                         moved=report['moved'], error=str(e))
+            return None
+        report['elapsed_seconds'] = time.perf_counter() - started
+        report['rows_per_second'] = (report['moved'] / report['elapsed_seconds']
+                                     if report['elapsed_seconds'] > 0 else 0.0)
+        log_event(log, logging.INFO, 'transactions_archived',
+                  "Archived {moved:,} transactions older than {cutoff:%d-%b-%Y} "
+                  "in {batches} batches ({rate:,.0f} rows/sec)",
+                  moved=report['moved'], cutoff=cutoff, batches=report['batches'],
+                  rate=report['rows_per_second'])
+        return report
+    
+    # Retries of a transfer that hit a deadlock or lock timeout; attempt n
+    # sleeps a random 0..RETRY_BASE_DELAY * 2**(n-1) seconds first
+    RETRY_ATTEMPTS = 5
+    RETRY_BASE_DELAY = 0.02
+    
+    @instrumented
+    def transfer_money(self, from_account: str, to_account: str, amount: float) -> bool:
+        """Transfer money between accounts - DEMONSTRATES ACID PROPERTIES
+        
+        The procedure locks both accounts in account_id order, so
+        concurrent transfers queue rather than deadlock. A deadlock,
+        serialization failure or lock timeout (backend.retryable) still
+        rolls back and retries the whole transfer, up to RETRY_ATTEMPTS
+        times, with full-jitter exponential backoff.
+        """
+        for attempt in range(1, self.RETRY_ATTEMPTS + 1):
+            try:
+                with self._session() as (connection, cursor):
+                    self.backend.transfer_money(cursor, from_account, to_account, amount)
+                self._invalidate_accounts(from_account, to_account)
+                log_event(log, logging.INFO, 'transfer',
+                          "Transferred ₹{amount:,.2f} from {from_account} to {to_account}",
+                          from_account=from_account, to_account=to_account, amount=amount)
+                return True
+            except Exception as e:
+                if attempt < self.RETRY_ATTEMPTS and self.backend.retryable(e):
+                    delay = random.uniform(0, self.RETRY_BASE_DELAY * 2 ** (attempt - 1))
+                    if self.metrics is not None:
+                        self.metrics.mark_retry()
+                    log_event(log, logging.WARNING, 'transfer_retry',
+                              "Transfer attempt {attempt} failed ({error}); retrying in "
+                              "{delay_ms:.0f} ms", from_account=from_account,
+                              to_account=to_account, attempt=attempt, error=str(e),
+                              delay_ms=delay * 1000)
+                    time.sleep(delay)
+                    continue
+                self._failed('transfer_failed', "Transfer failed: {error}",
+                             from_account=from_account, to_account=to_account, amount=amount,
+                             error=str(e))
+                return False
+    
+    @instrumented
+    def transfer_many(self, transfers: Iterable[Tuple], batch_size: int = 1000) -> Dict:
+        """Post a payroll-style file of (from_account, to_account, amount[, description])
+        
+        Per batch, every account is resolved and locked in one set-based
+        query, lines are applied in order against running balances, each
+        touched account gets a single UPDATE (so a shared source is debited
+        once per batch) and all Transfer-Out/Transfer-In rows are inserted
+        with one executemany. Returns per-line results plus throughput;
+        if a batch aborts, its lines carry the error and the remaining
+        lines are reported as not attempted, so results match the input.
+        """
+        started = time.perf_counter()
+        results = []
+        transfers = iter(transfers)
+        chunk = []
+        try:
+            with self._session() as (connection, cursor):
+                while True:
+                    # Cleared first, so a failing read never reports the committed chunk again
+                    chunk = []
+                    chunk = list(islice(transfers, batch_size))
+                    if not chunk:
+                        break
+                    batch_results = self._transfer_batch(cursor, chunk)
+                    connection.commit()
+                    results.extend(batch_results)
+        except Exception as e:
+            self._failed('batch_aborted', "Batch transfer aborted after {lines} lines: {error}",
+                         lines=len(results), error=str(e))
+            # Still one result per line: the rolled-back batch carries the error,
+            # and the lines after it were never attempted
+            for lines, error in ((chunk, str(e)),
+                                 (self._unread(transfers), f"Not attempted: batch aborted ({e})")):
+                for line in lines:
+                    from_account, to_account, amount = self._fields(line, 3)
+                    results.append({'from_account': from_account, 'to_account': to_account,
+                                    'amount': amount, 'success': False, 'error': error})
+        elapsed = time.perf_counter() - started
+        self._invalidate_accounts(*{number for result in results if result['success']
+                                    for number in (result['from_account'], result['to_account'])})
+        posted = sum(1 for result in results if result['success'])
+        report = {
+            'results': results,
+            'posted': posted,
+            'failed': len(results) - posted,
+            'elapsed_seconds': elapsed,
+            'transfers_per_second': posted / elapsed if elapsed > 0 else 0.0
+        }
+        log_event(log, logging.INFO, 'transfer_batch_posted',
+                  "Transfer batch: {posted}/{lines} lines posted ({rate:,.0f} transfers/sec)",
+                  posted=posted, lines=len(results), rate=report['transfers_per_second'])
+        return report
+    
+    @instrumented
+    def transfer_file(self, path: str, batch_size: int = 1000) -> Dict:
+        """Stream a CSV file (from_account,to_account,amount[,description]) into transfer_many"""
+        with open(path, newline='', encoding='utf-8') as handle:
+            rows = (
+                (row['from_account'].strip(), row['to_account'].strip(), row['amount'],
+                 (row.get('description') or '').strip() or None)
+                for row in csv.DictReader(handle)
+            )
+            return self.transfer_many(rows, batch_size=batch_size)
+    
+    # post_group request kinds, with the description a posting without one gets
+    GROUP_POSTINGS = {'Deposit': "Cash Deposit", 'Withdrawal': "Cash Withdrawal",
+                      'Transfer': None}
+    
+    @instrumented
+    def post_group(self, requests: Iterable[Tuple[str, Tuple]]) -> List[Dict]:
+        """Apply (kind, line) requests in order in one transaction, committed once
+        
+        kind is a key of GROUP_POSTINGS: 'Deposit' and 'Withdrawal' take a
+        deposit_many row, 'Transfer' a transfer_many line. Each request
+        stands alone as it does in those methods - a bounced withdrawal
+        fails only itself - and one result dict comes back per request.
+        Unlike them, a failure of the transaction itself propagates with
+        nothing committed, so the caller can retry the requests separately.
+        """
+        requests = list(requests)
+        for kind, _ in requests:
+            if kind not in self.GROUP_POSTINGS:
+                raise ValueError(f"Unknown posting kind: {kind!r}")
+        results = []
+        with self._session() as (connection, cursor):
+            for kind, run in groupby(requests, key=lambda request: request[0]):
+                lines = [line for _, line in run]
+                if kind == 'Transfer':
+                    results.extend(self._transfer_batch(cursor, lines))
+                else:
+                    results.extend(self._post_batch(cursor, kind, lines,
+                                                    self.GROUP_POSTINGS[kind]))
+            connection.commit()
+        self._invalidate_accounts(*{number for result in results if result['success']
+                                    for number in self._result_accounts(result)})
+        return results
+    
+    @staticmethod
+    def _result_accounts(result: Dict) -> Tuple:
+        """Accounts a posting or transfer result touched"""
+        if 'account_number' in result:
+            return (result['account_number'],)
+        return result['from_account'], result['to_account']
+    
+    @staticmethod
+    def _fields(line, count: int) -> Tuple:
+        """The first count fields of an input line, None where a malformed line has none"""
+        try:
+            fields = tuple(line)[:count]
+        except TypeError:
+            fields = ()
+        return fields + (None,) * (count - len(fields))
+    
+    @staticmethod
+    def _unread(lines: Iterator) -> List:
+        """What is left of an aborted batch's input (an input that fails again ends it)"""
+        rest = []
+        try:
+            rest.extend(lines)
+        except Exception:
+            pass
+        return rest
+    
+    def _transfer_batch(self, cursor, chunk: List[Tuple]) -> List[Dict]:
+        """Validate, apply and post one batch of transfer lines (no commit)"""
+        results = []
+        lines = []
+        for from_account, to_account, amount, *rest in chunk:
+            result = {'from_account': from_account, 'to_account': to_account,
+                      'amount': amount, 'success': False, 'error': None}
+            results.append(result)
+            try:
+                amount = float(amount)
+            except (TypeError, ValueError):
+                amount = 0
+            if amount <= 0:
+                result['error'] = "Amount must be a positive number"
+            elif from_account == to_account:
+                result['error'] = "Cannot transfer to the same account"
+            else:
+                result['amount'] = amount
+                lines.append((result, from_account, to_account, amount,
+                              rest[0] if rest else None))
+        if not lines:
+            return results
+        
+        accounts = self.backend.lock_accounts(
+            cursor, sorted({line[1] for line in lines} | {line[2] for line in lines}))
+        balances = {number: balance for number, (_, balance) in accounts.items()}
+        postings = []
+        for result, from_account, to_account, amount, description in lines:
+            missing = [n for n in (from_account, to_account) if n not in accounts]
+            if missing:
+                result['error'] = f"Account {missing[0]} not found or inactive"
+                continue
+            if balances[from_account] < amount:
+                result['error'] = "Insufficient balance for transfer"
+                continue
+            balances[from_account] = round(balances[from_account] - amount, 2)
+            balances[to_account] = round(balances[to_account] + amount, 2)
+            postings.append({
+                'account_id': accounts[from_account][0], 'transaction_type': 'Transfer-Out',
+                'amount': amount, 'balance_after': balances[from_account],
+                'description': description or 'Transfer to ' + to_account,
+                'reference': to_account
+            })
+            postings.append({
+                'account_id': accounts[to_account][0], 'transaction_type': 'Transfer-In',
+                'amount': amount, 'balance_after': balances[to_account],
+                'description': description or 'Transfer from ' + from_account,
+                'reference': from_account
+            })
+            result['success'] = True
+        
+        if postings:
+            changed = [{'account_id': accounts[number][0], 'balance': balance}
+                       for number, balance in balances.items()
+                       if balance != accounts[number][1]]
+            cursor.executemany(self._sql('set_account_balance'), changed)
+            cursor.executemany(self._sql('insert_ledger_row'), postings)
+        return results
+    
+    @instrumented
     def update_customer_info(self, customer_id: int, phone: str = None,
                             address: str = None) -> bool:
-        """Update customer contact information"""
+        """Update customer contact information (fields left empty keep their value)"""
+        if not phone and not address:
+            return False
         try:
-            updates = []
-            params = []
-            
-            if phone:
-                updates.append("phone = :1")
-                params.append(phone)
-            if address:
-                updates.append("address = :2")
-                params.append(address)
-            
-            if not updates:
-                return False
-            
-            params.append(customer_id)
-            query = f"UPDATE Customers SET {', '.join(updates)} WHERE customer_id = :{len(params)}"
-            
-            self.cursor.execute(query, params)
-            self.connection.commit()
-            print("✅ Customer info updated")
-            return True
+            with self._session() as (connection, cursor):
+                # One statement shape whichever fields are given: NULL keeps the column
+                cursor.execute(self._sql('update_customer_contact'),
+                               {'phone': phone or None, 'address': address or None,
+                                'customer_id': customer_id})
+                connection.commit()
+                self._invalidate_customer(customer_id)
+                log_event(log, logging.INFO, 'customer_updated', "Customer info updated",
+                          customer_id=customer_id)
+                return True
         except Exception as e:
-            print(f"Update failed: {e}")
-            self.connection.rollback()
+            self._failed('update_failed', "Update failed: {error}",
+                         customer_id=customer_id, error=str(e))
             return False
 
 
-def test_all_operations():
-    """Test all database operations"""
+def test_all_operations(backend=None) -> bool:
+    """Test all database operations
+    
+    Runs the same conformance checks against any backend (Oracle by default,
+    e.g. test_all_operations(SQLiteBackend()) for the embedded engine) and
+    returns True only if every check passed. The account cache is on, so
+    every balance check after a write also checks its invalidation.
+    """
     
     USERNAME = "SYS"
     PASSWORD = "oracle@express"  
     DSN = "localhost:1521/XE"
     
-    db = BankDatabase(USERNAME, PASSWORD, DSN)
+    db = BankDatabase(USERNAME, PASSWORD, DSN, backend=backend, cache_size=64)
+    failures = []
+    
+    def check(condition: bool, label: str):
+        print(f"   {'✅' if condition else '❌'} {label}")
+        if not condition:
+            failures.append(label)
     
     if not db.connect():
         print("❌ Connection failed! Check your credentials.")
-        return
+        return False
     
     try:
         print("\n" + "="*60)
@@ -337,7 +1247,9 @@ def test_all_operations():
             customer_id = customer['customer_id']
         else:
             print("   ❌ Login failed!")
-            return
+            return False
+        check(db.customer_login("rahul.sharma@email.com", "wrong") is None,
+              "Wrong password rejected")
 
         print("\n  Testing Get Accounts (JOIN Query):")
         accounts = db.get_customer_accounts(customer_id)
@@ -347,7 +1259,7 @@ def test_all_operations():
             test_account = accounts[0]['account_number']
         else:
             print("   ❌ No accounts found!")
-            return
+            return False
 
         print("\n  Testing Account Details (JOIN Query):")
         details = db.get_account_details(test_account)
@@ -362,16 +1274,28 @@ def test_all_operations():
         print(f"   Total Balance: ₹{summary['total_balance']:,.2f}")
         print(f"   Total Transactions: {summary['total_transactions']}")
 
+        def balance(account_number):
+            return db.get_account_details(account_number)['balance']
+        
+        opening = balance(test_account)
+        dashboard = db.get_dashboard_snapshot()
+        
         print("\n Testing Deposit (CREATE):")
-        db.deposit_money(test_account, 5000, "Test Deposit via Python")
+        check(db.deposit_money(test_account, 5000, "Test Deposit via Python"), "Deposit accepted")
+        check(balance(test_account) == opening + 5000, "Balance increased by deposit")
 
         print("\n  Testing Withdrawal (CREATE):")
-        db.withdraw_money(test_account, 2000, "Test Withdrawal via Python")
+        check(db.withdraw_money(test_account, 2000, "Test Withdrawal via Python"), "Withdrawal accepted")
+        check(balance(test_account) == opening + 3000, "Balance reduced by withdrawal")
+        check(not db.withdraw_money(test_account, 10**9), "Overdraft rejected")
+        check(not db.deposit_money("ACC9999999999", 100), "Unknown account rejected")
+        check(balance(test_account) == opening + 3000, "Failed operations left balance unchanged")
         
         print("\n  Testing Transfer (ACID PROPERTIES DEMO!):")
         if len(accounts) >= 2:
             from_acc = accounts[0]['account_number']
             to_acc = accounts[1]['account_number']
+            total_before = balance(from_acc) + balance(to_acc)
             print(f"   Transferring ₹1,000 from {from_acc} to {to_acc}")
             if db.transfer_money(from_acc, to_acc, 1000):
                 print("    ACID Properties Maintained:")
@@ -379,33 +1303,173 @@ def test_all_operations():
                 print("      ✓ Consistency: Total money remains constant")
                 print("      ✓ Isolation: No interference from other transactions")
                 print("      ✓ Durability: Changes are permanent")
+            check(balance(from_acc) + balance(to_acc) == total_before, "Total balance conserved")
+            check(not db.transfer_money(from_acc, to_acc, 10**9), "Overdrawn transfer rejected")
+            check(balance(from_acc) + balance(to_acc) == total_before, "Failed transfer rolled back")
         else:
             print("   ⚠️  Need 2 accounts to demo transfer")
         
+        print("\n  Testing Batch Abort:")
+        if len(accounts) >= 2:
+            # The fourth line is malformed, which aborts the second batch of two
+            before = balance(from_acc), balance(to_acc)
+            lines = [(from_acc, to_acc, 1)] * 3 + [(from_acc,)] + [(from_acc, to_acc, 1)] * 2
+            report = db.transfer_many(lines, batch_size=2)
+            outcome = [result['success'] for result in report['results']]
+            check(outcome == [True, True, False, False, False, False]
+                  and report['failed'] == 4
+                  and all(result['error'].startswith("Not attempted")
+                          for result in report['results'][4:])
+                  and (balance(from_acc), balance(to_acc)) == (before[0] - 2, before[1] + 2),
+                  "Aborted transfer batch reports every line, later ones not attempted")
+            
+            before = balance(to_acc)
+            results = db.deposit_many([(to_acc, 1)] * 3 + [(to_acc,)] + [(to_acc, 1)] * 2,
+                                      batch_size=2)
+            check([result['success'] for result in results]
+                  == [True, True, False, False, False, False]
+                  and all(result['error'].startswith("Not attempted") for result in results[3:])
+                  and balance(to_acc) == before + 2,
+                  "Aborted deposit batch reports every row, later ones not attempted")
+        
+        print("\n  Testing Group Posting:")
+        if len(accounts) >= 2:
+            # The overdraft and the zero withdrawal fail alone; the rest commits
+            before = balance(from_acc), balance(to_acc)
+            results = db.post_group([('Deposit', (from_acc, 10, "Group Deposit")),
+                                     ('Withdrawal', (to_acc, 10**9, "Group Withdrawal")),
+                                     ('Transfer', (from_acc, to_acc, 5)),
+                                     ('Withdrawal', (to_acc, 0, "Group Withdrawal"))])
+            check([result['success'] for result in results] == [True, False, True, False]
+                  and (balance(from_acc), balance(to_acc)) == (before[0] + 5, before[1] + 5),
+                  "Group posting applies each request on its own")
+        
+        print("\n  Testing Account Opening (PROCEDURE):")
+        new_account = db.create_account(customer_id, 'Savings', 1500)
+        check(new_account is not None and balance(new_account) == 1500, "Account opened with deposit")
+        check(any(acc['account_number'] == new_account
+                  for acc in db.get_customer_accounts(customer_id)),
+              "New account listed after cached account list")
+        
+        print("\n  Testing Dashboard Delta:")
+        delta = db.get_dashboard_delta(dashboard['last_transaction_id'],
+                                       dashboard['last_account_id'])
+        now = db.get_bank_stats()
+        check(sum(posting['count'] for posting in delta['postings'])
+              == now['total_transactions'] - dashboard['totals']['total_transactions']
+              and sum(delta['new_accounts'].values())
+              == now['total_active_accounts'] - dashboard['totals']['total_active_accounts'],
+              "Dashboard delta covers every posting and account since the snapshot")
+        
         print("\n  Testing Transaction History (JOIN Query):")
         history = db.get_transaction_history(test_account, limit=5)
         if history:
             print(f"   Last {len(history)} transactions:")
             for trans in history:
                 print(f"   • {trans['date']} - {trans['type']} - ₹{trans['amount']:,.2f}")
+        check(len(db.get_transaction_history(test_account, limit=2)) == 2,
+              "History honours the row limit")
+        total = db.count_transactions(test_account)
+        paged = [row for offset in range(0, total, 4)
+                 for row in db.get_transaction_page(test_account, offset, 4)]
+        check(total == len(paged) and paged == list(db.iter_transaction_history(test_account)),
+              "Transaction pages cover the history in order")
         
         print("\n  Testing Mini Statement:")
         mini = db.get_mini_statement(test_account)
         print(f"   Retrieved {len(mini)} recent transactions")
+        
+        print("\n  Testing Typed Rows:")
+        typed = BankDatabase(backend=db.backend, metrics=False, typed_rows=True)
+        records = typed.get_transaction_history(test_account, limit=10)
+        check(records and isinstance(records[0].amount, Decimal)
+              and [record.as_dict() for record in records]
+              == db.get_transaction_history(test_account, limit=10)
+              and [record.as_dict() for record in typed.get_customer_accounts(customer_id)]
+              == db.get_customer_accounts(customer_id)
+              and [record.as_dict() for record in typed.iter_transaction_history(test_account, 3)]
+              == list(db.iter_transaction_history(test_account, 3)),
+              "Typed rows match the dict API")
+
+        print("\n  Testing Ledger Archive (TIERING):")
+        archived = db.archive_transactions(horizon_days=90)
+        check(archived is not None and db.get_mini_statement(test_account) == mini,
+              "Archive job ran and left recent history in place")
 
         print("\n Testing Update Customer Info (UPDATE):")
         if db.update_customer_info(customer_id, phone="9999999999"):
             print("   ✅ Phone number updated")
+        db.update_customer_info(customer_id, address="12 MG Road, Pune")
+        db.update_customer_info(customer_id, phone="9999999998", address="12 MG Road, Pune")
+        check(db.customer_login("rahul.sharma@email.com", "hashed_password_123")['phone']
+              == "9999999998" and db.update_customer_info(customer_id) is False,
+              "Contact updates keep the fields they leave out")
+        check(db.register_customer("Test User", "rahul.sharma@email.com", "9000000000",
+                                   "Nowhere", "2000-01-01", "pw") is False,
+              "Duplicate email rejected")
+        
+        print("\n  Testing Account Cache:")
+        db.get_account_details(test_account)
+        stats = db.cache_stats()
+        print(f"   Hits: {stats['hits']}  Misses: {stats['misses']}  "
+              f"Invalidations: {stats['invalidations']}")
+        check(stats['hits'] > 0 and stats['invalidations'] > 0, "Cache served reads and saw invalidations")
+        # A one-entry cache remembers at most OWNERS_PER_CACHE_ENTRY owners;
+        # a write after the owner was forgotten must still be seen
+        small = BankDatabase(backend=db.backend, cache_size=1, metrics=False)
+        for other in range(1001, 1006):
+            small.get_customer_accounts(other)
+        small.get_customer_accounts(customer_id)
+        for other in range(1001, 1006):
+            if other != customer_id:
+                small.get_customer_accounts(other)
+        def listed(account_number):
+            return next(acc['balance'] for acc in small.get_customer_accounts(customer_id)
+                        if acc['account_number'] == account_number)
+        before = listed(test_account)
+        small.deposit_money(test_account, 10)
+        fresh = listed(test_account) == before + 10
+        small.withdraw_money(test_account, 10)
+        check(len(small._account_owners) <= OWNERS_PER_CACHE_ENTRY
+              and fresh and listed(test_account) == before,
+              "Account owner map stays bounded and cached lists stay fresh")
+        
+        print("\n  Testing Metrics:")
+        snapshot = db.metrics.snapshot()
+        withdrawals = snapshot['methods']['withdraw_money']
+        print(f"   withdraw_money: {withdrawals['calls']} calls, {withdrawals['errors']} errors; "
+              f"{len(snapshot['statements'])} distinct statements")
+        check(withdrawals['calls'] == 2 and withdrawals['errors'] == 1,
+              "Rejected withdrawal counted as an error")
+        check(any(stats['rows_fetched'] > 0 for stats in snapshot['statements'].values()),
+              "Rows fetched counted per statement")
+        check('bank_method_latency_seconds_bucket{method="deposit_money",le="+Inf"}'
+              in db.metrics.render_prometheus(), "Prometheus exposition rendered")
+        statements = db.statement_stats()['statements']
+        check(statements['update_customer_contact']['executions'] == 3
+              and not any(key.startswith('UPDATE Customers') for key in snapshot['statements']),
+              "Contact updates share one statement shape")
         
         print("\n" + "="*60)
-        print("✅ ALL TESTS COMPLETED SUCCESSFULLY!")
+        if failures:
+            print(f"❌ {len(failures)} CHECK(S) FAILED: {', '.join(failures)}")
+        else:
+            print("✅ ALL TESTS COMPLETED SUCCESSFULLY!")
         print("="*60)
+        return not failures
         
     except Exception as e:
         print(f"\n❌ Error during testing: {e}")
+        return False
     finally:
         db.disconnect()
 
 
 if __name__ == "__main__":
-    test_all_operations()
\ No newline at end of file
+    configure_logging()
+    # python bank_database.py sqlite  -> run against the embedded engine
+    if len(sys.argv) > 1 and sys.argv[1] == 'sqlite':
+        ok = test_all_operations(SQLiteBackend())
+    else:
+        ok = test_all_operations()
+    sys.exit(0 if ok else 1)
\ No newline at end of file
@@ -0,0 +1,155 @@
+"""
+Bank Account Management System - Statement Export
+Streams Transactions (joined to Accounts/Customers) to CSV or Parquet
+
+Rows are pulled with BankDatabase.iter_statement_batches() and written one
+batch at a time, so memory stays flat however many rows are exported.
+Parquet output needs pyarrow (optional dependency).
+
+Usage:
+    python bank_export.py statements.csv --from 2024-01-01 --to 2025-01-01
+    python bank_export.py statements.parquet --sqlite bank.db --account ACC0000100001
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+from bank_database import BankDatabase
+from bank_metrics import configure_logging
+
+
+def _run_export(write_batch, db: BankDatabase, start_date: datetime, end_date: datetime,
+                account_numbers: Optional[Iterable[str]], batch_size: int,
+                measure_memory: bool) -> Dict:
+    """Drive the batch stream into write_batch and collect the report"""
+    if measure_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    rows = 0
+    try:
+        for batch in db.iter_statement_batches(start_date, end_date, account_numbers,
+                                               batch_size=batch_size):
+            write_batch(batch)
+            rows += len(batch)
+        elapsed = time.perf_counter() - started
+        report = {
+            'rows': rows,
+            'elapsed_seconds': elapsed,
+            'rows_per_second': rows / elapsed if elapsed > 0 else 0.0,
+            'peak_memory_bytes': tracemalloc.get_traced_memory()[1] if measure_memory else None
+        }
+    finally:
+        if measure_memory:
+            tracemalloc.stop()
+    return report
+
+
+def export_csv(db: BankDatabase, path: str, start_date: datetime, end_date: datetime,
+               account_numbers: Iterable[str] = None, batch_size: int = 5000,
+               measure_memory: bool = False) -> Dict:
+    """Export statement rows to a CSV file with a header row"""
+    with open(path, 'w', newline='', encoding='utf-8') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(BankDatabase.STATEMENT_COLUMNS)
+
+        def write_batch(batch):
+            writer.writerows(
+                (row[0], row[1].strftime('%Y-%m-%d %H:%M:%S')) + tuple(row[2:])
+                for row in batch
+            )
+
+        report = _run_export(write_batch, db, start_date, end_date, account_numbers,
+                             batch_size, measure_memory)
+    report['bytes_written'] = os.path.getsize(path)
+    return report
+
+
+def _parquet_schema():
+    return pa.schema([
+        ('transaction_id', pa.int64()),
+        ('transaction_date', pa.timestamp('s')),
+        ('account_number', pa.string()),
+        ('account_type', pa.string()),
+        ('customer_id', pa.int64()),
+        ('customer_name', pa.string()),
+        ('transaction_type', pa.string()),
+        ('amount', pa.float64()),
+        ('balance_after', pa.float64()),
+        ('description', pa.string()),
+        ('reference_account', pa.string()),
+    ])
+
+
+def export_parquet(db: BankDatabase, path: str, start_date: datetime, end_date: datetime,
+                   account_numbers: Iterable[str] = None, batch_size: int = 50000,
+                   compression: str = 'zstd', measure_memory: bool = False) -> Dict:
+    """Export statement rows to a compressed Parquet file, one row group per batch"""
+    if pa is None:
+        raise ImportError("pyarrow is required for Parquet export (pip install pyarrow)")
+    schema = _parquet_schema()
+    with pq.ParquetWriter(path, schema, compression=compression) as writer:
+
+        def write_batch(batch):
+            columns = list(zip(*batch))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                schema=schema))
+
+        report = _run_export(write_batch, db, start_date, end_date, account_numbers,
+                             batch_size, measure_memory)
+    report['bytes_written'] = os.path.getsize(path)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export account statements")
+    parser.add_argument('output', help="target file (.csv or .parquet)")
+    parser.add_argument('--from', dest='start', default='1900-01-01', help="YYYY-MM-DD (inclusive)")
+    parser.add_argument('--to', dest='end', default='9999-12-31', help="YYYY-MM-DD (exclusive)")
+    parser.add_argument('--account', action='append', help="restrict to account number (repeatable)")
+    parser.add_argument('--sqlite', metavar='PATH', help="read from an embedded SQLite database")
+    parser.add_argument('--batch-size', type=int, default=None)
+    args = parser.parse_args()
+    configure_logging()
+
+    if args.sqlite:
+        from bank_backends import SQLiteBackend
+        db = BankDatabase(backend=SQLiteBackend(args.sqlite))
+    else:
+        db = BankDatabase("SYS", "oracle@express", "localhost:1521/XE")
+    if not db.connect():
+        return 1
+
+    start = datetime.strptime(args.start, '%Y-%m-%d')
+    end = datetime.strptime(args.end, '%Y-%m-%d')
+    try:
+        if args.output.endswith('.parquet'):
+            report = export_parquet(db, args.output, start, end, args.account,
+                                    batch_size=args.batch_size or 50000, measure_memory=True)
+        else:
+            report = export_csv(db, args.output, start, end, args.account,
+                                batch_size=args.batch_size or 5000, measure_memory=True)
+    finally:
+        db.disconnect()
+    print(f"✅ Exported {report['rows']:,} rows in {report['elapsed_seconds']:.2f}s "
+          f"({report['rows_per_second']:,.0f} rows/sec, "
+          f"peak {report['peak_memory_bytes'] / 1024 / 1024:.1f} MiB, "
+          f"{report['bytes_written']:,} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,285 @@
+"""
+Bank Account Management System - Group Commit
+Coalesces postings from many threads into one transaction per group
+
+    with GroupCommitQueue(db, max_delay_ms=5, max_batch=256) as postings:
+        future = postings.deposit('ACC0000100001', 500)
+        result = future.result()    # {'success': True, 'error': None, ...}
+
+deposit(), withdraw() and transfer() queue the request and return a
+concurrent.futures.Future at once. A writer thread takes the first queued
+request, collects whatever else arrives within max_delay_ms (up to
+max_batch requests), applies the group in submission order in a single
+database transaction and commits once. Every future then resolves to its
+own result dict, the same shape deposit_many / transfer_many return.
+
+Groups are applied by BankDatabase.post_group, where each request stands
+on its own as in deposit_many / transfer_many. A bounced withdrawal
+therefore fails alone and the rest of the group commits. If the group
+transaction itself fails (a deadlock, a lost connection), every request
+in it is retried in a transaction of its own, so only the requests that
+fail again report an error.
+
+Usage (benchmark: direct calls vs group commit, then a drift check):
+    python bank_group_commit.py --writers 64 --seconds 5
+"""
+
+import argparse
+import logging
+import os
+import queue
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Tuple
+
+from bank_backends import SQLiteBackend
+from bank_bench import summarize
+from bank_database import BankDatabase
+from bank_metrics import configure_logging, log_event
+
+log = logging.getLogger('bank.group_commit')
+
+
+class GroupCommitQueue:
+    """In-process write queue that commits postings in groups"""
+
+    def __init__(self, db: BankDatabase, max_delay_ms: float = 5.0, max_batch: int = 256):
+        self.db = db
+        self.max_delay = max_delay_ms / 1000
+        self.max_batch = max_batch
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.groups = 0
+        self.requests = 0
+        self.fallbacks = 0
+        self._writer = threading.Thread(target=self._run, name='bank-group-commit',
+                                        daemon=True)
+        self._writer.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def deposit(self, account_number: str, amount: float,
+                description: str = "Cash Deposit") -> Future:
+        return self._submit('Deposit', (account_number, amount, description))
+
+    def withdraw(self, account_number: str, amount: float,
+                 description: str = "Cash Withdrawal") -> Future:
+        return self._submit('Withdrawal', (account_number, amount, description))
+
+    def transfer(self, from_account: str, to_account: str, amount: float,
+                 description: str = None) -> Future:
+        return self._submit('Transfer', (from_account, to_account, amount, description))
+
+    def close(self):
+        """Commit everything already queued, then stop the writer thread"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._writer.join()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'groups': self.groups,
+                'requests': self.requests,
+                'average_group_size': self.requests / self.groups if self.groups else 0.0,
+                'fallbacks': self.fallbacks,
+            }
+
+    def _submit(self, kind: str, row: Tuple) -> Future:
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("GroupCommitQueue is closed")
+            self._queue.put((kind, row, future))
+        return future
+
+    def _run(self):
+        while True:
+            request = self._queue.get()
+            if request is None:
+                return
+            group = [request]
+            deadline = time.monotonic() + self.max_delay
+            closing = False
+            while len(group) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if request is None:
+                    closing = True
+                    break
+                group.append(request)
+            self._commit(group)
+            if closing:
+                return
+
+    def _commit(self, group: List[Tuple]):
+        fallback = False
+        try:
+            results = self.db.post_group([(kind, row) for kind, row, _ in group])
+        except Exception as e:
+            fallback = True
+            log_event(log, logging.WARNING, 'group_commit_failed',
+                      "Group of {size} failed ({error}); committing its requests one by one",
+                      size=len(group), error=str(e))
+            results = [self._apply_alone(request) for request in group]
+        with self._lock:
+            self.groups += 1
+            self.requests += len(group)
+            self.fallbacks += fallback
+        for (_, _, future), result in zip(group, results):
+            future.set_result(result)
+
+    def _apply_alone(self, request: Tuple) -> Dict:
+        kind, row, _ = request
+        try:
+            return self.db.post_group([(kind, row)])[0]
+        except Exception as e:
+            return self._result(kind, row, str(e))
+
+    @staticmethod
+    def _result(kind: str, row: Tuple, error: str = None) -> Dict:
+        if kind == 'Transfer':
+            result = {'from_account': row[0], 'to_account': row[1], 'amount': row[2]}
+        else:
+            result = {'account_number': row[0], 'amount': row[1]}
+        result.update(success=error is None, error=error)
+        return result
+
+
+# --- benchmark ---
+
+OPENING_BALANCE = 100_000.00
+
+
+class Teller(threading.Thread):
+    """Posts random deposits, withdrawals and transfers until stop is set"""
+
+    def __init__(self, accounts: List[str], stop: threading.Event, seed: int,
+                 deposit, withdraw, transfer):
+        super().__init__(daemon=True)
+        self.accounts = accounts
+        self.stop = stop
+        self.rng = random.Random(seed)
+        self.calls = (deposit, withdraw, transfer)
+        self.samples: List[float] = []
+        self.net: Dict[str, int] = {}
+
+    def run(self):
+        deposit, withdraw, transfer = self.calls
+        while not self.stop.is_set():
+            account, other = self.rng.sample(self.accounts, 2)
+            amount = self.rng.randint(1, 500)
+            choice = self.rng.random()
+            started = time.perf_counter()
+            if choice < 0.4:
+                if deposit(account, amount):
+                    self.net[account] = self.net.get(account, 0) + amount
+            elif choice < 0.8:
+                if withdraw(account, amount):
+                    self.net[account] = self.net.get(account, 0) - amount
+            elif transfer(account, other, amount):
+                self.net[account] = self.net.get(account, 0) - amount
+                self.net[other] = self.net.get(other, 0) + amount
+            self.samples.append(time.perf_counter() - started)
+
+
+def run_tellers(accounts: List[str], writers: int, seconds: float, deposit, withdraw,
+                transfer) -> Tuple[List[Teller], float]:
+    stop = threading.Event()
+    tellers = [Teller(accounts, stop, seed, deposit, withdraw, transfer)
+               for seed in range(writers)]
+    started = time.perf_counter()
+    for teller in tellers:
+        teller.start()
+    stop.wait(seconds)
+    stop.set()
+    for teller in tellers:
+        teller.join()
+    return tellers, time.perf_counter() - started
+
+
+def report(label: str, tellers: List[Teller], elapsed: float) -> float:
+    samples = [sample for teller in tellers for sample in teller.samples]
+    stats = summarize(samples)
+    rate = len(samples) / elapsed
+    print(f"{label:<14} {len(samples):>8,} postings  {rate:>8,.0f} ops/sec  "
+          f"p50 {stats['p50_ms']:7.2f} ms  p95 {stats['p95_ms']:7.2f} ms  "
+          f"p99 {stats['p99_ms']:7.2f} ms")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Direct postings vs group commit")
+    parser.add_argument('--writers', type=int, default=64)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--accounts', type=int, default=200)
+    parser.add_argument('--max-delay-ms', type=float, default=2.0)
+    parser.add_argument('--max-batch', type=int, default=256)
+    args = parser.parse_args()
+    # Benchmark output only; the operations' own log lines are noise here
+    configure_logging(logging.CRITICAL)
+
+    directory = tempfile.mkdtemp(prefix='bms_group_commit_')
+    try:
+        db = BankDatabase(backend=SQLiteBackend(os.path.join(directory, 'group.db'),
+                                                pool_max=args.writers))
+        db.connect()
+        try:
+            accounts = [db.create_account(1001 + index % 5, 'Current', OPENING_BALANCE)
+                        for index in range(args.accounts)]
+            direct, direct_elapsed = run_tellers(accounts, args.writers, args.seconds,
+                                                 db.deposit_money, db.withdraw_money,
+                                                 db.transfer_money)
+            with GroupCommitQueue(db, args.max_delay_ms, args.max_batch) as postings:
+                grouped, grouped_elapsed = run_tellers(
+                    accounts, args.writers, args.seconds,
+                    lambda *a: postings.deposit(*a).result()['success'],
+                    lambda *a: postings.withdraw(*a).result()['success'],
+                    lambda *a: postings.transfer(*a).result()['success'])
+                stats = postings.stats()
+            balances = {account: db.get_account_details(account)['balance']
+                        for account in accounts}
+            aggregates = db.verify_aggregates()
+        finally:
+            db.disconnect()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print(f"{args.writers} writers over {args.accounts} accounts:")
+    direct_rate = report("direct", direct, direct_elapsed)
+    grouped_rate = report("group commit", grouped, grouped_elapsed)
+    print(f"{'':<14} {stats['groups']:,} groups, {stats['average_group_size']:.1f} "
+          f"requests per commit, {stats['fallbacks']} fallbacks "
+          f"({grouped_rate / direct_rate:.1f}x direct)")
+
+    drifted = 0
+    for account in accounts:
+        expected = OPENING_BALANCE + sum(teller.net.get(account, 0)
+                                         for teller in direct + grouped)
+        drifted += abs(balances[account] - expected) > 0.005
+    ok = drifted == 0 and aggregates is not None and aggregates['ok']
+    print(f"{'✅' if ok else '❌'} balances: {drifted} of {len(accounts)} accounts drifted, "
+          f"aggregates {'ok' if aggregates and aggregates['ok'] else 'DRIFTED'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
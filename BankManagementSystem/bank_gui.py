@@ -5,15 +5,37 @@ Ready to run - just update credentials!
 
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
-from datetime import datetime
+from datetime import datetime, timedelta
 import sys
 
 try:
+    from bank_dashboard import LiveBankStats
     from bank_database import BankDatabase
+    from bank_history_view import HistoryWindow
+    from bank_metrics import configure_logging
+    from bank_worker import DbWorker
 except ImportError:
     print("Error: Make sure bank_database.py is in the same folder!")
     sys.exit(1)
 
+# Signing in with this customer email opens the admin dashboard (compared case-insensitively)
+ADMIN_EMAIL = "SYS_ADMIN@BANK.COM"
+# Admin dashboard: a delta poll every few seconds, a full resync every few minutes
+ADMIN_REFRESH_MS = 5000
+ADMIN_RESYNC_SECONDS = 300
+
+# Transaction table: heading, get_transaction_page sort key, width
+HISTORY_COLUMNS = (
+    ('Date', 'date', 150),
+    ('Type', 'type', 120),
+    ('Amount', 'amount', 120),
+    ('Balance After', 'balance_after', 120),
+    ('Description', 'description', 250),
+)
+HISTORY_VISIBLE_ROWS = 15
+# Pages are fetched once scrolling has paused this long
+HISTORY_FETCH_DELAY_MS = 60
+
 
 class BankManagementApp:
     """Main GUI Application"""
@@ -28,7 +50,8 @@ class BankManagementApp:
         self.PASSWORD = "oracle@express"  
         self.DSN = "localhost:1521/XE"
         
-        self.db = BankDatabase(self.USERNAME, self.PASSWORD, self.DSN)
+        self.db = BankDatabase(self.USERNAME, self.PASSWORD, self.DSN, cache_size=256)
+        self.worker = DbWorker(self.root)
         self.current_customer = None
         self.current_accounts = []
         
@@ -38,10 +61,57 @@ class BankManagementApp:
             self.root.destroy()
             return
         
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
         self.show_login_screen()
     
+    def close(self):
+        """Stop background work and close the window"""
+        self.worker.shutdown()
+        self.db.disconnect()
+        self.root.destroy()
+    
+    def run_async(self, call, *args, on_done=None, **options):
+        """Run a database call on the worker pool; on_done gets its result on the Tk thread"""
+        return self.worker.submit(call, *args, on_done=on_done,
+                                  on_error=self.show_db_error, **options)
+    
+    def show_db_error(self, error):
+        messagebox.showerror("Database Error", str(error))
+    
+    def show_loading(self, parent, text="⏳ Loading..."):
+        """Placeholder shown until a background call returns"""
+        label = tk.Label(parent, text=text, font=('Arial', 12, 'italic'),
+                        bg=parent.cget('bg'), fg='#7f8c8d')
+        label.pack(pady=20)
+        return label
+    
+    def load_account_choices(self, combobox, describe, button=None, then=None):
+        """Fill an account Combobox in the background, enabling button once loaded
+        
+        A refill keeps the selected account (matched by account number) if it is still listed.
+        """
+        selected = combobox.get().split()[0] if combobox.get() else None
+        combobox.set("⏳ Loading accounts...")
+        if button is not None:
+            button.configure(state='disabled')
+        
+        def fill(accounts):
+            self.current_accounts = accounts
+            options = [describe(acc) for acc in accounts]
+            combobox.configure(values=options)
+            kept = [option for option in options if option.split()[0] == selected]
+            combobox.set(kept[0] if kept else options[0] if options else '')
+            if button is not None:
+                button.configure(state='normal')
+            if then is not None and options:
+                then()
+        
+        self.run_async(self.db.get_customer_accounts, self.current_customer['customer_id'],
+                       on_done=fill)
+    
     def clear_window(self):
         """Clear all widgets from window"""
+        self.worker.cancel_stale()
         for widget in self.root.winfo_children():
             widget.destroy()
 
@@ -75,9 +145,9 @@ class BankManagementApp:
         self.password_entry.grid(row=2, column=1, pady=10)
         self.password_entry.insert(0, "hashed_password_123")  # Default for testing
 
-        login_btn = tk.Button(login_frame, text="LOGIN", font=('Arial', 12, 'bold'),
-                            bg='#27ae60', fg='white', width=15, command=self.login)
-        login_btn.grid(row=3, column=0, columnspan=2, pady=20)
+        self.login_btn = tk.Button(login_frame, text="LOGIN", font=('Arial', 12, 'bold'),
+                                  bg='#27ae60', fg='white', width=15, command=self.login)
+        self.login_btn.grid(row=3, column=0, columnspan=2, pady=20)
         
         self.password_entry.bind('<Return>', lambda e: self.login())
     
@@ -90,13 +160,23 @@ class BankManagementApp:
             messagebox.showwarning("Input Error", "Please enter email and password")
             return
         
-        customer = self.db.customer_login(email, password)
-        
+        if not self.run_async(self.db.customer_login, email, password,
+                              on_done=lambda customer: self.login_done(email, customer),
+                              key='login'):
+            return
+        self.login_btn.configure(state='disabled', text="Signing in...")
+    
+    def login_done(self, email, customer):
+        """Handle the login result; the admin account goes to the system-wide dashboard"""
         if customer:
             self.current_customer = customer
             messagebox.showinfo("Success", f"Welcome, {customer['full_name']}!")
-            self.show_dashboard()
+            if email.upper() == ADMIN_EMAIL:
+                self.show_admin_dashboard()
+            else:
+                self.show_dashboard()
         else:
+            self.login_btn.configure(state='normal', text="LOGIN")
             messagebox.showerror("Login Failed", "Invalid email or password")
     
     def show_dashboard(self):
@@ -139,6 +219,11 @@ class BankManagementApp:
         
         self.content_area = tk.Frame(content_frame, bg='#ecf0f1')
         self.content_area.pack(side='right', fill='both', expand=True)
+        # Screens share one grid cell; showing one raises it above the rest
+        self.content_area.grid_rowconfigure(0, weight=1)
+        self.content_area.grid_columnconfigure(0, weight=1)
+        self.screens = {}
+        self.current_screen = None
         
         self.show_account_summary()
     
@@ -148,136 +233,237 @@ class BankManagementApp:
         self.current_accounts = []
         self.show_login_screen()
     
-    def clear_content_area(self):
-        """Clear content area"""
-        for widget in self.content_area.winfo_children():
-            widget.destroy()
-
+    def show_screen(self, name, build, refresh):
+        """Raise a content screen, building it on first use; refresh() then updates it in place
+        
+        Screens stay alive between visits, so navigating costs a raise and a
+        data refresh rather than destroying and recreating every widget.
+        """
+        self.worker.cancel_stale()
+        screen = self.screens.get(name)
+        if screen is None:
+            screen = tk.Frame(self.content_area, bg='#ecf0f1')
+            screen.grid(row=0, column=0, sticky='nsew')
+            build(screen)
+            self.screens[name] = screen
+        screen.tkraise()
+        self.current_screen = name
+        refresh()
+    
+    @staticmethod
+    def set_text(label, text):
+        """Change a label's text only if it differs, so unchanged labels are not redrawn"""
+        text = str(text)
+        if label.cget('text') != text:
+            label.configure(text=text)
+    
+    @staticmethod
+    def sync_tree(tree, rows):
+        """Make tree show rows, a list of (iid, values), in order, touching only what changed"""
+        wanted = {iid for iid, _ in rows}
+        stale = [iid for iid in tree.get_children() if iid not in wanted]
+        if stale:
+            tree.delete(*stale)
+        for index, (iid, values) in enumerate(rows):
+            values = tuple(str(value) for value in values)
+            if not tree.exists(iid):
+                tree.insert('', index, iid=iid, values=values)
+                continue
+            if tuple(tree.item(iid, 'values')) != values:
+                tree.item(iid, values=values)
+            if tree.index(iid) != index:
+                tree.move(iid, '', index)
     
     def show_account_summary(self):
         """Display account summary"""
-        self.clear_content_area()
-        
-        tk.Label(self.content_area, text="Account Summary", font=('Arial', 20, 'bold'),
+        self.show_screen('summary', self.build_account_summary, self.refresh_account_summary)
+    
+    def build_account_summary(self, screen):
+        tk.Label(screen, text="Account Summary", font=('Arial', 20, 'bold'),
                 bg='#ecf0f1').pack(pady=20)
         
-        # Get summary data
-        summary = self.db.get_account_summary(self.current_customer['customer_id'])
-        accounts = self.db.get_customer_accounts(self.current_customer['customer_id'])
-        
-        # Summary cards
-        cards_frame = tk.Frame(self.content_area, bg='#ecf0f1')
+        # The cards and table are created when the first data arrives
+        self.summary_loading = self.show_loading(screen)
+        self.summary_cards = None
+        self.summary_tree = None
+    
+    def refresh_account_summary(self):
+        self.run_async(self.fetch_summary, self.current_customer['customer_id'],
+                       on_done=lambda data: self.render_account_summary(*data))
+    
+    def fetch_summary(self, customer_id):
+        """Summary and account list for the dashboard (runs on the worker pool)"""
+        return self.db.get_account_summary(customer_id), self.db.get_customer_accounts(customer_id)
+    
+    def render_account_summary(self, summary, accounts):
+        """Fill the account summary; later refreshes update the same widgets"""
+        self.current_accounts = accounts
+        if self.summary_cards is None:
+            self.summary_loading.destroy()
+            self.build_summary_widgets(self.screens['summary'])
+        
+        values = [
+            summary['total_accounts'],
+            f"₹{summary['total_balance']:,.2f}",
+            summary['total_transactions']
+        ]
+        for label, value in zip(self.summary_cards, values):
+            self.set_text(label, value)
+        
+        # Rows are keyed by account number, so a refresh only touches changed accounts
+        self.sync_tree(self.summary_tree, [(acc['account_number'], (
+            acc['account_number'],
+            acc['account_type'],
+            f"₹{acc['balance']:,.2f}",
+            acc['status']
+        )) for acc in accounts])
+    
+    def build_summary_widgets(self, screen):
+        """Summary cards and the accounts table; their values are set by render_account_summary"""
+        cards_frame = tk.Frame(screen, bg='#ecf0f1')
         cards_frame.pack(pady=20)
         
         cards = [
-            ("Total Accounts", summary['total_accounts'], '#3498db'),
-            ("Total Balance", f"₹{summary['total_balance']:,.2f}", '#27ae60'),
-            ("Total Transactions", summary['total_transactions'], '#e67e22')
+            ("Total Accounts", '#3498db'),
+            ("Total Balance", '#27ae60'),
+            ("Total Transactions", '#e67e22')
         ]
         
-        for title, value, color in cards:
+        self.summary_cards = []
+        for title, color in cards:
             card = tk.Frame(cards_frame, bg=color, width=200, height=120)
             card.pack(side='left', padx=15)
             card.pack_propagate(False)
             
             tk.Label(card, text=title, font=('Arial', 12), 
                     bg=color, fg='white').pack(pady=10)
-            tk.Label(card, text=str(value), font=('Arial', 18, 'bold'),
-                    bg=color, fg='white').pack(pady=10)
+            value = tk.Label(card, text="", font=('Arial', 18, 'bold'),
+                            bg=color, fg='white')
+            value.pack(pady=10)
+            self.summary_cards.append(value)
 
-        tk.Label(self.content_area, text="Your Accounts", font=('Arial', 16, 'bold'),
+        tk.Label(screen, text="Your Accounts", font=('Arial', 16, 'bold'),
                 bg='#ecf0f1').pack(pady=20)
         
-        tree_frame = tk.Frame(self.content_area, bg='#ecf0f1')
+        tree_frame = tk.Frame(screen, bg='#ecf0f1')
         tree_frame.pack(pady=10, padx=20, fill='both', expand=True)
         
         columns = ('Account Number', 'Type', 'Balance', 'Status')
-        tree = ttk.Treeview(tree_frame, columns=columns, show='headings', height=8)
+        self.summary_tree = ttk.Treeview(tree_frame, columns=columns, show='headings', height=8)
         
         for col in columns:
-            tree.heading(col, text=col)
-            tree.column(col, width=150)
-        
-        for acc in accounts:
-            tree.insert('', 'end', values=(
-                acc['account_number'],
-                acc['account_type'],
-                f"₹{acc['balance']:,.2f}",
-                acc['status']
-            ))
+            self.summary_tree.heading(col, text=col)
+            self.summary_tree.column(col, width=150)
         
-        tree.pack(side='left', fill='both', expand=True)
+        self.summary_tree.pack(side='left', fill='both', expand=True)
         
-        scrollbar = ttk.Scrollbar(tree_frame, orient='vertical', command=tree.yview)
+        scrollbar = ttk.Scrollbar(tree_frame, orient='vertical', command=self.summary_tree.yview)
         scrollbar.pack(side='right', fill='y')
-        tree.configure(yscrollcommand=scrollbar.set)
+        self.summary_tree.configure(yscrollcommand=scrollbar.set)
 
     
     def show_my_accounts(self):
         """Display detailed account information"""
-        self.clear_content_area()
-        
-        tk.Label(self.content_area, text="My Accounts", font=('Arial', 20, 'bold'),
+        self.show_screen('accounts', self.build_my_accounts, self.refresh_my_accounts)
+    
+    def build_my_accounts(self, screen):
+        tk.Label(screen, text="My Accounts", font=('Arial', 20, 'bold'),
                 bg='#ecf0f1').pack(pady=20)
         
-        accounts = self.db.get_customer_accounts(self.current_customer['customer_id'])
+        self.accounts_loading = self.show_loading(screen)
+        # account_number -> that account's card widgets, in display order
+        self.account_cards = {}
+    
+    def refresh_my_accounts(self):
+        self.run_async(self.db.get_customer_accounts, self.current_customer['customer_id'],
+                       on_done=self.render_my_accounts)
+    
+    def render_my_accounts(self, accounts):
+        """Update the account cards in place: new accounts get a card, vanished ones lose theirs"""
+        if self.accounts_loading is not None:
+            self.accounts_loading.destroy()
+            self.accounts_loading = None
+        self.current_accounts = accounts
+        
+        numbers = [acc['account_number'] for acc in accounts]
+        for number in [number for number in self.account_cards if number not in numbers]:
+            self.account_cards.pop(number)['frame'].destroy()
         
         for acc in accounts:
-            acc_frame = tk.Frame(self.content_area, bg='white', relief='raised', bd=2)
-            acc_frame.pack(pady=10, padx=30, fill='x')
+            card = self.account_cards.get(acc['account_number'])
+            if card is None:
+                card = self.create_account_card(self.screens['accounts'])
+                self.account_cards[acc['account_number']] = card
+            self.set_text(card['type'], acc['account_type'])
+            self.set_text(card['balance'], f"₹{acc['balance']:,.2f}")
+            for label, value in zip(card['values'], (acc['account_number'],
+                                                     f"{acc['interest_rate']}%",
+                                                     acc['created_date'],
+                                                     acc['status'])):
+                self.set_text(label, value)
+        
+        # Repack only if the order changed (new cards are packed at the end)
+        if list(self.account_cards) != numbers:
+            for number in numbers:
+                self.account_cards[number]['frame'].pack_forget()
+            for number in numbers:
+                self.account_cards[number]['frame'].pack(pady=10, padx=30, fill='x')
+            self.account_cards = {number: self.account_cards[number] for number in numbers}
+    
+    def create_account_card(self, screen):
+        """An empty account card; render_my_accounts fills in its labels"""
+        acc_frame = tk.Frame(screen, bg='white', relief='raised', bd=2)
+        acc_frame.pack(pady=10, padx=30, fill='x')
 
-            header = tk.Frame(acc_frame, bg='#3498db')
-            header.pack(fill='x')
-            
-            tk.Label(header, text=acc['account_type'], font=('Arial', 14, 'bold'),
-                    bg='#3498db', fg='white').pack(side='left', padx=20, pady=10)
-            
-            tk.Label(header, text=f"₹{acc['balance']:,.2f}", font=('Arial', 16, 'bold'),
-                    bg='#3498db', fg='white').pack(side='right', padx=20, pady=10)
+        header = tk.Frame(acc_frame, bg='#3498db')
+        header.pack(fill='x')
+        
+        account_type = tk.Label(header, text="", font=('Arial', 14, 'bold'),
+                                bg='#3498db', fg='white')
+        account_type.pack(side='left', padx=20, pady=10)
+        
+        balance = tk.Label(header, text="", font=('Arial', 16, 'bold'),
+                           bg='#3498db', fg='white')
+        balance.pack(side='right', padx=20, pady=10)
 
-            details = tk.Frame(acc_frame, bg='white')
-            details.pack(fill='x', padx=20, pady=15)
-            
-            info = [
-                ("Account Number:", acc['account_number']),
-                ("Interest Rate:", f"{acc['interest_rate']}%"),
-                ("Opened On:", acc['created_date']),
-                ("Status:", acc['status'])
-            ]
+        details = tk.Frame(acc_frame, bg='white')
+        details.pack(fill='x', padx=20, pady=15)
+        
+        labels = ["Account Number:", "Interest Rate:", "Opened On:", "Status:"]
+        
+        values = []
+        for i, label in enumerate(labels):
+            row = i // 2
+            col = i % 2
             
-            for i, (label, value) in enumerate(info):
-                row = i // 2
-                col = i % 2
-                
-                tk.Label(details, text=label, font=('Arial', 10, 'bold'),
-                        bg='white', fg='#7f8c8d').grid(row=row, column=col*2, sticky='w', padx=10, pady=5)
-                tk.Label(details, text=value, font=('Arial', 10),
-                        bg='white', fg='#2c3e50').grid(row=row, column=col*2+1, sticky='w', padx=10, pady=5)
+            tk.Label(details, text=label, font=('Arial', 10, 'bold'),
+                    bg='white', fg='#7f8c8d').grid(row=row, column=col*2, sticky='w', padx=10, pady=5)
+            value = tk.Label(details, text="", font=('Arial', 10),
+                            bg='white', fg='#2c3e50')
+            value.grid(row=row, column=col*2+1, sticky='w', padx=10, pady=5)
+            values.append(value)
+        
+        return {'frame': acc_frame, 'type': account_type, 'balance': balance, 'values': values}
 
     
     def show_deposit_screen(self):
         """Display deposit form"""
-        self.clear_content_area()
-        
-        tk.Label(self.content_area, text="Deposit Money", font=('Arial', 20, 'bold'),
+        self.show_screen('deposit', self.build_deposit_screen, self.refresh_deposit_screen)
+    
+    def build_deposit_screen(self, screen):
+        tk.Label(screen, text="Deposit Money", font=('Arial', 20, 'bold'),
                 bg='#ecf0f1').pack(pady=30)
         
-        form_frame = tk.Frame(self.content_area, bg='white', padx=40, pady=30)
+        form_frame = tk.Frame(screen, bg='white', padx=40, pady=30)
         form_frame.pack()
         
         tk.Label(form_frame, text="Select Account:", font=('Arial', 12, 'bold'),
                 bg='white').grid(row=0, column=0, sticky='w', pady=10)
         
-        accounts = self.db.get_customer_accounts(self.current_customer['customer_id'])
-        account_options = [f"{acc['account_number']} ({acc['account_type']})" 
-                          for acc in accounts]
-        
         self.deposit_account_var = tk.StringVar()
-        account_menu = ttk.Combobox(form_frame, textvariable=self.deposit_account_var,
-                                   values=account_options, font=('Arial', 11), width=35, state='readonly')
-        account_menu.grid(row=0, column=1, pady=10, padx=10)
-        if account_options:
-            account_menu.current(0)
+        self.deposit_menu = ttk.Combobox(form_frame, textvariable=self.deposit_account_var,
+                                        font=('Arial', 11), width=35, state='readonly')
+        self.deposit_menu.grid(row=0, column=1, pady=10, padx=10)
         
         tk.Label(form_frame, text="Amount:", font=('Arial', 12, 'bold'),
                 bg='white').grid(row=1, column=0, sticky='w', pady=10)
@@ -290,9 +476,17 @@ class BankManagementApp:
         self.deposit_desc.grid(row=2, column=1, pady=10, padx=10)
         self.deposit_desc.insert(0, "Cash Deposit")
 
-        tk.Button(form_frame, text="DEPOSIT", font=('Arial', 12, 'bold'),
-                 bg='#27ae60', fg='white', width=20,
-                 command=self.process_deposit).grid(row=3, column=0, columnspan=2, pady=30)
+        self.deposit_button = tk.Button(form_frame, text="DEPOSIT", font=('Arial', 12, 'bold'),
+                                       bg='#27ae60', fg='white', width=20,
+                                       command=self.process_deposit)
+        self.deposit_button.grid(row=3, column=0, columnspan=2, pady=30)
+    
+    def refresh_deposit_screen(self):
+        # A fresh visit starts with an empty amount, never one left from earlier
+        self.deposit_amount.delete(0, 'end')
+        self.load_account_choices(self.deposit_menu,
+                                  lambda acc: f"{acc['account_number']} ({acc['account_type']})",
+                                  button=self.deposit_button)
     
     def process_deposit(self):
         """Process deposit transaction"""
@@ -314,37 +508,46 @@ class BankManagementApp:
             messagebox.showwarning("Invalid Amount", "Please enter a valid number")
             return
         
-        if self.db.deposit_money(account_number, amount, description):
+        generation = self.worker.generation
+        if not self.run_async(self.db.deposit_money, account_number, amount, description,
+                              on_done=lambda ok: self.deposit_done(ok, amount, generation),
+                              key='deposit', screen_bound=False):
+            return
+        self.deposit_button.configure(state='disabled', text="PROCESSING...")
+    
+    def deposit_done(self, ok, amount, generation):
+        """Report a deposit; the amount is cleared and the summary shown only if the form is on screen"""
+        on_screen = generation == self.worker.generation
+        # The form outlives the visit, so its button is reset even when off screen
+        if self.deposit_button.winfo_exists():
+            self.deposit_button.configure(state='normal', text="DEPOSIT")
+        if ok:
             messagebox.showinfo("Success", f"₹{amount:,.2f} deposited successfully!")
-            self.deposit_amount.delete(0, 'end')
-            self.show_account_summary()
+            if on_screen:
+                self.deposit_amount.delete(0, 'end')
+                self.show_account_summary()
         else:
             messagebox.showerror("Error", "Deposit failed!")
     
     
     def show_withdraw_screen(self):
         """Display withdrawal form"""
-        self.clear_content_area()
-        
-        tk.Label(self.content_area, text="Withdraw Money", font=('Arial', 20, 'bold'),
+        self.show_screen('withdraw', self.build_withdraw_screen, self.refresh_withdraw_screen)
+    
+    def build_withdraw_screen(self, screen):
+        tk.Label(screen, text="Withdraw Money", font=('Arial', 20, 'bold'),
                 bg='#ecf0f1').pack(pady=30)
         
-        form_frame = tk.Frame(self.content_area, bg='white', padx=40, pady=30)
+        form_frame = tk.Frame(screen, bg='white', padx=40, pady=30)
         form_frame.pack()
 
         tk.Label(form_frame, text="Select Account:", font=('Arial', 12, 'bold'),
                 bg='white').grid(row=0, column=0, sticky='w', pady=10)
         
-        accounts = self.db.get_customer_accounts(self.current_customer['customer_id'])
-        account_options = [f"{acc['account_number']} ({acc['account_type']}) - ₹{acc['balance']:,.2f}" 
-                          for acc in accounts]
-        
         self.withdraw_account_var = tk.StringVar()
-        account_menu = ttk.Combobox(form_frame, textvariable=self.withdraw_account_var,
-                                   values=account_options, font=('Arial', 11), width=45, state='readonly')
-        account_menu.grid(row=0, column=1, pady=10, padx=10)
-        if account_options:
-            account_menu.current(0)
+        self.withdraw_menu = ttk.Combobox(form_frame, textvariable=self.withdraw_account_var,
+                                         font=('Arial', 11), width=45, state='readonly')
+        self.withdraw_menu.grid(row=0, column=1, pady=10, padx=10)
 
         tk.Label(form_frame, text="Amount:", font=('Arial', 12, 'bold'),
                 bg='white').grid(row=1, column=0, sticky='w', pady=10)
@@ -357,9 +560,17 @@ class BankManagementApp:
         self.withdraw_desc.grid(row=2, column=1, pady=10, padx=10)
         self.withdraw_desc.insert(0, "Cash Withdrawal")
 
-        tk.Button(form_frame, text="WITHDRAW", font=('Arial', 12, 'bold'),
-                 bg='#e74c3c', fg='white', width=20,
-                 command=self.process_withdrawal).grid(row=3, column=0, columnspan=2, pady=30)
+        self.withdraw_button = tk.Button(form_frame, text="WITHDRAW", font=('Arial', 12, 'bold'),
+                                        bg='#e74c3c', fg='white', width=20,
+                                        command=self.process_withdrawal)
+        self.withdraw_button.grid(row=3, column=0, columnspan=2, pady=30)
+    
+    def refresh_withdraw_screen(self):
+        self.withdraw_amount.delete(0, 'end')
+        self.load_account_choices(
+            self.withdraw_menu,
+            lambda acc: f"{acc['account_number']} ({acc['account_type']}) - ₹{acc['balance']:,.2f}",
+            button=self.withdraw_button)
     
     def process_withdrawal(self):
         """Process withdrawal transaction"""
@@ -381,42 +592,50 @@ class BankManagementApp:
             messagebox.showwarning("Invalid Amount", "Please enter a valid number")
             return
         
-        if self.db.withdraw_money(account_number, amount, description):
+        generation = self.worker.generation
+        if not self.run_async(self.db.withdraw_money, account_number, amount, description,
+                              on_done=lambda ok: self.withdrawal_done(ok, amount, generation),
+                              key='withdraw', screen_bound=False):
+            return
+        self.withdraw_button.configure(state='disabled', text="PROCESSING...")
+    
+    def withdrawal_done(self, ok, amount, generation):
+        """Report a withdrawal; the amount is cleared and the summary shown only if the form is on screen"""
+        on_screen = generation == self.worker.generation
+        if self.withdraw_button.winfo_exists():
+            self.withdraw_button.configure(state='normal', text="WITHDRAW")
+        if ok:
             messagebox.showinfo("Success", f"₹{amount:,.2f} withdrawn successfully!")
-            self.withdraw_amount.delete(0, 'end')
-            self.show_account_summary()
+            if on_screen:
+                self.withdraw_amount.delete(0, 'end')
+                self.show_account_summary()
         else:
             messagebox.showerror("Error", "Withdrawal failed! Check balance.")
         
     def show_transfer_screen(self):
         """Display transfer form - DEMONSTRATES ACID PROPERTIES"""
-        self.clear_content_area()
-        
-        tk.Label(self.content_area, text="Transfer Money", font=('Arial', 20, 'bold'),
+        self.show_screen('transfer', self.build_transfer_screen, self.refresh_transfer_screen)
+    
+    def build_transfer_screen(self, screen):
+        tk.Label(screen, text="Transfer Money", font=('Arial', 20, 'bold'),
                 bg='#ecf0f1').pack(pady=30)
 
-        info_frame = tk.Frame(self.content_area, bg='#f39c12', padx=15, pady=10)
+        info_frame = tk.Frame(screen, bg='#f39c12', padx=15, pady=10)
         info_frame.pack(fill='x', padx=50, pady=10)
         
         tk.Label(info_frame, text="🔒 ACID Properties: Both accounts updated atomically or transaction fails completely",
                 font=('Arial', 10, 'bold'), bg='#f39c12', fg='white').pack()
         
-        form_frame = tk.Frame(self.content_area, bg='white', padx=40, pady=30)
+        form_frame = tk.Frame(screen, bg='white', padx=40, pady=30)
         form_frame.pack()
 
         tk.Label(form_frame, text="From Account:", font=('Arial', 12, 'bold'),
                 bg='white').grid(row=0, column=0, sticky='w', pady=10)
         
-        accounts = self.db.get_customer_accounts(self.current_customer['customer_id'])
-        account_options = [f"{acc['account_number']} - ₹{acc['balance']:,.2f}" 
-                          for acc in accounts]
-        
         self.transfer_from_var = tk.StringVar()
-        from_menu = ttk.Combobox(form_frame, textvariable=self.transfer_from_var,
-                                values=account_options, font=('Arial', 11), width=40, state='readonly')
-        from_menu.grid(row=0, column=1, pady=10, padx=10)
-        if account_options:
-            from_menu.current(0)
+        self.transfer_menu = ttk.Combobox(form_frame, textvariable=self.transfer_from_var,
+                                         font=('Arial', 11), width=40, state='readonly')
+        self.transfer_menu.grid(row=0, column=1, pady=10, padx=10)
 
         tk.Label(form_frame, text="To Account Number:", font=('Arial', 12, 'bold'),
                 bg='white').grid(row=1, column=0, sticky='w', pady=10)
@@ -428,11 +647,19 @@ class BankManagementApp:
         self.transfer_amount = tk.Entry(form_frame, font=('Arial', 12), width=40)
         self.transfer_amount.grid(row=2, column=1, pady=10, padx=10)
 
-        tk.Button(form_frame, text="TRANSFER MONEY", font=('Arial', 12, 'bold'),
-                 bg='#9b59b6', fg='white', width=20,
-                 command=self.process_transfer).grid(row=3, column=0, columnspan=2, pady=30)
-    def create_stat_card(self, parent_frame, title, value, unit="", color='#3498db'):
-        """Creates a stylized card to display a single statistic."""
+        self.transfer_button = tk.Button(form_frame, text="TRANSFER MONEY", font=('Arial', 12, 'bold'),
+                                        bg='#9b59b6', fg='white', width=20,
+                                        command=self.process_transfer)
+        self.transfer_button.grid(row=3, column=0, columnspan=2, pady=30)
+    
+    def refresh_transfer_screen(self):
+        self.transfer_amount.delete(0, 'end')
+        self.load_account_choices(self.transfer_menu,
+                                  lambda acc: f"{acc['account_number']} - ₹{acc['balance']:,.2f}",
+                                  button=self.transfer_button)
+    
+    def create_stat_card(self, parent_frame, title, value, unit="", color='#3498db', detail=None):
+        """Creates a stylized card to display a single statistic; returns its labels for updates."""
         card_frame = tk.Frame(parent_frame, bg=color, bd=0, relief='flat', padx=20, pady=15)
         card_frame.pack(side='left', padx=10, pady=10, fill='x', expand=True)
 
@@ -440,17 +667,26 @@ class BankManagementApp:
         tk.Label(card_frame, text=title, font=('Arial', 14), bg=color, fg='white').pack(anchor='center')
         
         # Value Label
+        value_label = tk.Label(card_frame, text=self.format_stat(value, unit),
+                               font=('Arial', 24, 'bold'), bg=color, fg='white')
+        value_label.pack(anchor='center')
+        
+        card = {'value': value_label, 'detail': None}
+        if detail is not None:
+            card['detail'] = tk.Label(card_frame, text=detail, font=('Arial', 11), bg=color, fg='white')
+            card['detail'].pack(anchor='center')
+        return card
+    
+    @staticmethod
+    def format_stat(value, unit=""):
         if unit == '₹':
             # Format currency with commas and two decimal places
-            value_text = f"{unit}{value:,.2f}"
-        else:
-            # Format integer with commas
-            value_text = f"{value:,}"
-            
-        tk.Label(card_frame, text=value_text, font=('Arial', 24, 'bold'), bg=color, fg='white').pack(anchor='center')
+            return f"{unit}{value:,.2f}"
+        # Format integer with commas
+        return f"{value:,}"
         
     def show_admin_dashboard(self):
-        """Display the main system dashboard for admin view with aggregate statistics."""
+        """Display the system-wide dashboard; it keeps refreshing until the screen changes."""
         self.clear_window()
         
         main_frame = tk.Frame(self.root, bg='#2c3e50', padx=20, pady=20)
@@ -460,126 +696,84 @@ class BankManagementApp:
         tk.Label(main_frame, text="System-Wide Dashboard", font=('Arial', 24, 'bold'), 
                  bg='#2c3e50', fg='white').pack(pady=(0, 20))
         
-        # Fetch Bank-Wide Statistics
-        stats = self.db.get_bank_stats()
-        
         stats_frame = tk.Frame(main_frame, bg='#2c3e50')
         stats_frame.pack(fill='x', pady=20)
-
-        if stats:
-            # Display Statistics in Cards
-            self.create_stat_card(
-                stats_frame, 
-                "Total Active Accounts", 
-                stats.get('total_active_accounts', 0), 
-                color='#2ecc71' # Green
-            )
-            self.create_stat_card(
-                stats_frame, 
-                "Total Balance", 
-                stats.get('total_balance', 0), 
-                unit='₹',
-                color='#3498db' # Blue
-            )
-            self.create_stat_card(
-                stats_frame, 
-                "Total Transactions", 
-                stats.get('total_transactions', 0), 
-                color='#f39c12' # Yellow/Orange
-            )
-        else:
-            tk.Label(main_frame, text="Could not load bank statistics. Check database connection.", 
-                     font=('Arial', 14), bg='#2c3e50', fg='red').pack(pady=20)
+        type_frame = tk.Frame(main_frame, bg='#2c3e50')
+        type_frame.pack(fill='x')
+        status = tk.Label(main_frame, text="", font=('Arial', 10), bg='#2c3e50', fg='#bdc3c7')
+        status.pack(pady=10)
+        
+        panel = {
+            'stats': LiveBankStats(self.db, resync_seconds=ADMIN_RESYNC_SECONDS),
+            'loading': self.show_loading(stats_frame, "⏳ Loading bank statistics..."),
+            'stats_frame': stats_frame,
+            'type_frame': type_frame,
+            'status': status,
+            'cards': {},
+            'type_cards': {}
+        }
 
         # Log Out Button
-        tk.Button(main_frame, text="Log Out", command=self.show_login_screen,
+        tk.Button(main_frame, text="Log Out", command=self.logout,
                   bg='#e74c3c', fg='white', font=('Arial', 12, 'bold')).pack(anchor='se', pady=10)
-    def create_stat_card(self, parent_frame, title, value, unit="", color='#3498db'):
-        """Creates a stylized card to display a single statistic."""
-        card_frame = tk.Frame(parent_frame, bg=color, bd=0, relief='flat', padx=20, pady=15)
-        card_frame.pack(side='left', padx=10, pady=10, fill='x', expand=True)
-
-        # Title Label
-        tk.Label(card_frame, text=title, font=('Arial', 14), bg=color, fg='white').pack(anchor='center')
         
-        # Value Label
-        if unit == '₹':
-            # Format currency with commas and two decimal places
-            value_text = f"{unit}{value:,.2f}"
-        else:
-            # Format integer with commas
-            value_text = f"{value:,}"
-            
-        tk.Label(card_frame, text=value_text, font=('Arial', 24, 'bold'), bg=color, fg='white').pack(anchor='center')
-        
-    def show_admin_dashboard(self):
-        """Display the main system dashboard for admin view with aggregate statistics."""
-        self.clear_window()
-        
-        main_frame = tk.Frame(self.root, bg='#2c3e50', padx=20, pady=20)
-        main_frame.pack(expand=True, fill='both')
-
-        # Title
-        tk.Label(main_frame, text="System-Wide Dashboard", font=('Arial', 24, 'bold'), 
-                 bg='#2c3e50', fg='white').pack(pady=(0, 20))
-        
-        # Fetch Bank-Wide Statistics
-        stats = self.db.get_bank_stats()
-        
-        stats_frame = tk.Frame(main_frame, bg='#2c3e50')
-        stats_frame.pack(fill='x', pady=20)
-
-        if stats:
-            # Display Statistics in Cards
-            self.create_stat_card(
-                stats_frame, 
-                "Total Active Accounts", 
-                stats.get('total_active_accounts', 0), 
-                color='#2ecc71' # Green
-            )
-            self.create_stat_card(
-                stats_frame, 
-                "Total Balance", 
-                stats.get('total_balance', 0), 
-                unit='₹',
-                color='#3498db' # Blue
-            )
-            self.create_stat_card(
-                stats_frame, 
-                "Total Transactions", 
-                stats.get('total_transactions', 0), 
-                color='#f39c12' # Yellow/Orange
-            )
-        else:
-            tk.Label(main_frame, text="Could not load bank statistics. Check database connection.", 
-                     font=('Arial', 14), bg='#2c3e50', fg='red').pack(pady=20)
-
-        # Log Out Button
-        tk.Button(main_frame, text="Log Out", command=self.show_login_screen,
-                  bg='#e74c3c', fg='white', font=('Arial', 12, 'bold')).pack(anchor='se', pady=10)
-    def customer_login_attempt(self):
-        email = self.email_entry.get()
-        password = self.password_entry.get()
-
-        customer_info = self.db.customer_login(email, password)
+        self.refresh_admin_stats(self.worker.generation, panel)
+    
+    def refresh_admin_stats(self, generation, panel):
+        """Fetch the next delta (or a due full resync) in the background, then re-arm the timer"""
+        if generation != self.worker.generation:
+            # The dashboard has been left; let the timer lapse
+            return
+        # Keyed: a slow refresh is never overlapped by the next tick
+        self.run_async(panel['stats'].refresh, key='admin_stats',
+                       on_done=lambda view: self.render_admin_stats(panel, view))
+        self.root.after(ADMIN_REFRESH_MS, self.refresh_admin_stats, generation, panel)
+    
+    def render_admin_stats(self, panel, view):
+        """Create the admin stat cards on the first refresh, then update their values in place"""
+        if panel['loading'] is not None:
+            panel['loading'].destroy()
+            panel['loading'] = None
+        if view is None:
+            panel['status'].configure(text="Could not load bank statistics. Check database connection.",
+                                      fg='red')
+            return
         
-        if customer_info:
-            self.current_customer = customer_info
-            
-            # --- START NEW LOGIC FOR ADMIN DASHBOARD ---
-            # Assuming you use a specific email (or a flag in the DB) to identify the Admin
-            if email.upper() == "SYS_ADMIN@BANK.COM": # Example Admin Email
-                self.show_admin_dashboard()
-            # --- END NEW LOGIC FOR ADMIN DASHBOARD ---
-            
+        totals = view['totals']
+        cards = [
+            ("Total Active Accounts", totals['total_active_accounts'], "", '#2ecc71'),  # Green
+            ("Total Balance", totals['total_balance'], '₹', '#3498db'),  # Blue
+            ("Total Transactions", totals['total_transactions'], "", '#f39c12'),  # Yellow/Orange
+            ("Transactions / min", round(view['transactions_per_minute']), "", '#9b59b6')  # Purple
+        ]
+        for title, value, unit, color in cards:
+            if title in panel['cards']:
+                panel['cards'][title]['value'].configure(text=self.format_stat(value, unit))
             else:
-                self.current_accounts = self.db.get_customer_accounts(self.current_customer['customer_id'])
-                self.show_customer_dashboard() # Existing customer dashboard
-        else:
-            messagebox.showerror("Login Failed", "Invalid email or password, or account is inactive.")
-                
+                panel['cards'][title] = self.create_stat_card(panel['stats_frame'], title, value,
+                                                              unit=unit, color=color)
+        
+        # One card per account type, as in the account_statistics view
+        for account_type, metrics in view['by_type'].items():
+            detail = (f"{metrics['total_accounts']:,} accounts · "
+                      f"avg ₹{metrics['average_balance']:,.2f}")
+            card = panel['type_cards'].get(account_type)
+            if card is None:
+                panel['type_cards'][account_type] = self.create_stat_card(
+                    panel['type_frame'], account_type, metrics['total_balance'], unit='₹',
+                    color='#34495e', detail=detail)
+            else:
+                card['value'].configure(text=self.format_stat(metrics['total_balance'], '₹'))
+                card['detail'].configure(text=detail)
+        
+        panel['status'].configure(
+            text=f"Updated {datetime.now():%H:%M:%S} · "
+                 f"full resync {int(view['seconds_since_resync'])}s ago", fg='#bdc3c7')
+    
     def process_transfer(self):
         """Process money transfer - DEMONSTRATES ACID!"""
+        if self.worker.busy('transfer'):
+            return
         from_account_str = self.transfer_from_var.get()
         if not from_account_str:
             messagebox.showwarning("Error", "Please select source account")
@@ -608,7 +802,19 @@ class BankManagementApp:
         if not confirm:
             return
         
-        if self.db.transfer_money(from_account, to_account, amount):
+        generation = self.worker.generation
+        if not self.run_async(self.db.transfer_money, from_account, to_account, amount,
+                              on_done=lambda ok: self.transfer_done(ok, amount, generation),
+                              key='transfer', screen_bound=False):
+            return
+        self.transfer_button.configure(state='disabled', text="TRANSFERRING...")
+    
+    def transfer_done(self, ok, amount, generation):
+        """Report a transfer; the fields are cleared and the summary shown only if the form is on screen"""
+        on_screen = generation == self.worker.generation
+        if self.transfer_button.winfo_exists():
+            self.transfer_button.configure(state='normal', text="TRANSFER MONEY")
+        if ok:
             messagebox.showinfo("Success", 
                               f"₹{amount:,.2f} transferred successfully!\n\n" +
                               "ACID Properties Demonstrated:\n" +
@@ -616,86 +822,214 @@ class BankManagementApp:
                               "✓ Consistency: Total money remains same\n" +
                               "✓ Isolation: No interference from other transactions\n" +
                               "✓ Durability: Changes are permanent")
-            self.transfer_amount.delete(0, 'end')
-            self.transfer_to.delete(0, 'end')
-            self.show_account_summary()
+            if on_screen:
+                self.transfer_amount.delete(0, 'end')
+                self.transfer_to.delete(0, 'end')
+                self.show_account_summary()
         else:
             messagebox.showerror("Transfer Failed", 
                                "Transaction failed!\nBoth accounts remain unchanged (Rollback)")
 
     
     def show_transactions_screen(self):
-        """Display transaction history"""
-        self.clear_content_area()
-        
-        tk.Label(self.content_area, text="Transaction History", font=('Arial', 20, 'bold'),
+        """Display transaction history (a virtualized table: only the visible lines exist)"""
+        self.show_screen('transactions', self.build_transactions_screen,
+                         self.refresh_transactions_screen)
+    
+    def build_transactions_screen(self, screen):
+        tk.Label(screen, text="Transaction History", font=('Arial', 20, 'bold'),
                 bg='#ecf0f1').pack(pady=20)
         
-        select_frame = tk.Frame(self.content_area, bg='#ecf0f1')
+        select_frame = tk.Frame(screen, bg='#ecf0f1')
         select_frame.pack(pady=10)
         
         tk.Label(select_frame, text="Select Account:", font=('Arial', 12, 'bold'),
                 bg='#ecf0f1').pack(side='left', padx=10)
         
-        accounts = self.db.get_customer_accounts(self.current_customer['customer_id'])
-        account_options = [f"{acc['account_number']} ({acc['account_type']})" 
-                          for acc in accounts]
-        
         self.trans_account_var = tk.StringVar()
-        account_menu = ttk.Combobox(select_frame, textvariable=self.trans_account_var,
-                                   values=account_options, font=('Arial', 11), width=35, state='readonly')
-        account_menu.pack(side='left', padx=10)
-        if account_options:
-            account_menu.current(0)
-        
-        tk.Button(select_frame, text="Load Transactions", font=('Arial', 10, 'bold'),
-                 bg='#3498db', fg='white', command=self.load_transactions).pack(side='left', padx=10)
-        
-        tree_frame = tk.Frame(self.content_area, bg='white')
+        self.trans_menu = ttk.Combobox(select_frame, textvariable=self.trans_account_var,
+                                      font=('Arial', 11), width=35, state='readonly')
+        self.trans_menu.pack(side='left', padx=10)
+        
+        self.trans_load_button = tk.Button(select_frame, text="Load Transactions",
+                                           font=('Arial', 10, 'bold'), bg='#3498db', fg='white',
+                                           command=self.load_transactions)
+        self.trans_load_button.pack(side='left', padx=10)
+        
+        filter_frame = tk.Frame(screen, bg='#ecf0f1')
+        filter_frame.pack()
+        
+        tk.Label(filter_frame, text="From (YYYY-MM-DD):", font=('Arial', 11),
+                bg='#ecf0f1').pack(side='left', padx=5)
+        self.trans_from = tk.Entry(filter_frame, font=('Arial', 11), width=12)
+        self.trans_from.pack(side='left', padx=5)
+        tk.Label(filter_frame, text="To:", font=('Arial', 11),
+                bg='#ecf0f1').pack(side='left', padx=5)
+        self.trans_to = tk.Entry(filter_frame, font=('Arial', 11), width=12)
+        self.trans_to.pack(side='left', padx=5)
+        for entry in (self.trans_from, self.trans_to):
+            entry.bind('<Return>', lambda e: self.load_transactions())
+        
+        tree_frame = tk.Frame(screen, bg='white')
         tree_frame.pack(pady=20, padx=30, fill='both', expand=True)
         
-        columns = ('Date', 'Type', 'Amount', 'Balance After', 'Description')
-        self.trans_tree = ttk.Treeview(tree_frame, columns=columns, show='headings', height=15)
+        columns = [heading for heading, _, _ in HISTORY_COLUMNS]
+        self.trans_tree = ttk.Treeview(tree_frame, columns=columns, show='headings',
+                                       height=HISTORY_VISIBLE_ROWS)
         
-        widths = [150, 120, 120, 120, 250]
-        for col, width in zip(columns, widths):
-            self.trans_tree.heading(col, text=col)
-            self.trans_tree.column(col, width=width)
+        for heading, sort, width in HISTORY_COLUMNS:
+            self.trans_tree.heading(heading, text=heading,
+                                    command=lambda key=sort: self.sort_transactions(key))
+            self.trans_tree.column(heading, width=width)
+        self.trans_tree.heading('Date', text="Date ▼")
+        
+        # One item per visible line, reused for every row scrolled past
+        for line in range(HISTORY_VISIBLE_ROWS):
+            self.trans_tree.insert('', 'end', iid=f'line{line}', values=('',) * len(columns))
         
         self.trans_tree.pack(side='left', fill='both', expand=True)
         
-        scrollbar = ttk.Scrollbar(tree_frame, orient='vertical', command=self.trans_tree.yview)
-        scrollbar.pack(side='right', fill='y')
-        self.trans_tree.configure(yscrollcommand=scrollbar.set)
-
-        if account_options:
-            self.load_transactions()
+        self.trans_scrollbar = ttk.Scrollbar(tree_frame, orient='vertical',
+                                             command=self.scroll_transactions)
+        self.trans_scrollbar.pack(side='right', fill='y')
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.trans_tree.bind(sequence, self.wheel_transactions)
+        self.trans_tree.bind('<Prior>', lambda e: self.scroll_transactions('scroll', -1, 'pages'))
+        self.trans_tree.bind('<Next>', lambda e: self.scroll_transactions('scroll', 1, 'pages'))
+        
+        self.trans_status = tk.Label(screen, text="", font=('Arial', 10),
+                                     bg='#ecf0f1', fg='#7f8c8d')
+        self.trans_status.pack(pady=(0, 10))
+        
+        self.trans_history = None
+        self.trans_sort = ('date', True)
+        self.trans_fetch_timer = None
+    
+    def refresh_transactions_screen(self):
+        # Reopens the selected account's history (same sort and dates) once the list is in
+        self.load_account_choices(self.trans_menu,
+                                  lambda acc: f"{acc['account_number']} ({acc['account_type']})",
+                                  button=self.trans_load_button, then=self.load_transactions)
     
     def load_transactions(self):
-        """Load transactions for selected account"""
+        """Open the history of the selected account in the current sort order and date range"""
         account_str = self.trans_account_var.get()
         if not account_str:
             return
         
-        account_number = account_str.split()[0]
-
-        for item in self.trans_tree.get_children():
-            self.trans_tree.delete(item)
-
-        transactions = self.db.get_transaction_history(account_number, limit=100)
+        try:
+            start_date = self.parse_filter_date(self.trans_from.get())
+            end_date = self.parse_filter_date(self.trans_to.get())
+        except ValueError:
+            messagebox.showwarning("Invalid Date", "Please enter dates as YYYY-MM-DD")
+            return
+        if end_date is not None:
+            # The To date is inclusive
+            end_date += timedelta(days=1)
         
-        for trans in transactions:
-            self.trans_tree.insert('', 'end', values=(
-                trans['date'],
-                trans['type'],
-                f"₹{trans['amount']:,.2f}",
-                f"₹{trans['balance_after']:,.2f}",
-                trans['description']
-            ))
-
+        account_number = account_str.split()[0]
+        sort, descending = self.trans_sort
+        window = HistoryWindow(self.db, account_number, sort, descending, start_date, end_date,
+                               visible=HISTORY_VISIBLE_ROWS)
+        # Pages still in flight for the previous view are ignored on arrival
+        self.trans_history = window
+        self.trans_status.configure(text="⏳ Loading...")
+        self.render_transactions()
+        self.run_async(window.first_page,
+                       on_done=lambda result: self.transactions_opened(window, result))
+    
+    @staticmethod
+    def parse_filter_date(text):
+        text = text.strip()
+        return datetime.strptime(text, '%Y-%m-%d') if text else None
+    
+    def transactions_opened(self, window, result):
+        if window is not self.trans_history:
+            return
+        if not window.opened(result):
+            self.trans_status.configure(text="Could not load transactions. Check database connection.")
+            return
+        self.scroll_transactions_to(0)
+    
+    def sort_transactions(self, sort):
+        """Heading click: re-sort in the database, toggling the direction on the same column"""
+        current, descending = self.trans_sort
+        self.trans_sort = (sort, not descending) if sort == current else (sort, sort == 'date')
+        for heading, key, _ in HISTORY_COLUMNS:
+            arrow = (" ▼" if self.trans_sort[1] else " ▲") if key == sort else ""
+            self.trans_tree.heading(heading, text=heading + arrow)
+        self.load_transactions()
+    
+    def scroll_transactions(self, action, amount, unit=None):
+        """Scrollbar command ('moveto', fraction) or ('scroll', n, 'units' / 'pages')"""
+        window = self.trans_history
+        if window is None or not window.total:
+            return
+        if action == 'moveto':
+            top = int(float(amount) * window.total)
+        else:
+            top = window.top + int(amount) * (window.visible if unit == 'pages' else 1)
+        self.scroll_transactions_to(top)
+    
+    def wheel_transactions(self, event):
+        if self.trans_history is not None and self.trans_history.total:
+            up = event.num == 4 or event.delta > 0
+            self.scroll_transactions_to(self.trans_history.top + (-3 if up else 3))
+        return 'break'
+    
+    def scroll_transactions_to(self, top):
+        """Show the rows from top at once; fetch missing pages once scrolling pauses"""
+        self.trans_history.scroll_to(top)
+        self.render_transactions()
+        if self.trans_fetch_timer is not None:
+            self.root.after_cancel(self.trans_fetch_timer)
+        self.trans_fetch_timer = self.root.after(HISTORY_FETCH_DELAY_MS, self.fetch_transaction_pages,
+                                                 self.trans_history)
+    
+    def fetch_transaction_pages(self, window):
+        self.trans_fetch_timer = None
+        # The timer can outlive the visit; requests made before leaving it are already dropped
+        if (window is not self.trans_history or self.current_screen != 'transactions'
+                or not self.trans_tree.winfo_exists()):
+            return
+        for page in window.missing_pages():
+            self.run_async(window.fetch_page, page,
+                           on_done=lambda rows, page=page: self.transaction_page_loaded(window, page, rows))
+    
+    def transaction_page_loaded(self, window, page, rows):
+        if window is not self.trans_history:
+            return
+        window.store(page, rows)
+        self.render_transactions()
+    
+    def render_transactions(self):
+        """Write the visible rows into the table's fixed items"""
+        window = self.trans_history
+        for line, trans in enumerate(window.rows()):
+            if trans is None:
+                values = ('⏳ Loading...', '', '', '', '')
+            elif trans == '':
+                values = ('', '', '', '', '')
+            else:
+                values = (
+                    trans['date'],
+                    trans['type'],
+                    f"₹{trans['amount']:,.2f}",
+                    f"₹{trans['balance_after']:,.2f}",
+                    trans['description']
+                )
+            self.trans_tree.item(f'line{line}', values=values)
+        
+        self.trans_scrollbar.set(*window.fraction())
+        if window.total == 0:
+            self.trans_status.configure(text="No transactions in this range")
+        elif window.total is not None:
+            last = min(window.top + window.visible, window.total)
+            self.trans_status.configure(text=f"Rows {window.top + 1:,}–{last:,} of {window.total:,}")
 
 def main():
     """Main function to run the application"""
+    configure_logging()
     root = tk.Tk()
     app = BankManagementApp(root)
     root.mainloop()
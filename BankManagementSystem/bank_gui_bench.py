@@ -0,0 +1,164 @@
+"""
+Bank Account Management System - GUI Navigation Benchmark
+Startup time, navigation latency and Tk object counts for the customer screens
+
+Drives BankManagementApp against a throwaway SQLite database (bank_gui's
+Oracle connection is swapped for it), signs a synthetic customer in
+directly and clicks through the menu screens for a number of rounds:
+
+  - startup: Tk() until the account summary has been filled in
+  - switch: a show_*() call until Tk is idle again - what the click
+    itself costs the event loop
+  - settled: until the screen's background fetches have been rendered
+    (the worker polls every 30 ms, so this includes that granularity)
+  - widgets and Tcl commands after each round: a steady count means a
+    visit leaks nothing
+
+Only the app's public screen methods are used, so the same run works
+against any revision of bank_gui.py - check out the one before
+persistent screens to get the baseline:
+    git show <commit>:BankManagementSystem/bank_gui.py > /tmp/old/bank_gui.py
+
+Usage (needs a display, e.g. under xvfb-run):
+    python bank_gui_bench.py --rounds 20 [--gui-module /tmp/old/bank_gui.py]
+"""
+
+import argparse
+import importlib.util
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tkinter as tk
+from typing import Dict, List
+
+from bank_backends import SQLiteBackend
+from bank_bench import summarize
+from bank_database import BankDatabase
+from bank_metrics import configure_logging
+from bank_synthetic import populate
+
+SCREENS = ('show_account_summary', 'show_my_accounts', 'show_deposit_screen',
+           'show_withdraw_screen', 'show_transfer_screen', 'show_transactions_screen')
+
+
+def load_gui(path: str = None):
+    """bank_gui, or the revision of it at path"""
+    if path is None:
+        import bank_gui
+        return bank_gui
+    spec = importlib.util.spec_from_file_location('bank_gui', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def tk_objects(root: tk.Tk) -> Dict:
+    """Live widgets under root, and Tcl commands (every widget and callback is one)"""
+    widgets, stack = 0, [root]
+    while stack:
+        children = stack.pop().winfo_children()
+        widgets += len(children)
+        stack.extend(children)
+    return {'widgets': widgets,
+            'commands': len(root.tk.splitlist(root.tk.call('info', 'commands')))}
+
+
+def settle(root: tk.Tk, app, timeout: float = 30.0):
+    """Run the event loop until no background call or history page fetch is outstanding"""
+    deadline = time.perf_counter() + timeout
+    while (app.worker.pending_count() or getattr(app, 'trans_fetch_timer', None) is not None):
+        if time.perf_counter() > deadline:
+            raise TimeoutError("screen did not settle")
+        root.update()
+        time.sleep(0.001)
+    root.update_idletasks()
+
+
+def run(gui, path: str, rounds: int) -> Dict:
+    # The app opens its database by calling BankDatabase(...); point that at SQLite
+    gui.BankDatabase = lambda *args, **kwargs: BankDatabase(
+        backend=SQLiteBackend(path), cache_size=kwargs.get('cache_size', 0))
+
+    started = time.perf_counter()
+    root = tk.Tk()
+    app = gui.BankManagementApp(root)
+    app.current_customer = app.db.customer_login('customer1001@synthetic.bank', 'synthetic')
+    app.show_dashboard()
+    settle(root, app)
+    startup = time.perf_counter() - started
+
+    switch = {name: [] for name in SCREENS}
+    settled = {name: [] for name in SCREENS}
+    counts: List[Dict] = [tk_objects(root)]
+    try:
+        for _ in range(rounds):
+            for name in SCREENS:
+                started = time.perf_counter()
+                getattr(app, name)()
+                root.update_idletasks()
+                switch[name].append(time.perf_counter() - started)
+                settle(root, app)
+                settled[name].append(time.perf_counter() - started)
+            counts.append(tk_objects(root))
+    finally:
+        app.close()
+    return {'startup': startup, 'switch': switch, 'settled': settled, 'counts': counts}
+
+
+def report(result: Dict) -> bool:
+    print(f"Startup to a filled account summary: {result['startup'] * 1000:.0f} ms")
+    print(f"\n{'Screen':<26}{'first switch':>14}{'switch p50':>12}{'switch p99':>12}"
+          f"{'settled p50':>13}")
+    for name in SCREENS:
+        # The first visit may build the screen; later ones show what navigation costs
+        later = summarize(result['switch'][name][1:] or result['switch'][name])
+        settled = summarize(result['settled'][name][1:] or result['settled'][name])
+        print(f"{name:<26}{result['switch'][name][0] * 1000:>11.1f} ms"
+              f"{later['p50_ms']:>9.1f} ms{later['p99_ms']:>9.1f} ms{settled['p50_ms']:>10.1f} ms")
+
+    counts = result['counts']
+    print(f"\nTk objects: {counts[0]['widgets']:,} widgets / {counts[0]['commands']:,} Tcl commands "
+          f"on the summary, {counts[1]['widgets']:,} / {counts[1]['commands']:,} after one round, "
+          f"{counts[-1]['widgets']:,} / {counts[-1]['commands']:,} after {len(counts) - 1}")
+    steady = counts[-1] == counts[1]
+    print(f"   {'✅' if steady else '❌'} Object counts "
+          f"{'steady' if steady else 'GROW'} from round to round")
+    return steady
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time navigation between the customer screens")
+    parser.add_argument('--rounds', type=int, default=20, help="passes through every screen")
+    parser.add_argument('--accounts', type=int, default=3, help="accounts per customer")
+    parser.add_argument('--transactions', type=int, default=500, help="ledger rows per account")
+    parser.add_argument('--gui-module', metavar='PATH',
+                        help="benchmark this bank_gui.py instead (e.g. an older revision)")
+    args = parser.parse_args()
+    # Benchmark output only; the operations' own log lines are noise here
+    configure_logging(logging.CRITICAL)
+
+    directory = tempfile.mkdtemp(prefix='bms_gui_')
+    try:
+        path = os.path.join(directory, 'gui.db')
+        db = BankDatabase(backend=SQLiteBackend(path), metrics=False)
+        db.connect()
+        try:
+            populate(db, customers=50, accounts_per_customer=args.accounts,
+                     transactions_per_account=args.transactions)
+        finally:
+            db.disconnect()
+        try:
+            result = run(load_gui(args.gui_module), path, args.rounds)
+        except tk.TclError as error:
+            print(f"❌ Tk could not start ({error}); run under a display, e.g. xvfb-run")
+            return 2
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return 0 if report(result) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+"""
+Bank Account Management System - Virtualized Transaction History
+The paging model behind the GUI's transaction table, and its scroll check
+
+The history screen never holds an account's whole ledger. Its Treeview
+has one item per visible line, created once; scrolling only rewrites
+those items' values. HistoryWindow decides which rows they show:
+
+  - the position is a row offset into the account's history as the
+    database sorts and filters it (get_transaction_page), so the
+    scrollbar spans every matching row and can jump anywhere
+  - rows come in pages of page_size; the pages under the visible lines
+    and one either side are requested, each at most once (the GUI asks
+    only once scrolling pauses, so dragging the scrollbar across the
+    history does not queue a fetch for every page it passes)
+  - pages more than window_pages from the visible ones are dropped, so
+    memory is bounded however far the user scrolls
+  - changing the sort column, direction or date range starts a new
+    HistoryWindow; pages still in flight for the old one are ignored
+
+The model does no Tk work and no I/O on its own: the caller runs
+first_page() / fetch_page() on a worker thread and hands the results to
+opened() / store() on the Tk thread.
+
+Usage (headless scroll check, no display needed):
+    python bank_history_view.py --rows 100000
+"""
+
+import argparse
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from bank_bench import summarize
+from bank_database import BankDatabase
+from bank_metrics import configure_logging
+from bank_rows import DATE_FORMAT
+
+
+class HistoryWindow:
+    """Pages of one account's sorted, filtered history around the visible rows"""
+
+    def __init__(self, db: BankDatabase, account_number: str, sort: str = 'date',
+                 descending: bool = True, start_date: datetime = None,
+                 end_date: datetime = None, visible: int = 20, page_size: int = 200,
+                 window_pages: int = 2):
+        self.db = db
+        self.account_number = account_number
+        self.sort = sort
+        self.descending = descending
+        self.start_date = start_date
+        self.end_date = end_date
+        self.visible = visible
+        self.page_size = page_size
+        self.window_pages = window_pages
+        self.total: Optional[int] = None
+        self.top = 0
+        self.pages: Dict[int, List] = {}
+        self.requested = set()
+
+    # --- worker thread ---
+
+    def first_page(self) -> Tuple[Optional[int], List]:
+        """The row count and page 0, fetched together when the view opens"""
+        total = self.db.count_transactions(self.account_number, self.start_date, self.end_date)
+        return total, self.fetch_page(0) if total else []
+
+    def fetch_page(self, page: int) -> List:
+        return self.db.get_transaction_page(self.account_number, page * self.page_size,
+                                            self.page_size, self.sort, self.descending,
+                                            self.start_date, self.end_date)
+
+    # --- Tk thread ---
+
+    def opened(self, result: Tuple[Optional[int], List]) -> bool:
+        """Take first_page()'s result; False if the count failed"""
+        total, rows = result
+        if total is None:
+            return False
+        self.total = total
+        self.requested.add(0)
+        self.store(0, rows)
+        return True
+
+    def scroll_to(self, top: int):
+        """Move the first visible row to top (clamped), dropping pages now out of range"""
+        if self.total is None:
+            return
+        self.top = max(0, min(top, self.total - self.visible))
+        self._evict()
+
+    def missing_pages(self) -> List[int]:
+        """Pages around the visible rows that are neither held nor requested; marks them requested"""
+        if self.total is None:
+            return []
+        last_page = max(0, (self.total - 1) // self.page_size)
+        first, last = self._visible_pages()
+        wanted = range(max(0, first - 1), min(last_page, last + 1) + 1)
+        needed = [page for page in wanted if page not in self.pages and page not in self.requested]
+        self.requested.update(needed)
+        return needed
+
+    def store(self, page: int, rows: List):
+        """Keep a fetched page, unless the view has since moved away from it"""
+        self.requested.discard(page)
+        # An empty page is a failed fetch (the count said rows were there);
+        # leaving it out lets the next missing_pages() ask again
+        if rows and self._distance(page) <= self.window_pages:
+            self.pages[page] = rows
+
+    def rows(self) -> List:
+        """One entry per visible line: the row, None while its page loads, or '' past the end"""
+        lines = []
+        for index in range(self.top, self.top + self.visible):
+            if self.total is None or index >= self.total:
+                lines.append('')
+                continue
+            page = self.pages.get(index // self.page_size)
+            offset = index % self.page_size
+            lines.append(page[offset] if page is not None and offset < len(page) else None)
+        return lines
+
+    def fraction(self) -> Tuple[float, float]:
+        """The visible rows as scrollbar fractions of the whole history"""
+        if not self.total:
+            return 0.0, 1.0
+        return self.top / self.total, min(1.0, (self.top + self.visible) / self.total)
+
+    def cached_rows(self) -> int:
+        return sum(len(rows) for rows in self.pages.values())
+
+    def _visible_pages(self) -> Tuple[int, int]:
+        return self.top // self.page_size, (self.top + self.visible - 1) // self.page_size
+
+    def _distance(self, page: int) -> int:
+        first, last = self._visible_pages()
+        return max(first - page, page - last, 0)
+
+    def _evict(self):
+        for page in [page for page in self.pages if self._distance(page) > self.window_pages]:
+            del self.pages[page]
+
+
+# --- headless check ---
+
+def sweep(window: HistoryWindow, step: int) -> Dict:
+    """Scroll top to bottom step rows at a time, fetching pages as the GUI would"""
+    fetches, peak, shown = [], 0, {}
+    started = time.perf_counter()
+    window.opened(window.first_page())
+    fetches.append(time.perf_counter() - started)
+    top = 0
+    while True:
+        window.scroll_to(top)
+        for page in window.missing_pages():
+            started = time.perf_counter()
+            window.store(page, window.fetch_page(page))
+            fetches.append(time.perf_counter() - started)
+        lines = window.rows()
+        if any(line is None for line in lines):
+            raise AssertionError(f"rows at {window.top} still loading after their fetch")
+        peak = max(peak, window.cached_rows())
+        for index, line in enumerate(lines):
+            if line != '':
+                shown[window.top + index] = line
+        if window.top + window.visible >= window.total:
+            break
+        top += step
+    return {'fetches': fetches, 'peak_cached_rows': peak,
+            'seen': [shown[index] for index in sorted(shown)]}
+
+
+def check_history_view(rows: int, step: int, page_size: int) -> bool:
+    from bank_backends import SQLiteBackend
+    from bank_rows import build_history
+
+    directory = tempfile.mkdtemp(prefix='bms_history_view_')
+    results = []
+    try:
+        db = BankDatabase(backend=SQLiteBackend(os.path.join(directory, 'history.db')),
+                          metrics=False)
+        db.connect()
+        try:
+            started = time.perf_counter()
+            account = build_history(db, rows)
+            print(f"{rows:,} ledger rows built in {time.perf_counter() - started:.1f}s")
+            # Each order's full sort key: the column, then transaction_id
+            orders = [
+                ('date', True, lambda row: (datetime.strptime(row['date'], DATE_FORMAT),
+                                            row['transaction_id'])),
+                ('amount', False, lambda row: (row['amount'], row['transaction_id'])),
+            ]
+            for sort, descending, key in orders:
+                window = HistoryWindow(db, account, sort, descending, page_size=page_size)
+                report = sweep(window, step)
+                seen = report['seen']
+                ids = [row['transaction_id'] for row in seen]
+                complete = len(ids) == window.total == rows + 1 and len(set(ids)) == len(ids)
+                ordered = seen == sorted(seen, key=key, reverse=descending)
+                bound = (2 * window.window_pages + 2) * page_size
+                stats = summarize(report['fetches'])
+                ok = complete and ordered and report['peak_cached_rows'] <= bound
+                print(f"   {'✅' if ok else '❌'} sorted by {sort} "
+                      f"{'descending' if descending else 'ascending'}: {len(ids):,} rows "
+                      f"{'each shown once, in order' if complete and ordered else 'MISSING OR OUT OF ORDER'}; "
+                      f"{len(report['fetches'])} page fetches p50 {stats['p50_ms']:.1f} ms "
+                      f"p99 {stats['p99_ms']:.1f} ms; at most {report['peak_cached_rows']:,} rows "
+                      f"held (bound {bound:,})")
+                results.append(ok)
+
+            window = HistoryWindow(db, account, page_size=page_size)
+            window.opened(window.first_page())
+            middle = window.total // 2 // page_size
+            window.scroll_to(window.total // 2)
+            needed = window.missing_pages()
+            jumped = (0 not in window.pages and bool(needed)
+                      and all(abs(page - middle) <= 1 for page in needed))
+            filtered = db.count_transactions(account, end_date=datetime(2000, 1, 1)) == 0
+            print(f"   {'✅' if jumped else '❌'} Jump to the middle requests only the pages there")
+            print(f"   {'✅' if filtered else '❌'} Date filter counted in the database")
+            results += [jumped, filtered]
+        finally:
+            db.disconnect()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return all(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scroll a long history through the paging model")
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--step', type=int, default=20,
+                        help="rows per scroll step (at most the 20 visible rows)")
+    parser.add_argument('--page-size', type=int, default=200)
+    args = parser.parse_args()
+    # Check output only; the operations' own log lines are noise here
+    configure_logging(logging.CRITICAL)
+    return 0 if check_history_view(args.rows, args.step, args.page_size) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
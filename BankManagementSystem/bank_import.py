@@ -0,0 +1,370 @@
+"""
+Bank Account Management System - Bulk Import
+Loads customer and account files (CSV or JSONL) in array-bound batches
+
+Files are streamed chunk by chunk: each chunk is validated in a pool of
+worker processes, checked against the database with one set-based query,
+given a block of sequence values with allocate_ids() and written with
+executemany, then committed. Accounts get their opening-deposit
+Transactions rows in the same batch, exactly as open_account would write
+them. Rejected rows go to a JSONL side file with the line number and the
+reasons. Memory is bounded by chunk_size x in-flight chunks.
+
+Customer columns: full_name, email, phone, address, date_of_birth (YYYY-MM-DD), password
+Account columns:  email (of an existing or imported customer), account_type, initial_deposit
+
+Usage:
+    python bank_import.py --customers customers.csv --accounts accounts.jsonl \\
+        --rejects rejects.jsonl [--sqlite bank.db]
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from bank_database import BankDatabase
+from bank_metrics import configure_logging
+
+ACCOUNT_TYPES = {'Savings': 4.00, 'Current': 0.00, 'Fixed Deposit': 6.50}
+
+_EMAIL = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+_PHONE = re.compile(r'^\+?[0-9 \-]{7,15}$')
+
+
+def read_records(path: str) -> Iterator[Tuple[int, object]]:
+    """Yield (line_number, record) from a CSV (with header) or JSONL file
+
+    A JSONL line that does not parse is yielded as its raw text so the
+    validator can reject it with the rest.
+    """
+    with open(path, newline='', encoding='utf-8') as handle:
+        if path.lower().endswith(('.jsonl', '.ndjson', '.json')):
+            for line_number, line in enumerate(handle, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_number, json.loads(line)
+                except ValueError:
+                    yield line_number, line.rstrip('\n')
+        else:
+            reader = csv.DictReader(handle)
+            for record in reader:
+                yield reader.line_num, record
+
+
+def _text(record: Dict, field: str) -> str:
+    value = record.get(field)
+    return '' if value is None else str(value).strip()
+
+
+def validate_customers(chunk: List[Tuple[int, object]]) -> List[Tuple[int, object, Optional[Dict], List[str]]]:
+    """Check customer records; returns (line, record, row or None, errors) per input"""
+    results = []
+    for line_number, record in chunk:
+        if not isinstance(record, dict):
+            results.append((line_number, record, None, ["Malformed record"]))
+            continue
+        errors = []
+        full_name = _text(record, 'full_name')
+        email = _text(record, 'email').lower()
+        phone = _text(record, 'phone')
+        address = _text(record, 'address')
+        dob = _text(record, 'date_of_birth')
+        password = _text(record, 'password')
+        if not full_name or len(full_name) > 100:
+            errors.append("full_name is required (max 100 characters)")
+        if not _EMAIL.match(email) or len(email) > 100:
+            errors.append("email is not a valid address")
+        if not _PHONE.match(phone):
+            errors.append("phone must be 7-15 digits")
+        if len(address) > 200:
+            errors.append("address is longer than 200 characters")
+        if dob:
+            try:
+                if datetime.strptime(dob, '%Y-%m-%d') >= datetime.now():
+                    errors.append("date_of_birth is in the future")
+            except ValueError:
+                errors.append("date_of_birth must be YYYY-MM-DD")
+        if not password or len(password) > 100:
+            errors.append("password is required (max 100 characters)")
+        row = None if errors else {'full_name': full_name, 'email': email, 'phone': phone,
+                                   'address': address or None, 'dob': dob or None,
+                                   'password': password}
+        results.append((line_number, record, row, errors))
+    return results
+
+
+def validate_accounts(chunk: List[Tuple[int, object]]) -> List[Tuple[int, object, Optional[Dict], List[str]]]:
+    """Check account records; returns (line, record, row or None, errors) per input"""
+    results = []
+    for line_number, record in chunk:
+        if not isinstance(record, dict):
+            results.append((line_number, record, None, ["Malformed record"]))
+            continue
+        errors = []
+        email = _text(record, 'email').lower()
+        account_type = _text(record, 'account_type')
+        deposit_text = _text(record, 'initial_deposit') or '0'
+        if not _EMAIL.match(email):
+            errors.append("email is not a valid address")
+        if account_type not in ACCOUNT_TYPES:
+            errors.append(f"account_type must be one of {', '.join(ACCOUNT_TYPES)}")
+        try:
+            deposit = round(float(deposit_text), 2)
+            if deposit < 0:
+                errors.append("initial_deposit cannot be negative")
+        except ValueError:
+            deposit = 0.0
+            errors.append("initial_deposit is not a number")
+        row = None if errors else {'email': email, 'account_type': account_type,
+                                   'deposit': deposit}
+        results.append((line_number, record, row, errors))
+    return results
+
+
+class BulkImporter:
+    """Streams customer/account files into the database in array-bound batches"""
+
+    INSERT_CUSTOMER = """
+        INSERT INTO Customers
+        (customer_id, full_name, email, phone, address, date_of_birth,
+         created_date, password_hash, status)
+        VALUES (:customer_id, :full_name, :email, :phone, :address,
+                TO_DATE(:dob, 'YYYY-MM-DD'), SYSDATE, :password, 'Active')
+        """
+    INSERT_ACCOUNT = """
+        INSERT INTO Accounts
+        (account_id, customer_id, account_number, account_type, balance,
+         interest_rate, created_date, status)
+        VALUES (:account_id, :customer_id, :account_number, :account_type, :balance,
+                :interest_rate, SYSDATE, 'Active')
+        """
+    INSERT_OPENING_DEPOSIT = """
+        INSERT INTO Transactions
+        (transaction_id, account_id, transaction_type, amount, balance_after,
+         transaction_date, description, reference_account)
+        VALUES (:transaction_id, :account_id, 'Deposit', :amount, :amount,
+                SYSDATE, 'Account Opening Deposit', NULL)
+        """
+
+    def __init__(self, db: BankDatabase, rejects_path: str, chunk_size: int = 5000,
+                 workers: int = None):
+        self.db = db
+        self.backend = db.backend
+        self.rejects_path = rejects_path
+        self.chunk_size = chunk_size
+        self.workers = workers if workers is not None else min(4, os.cpu_count() or 1)
+        self._rejects = None
+
+    def __enter__(self):
+        self._rejects = open(self.rejects_path, 'w', encoding='utf-8')
+        return self
+
+    def __exit__(self, *exc_info):
+        self._rejects.close()
+
+    def _reject(self, source: str, line_number: int, record, errors: List[str]):
+        self._rejects.write(json.dumps({'file': source, 'line': line_number,
+                                        'record': record, 'errors': errors},
+                                       default=str) + '\n')
+
+    def _validated_chunks(self, path: str, validate) -> Iterator[List[Tuple]]:
+        """Validated chunks in file order, with at most 2 x workers chunks in flight"""
+        records = read_records(path)
+        chunks = iter(lambda: list(islice(records, self.chunk_size)), [])
+        if self.workers <= 1:
+            for chunk in chunks:
+                yield validate(chunk)
+            return
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(validate, chunk))
+                if len(pending) >= self.workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def _lookup_emails(self, cursor, emails: List[str]) -> Dict[str, int]:
+        cursor.execute(self.backend.prepare("""
+            SELECT email, customer_id FROM Customers
+            WHERE email IN (SELECT column_value FROM TABLE(:emails))
+            """), {'emails': self.backend.string_list(cursor, emails)})
+        return {row[0]: row[1] for row in cursor}
+
+    def _write(self, connection, cursor, statements: List[Tuple[str, List[Tuple[int, Dict]]]],
+               rows: List[Tuple], source: str) -> List[Tuple]:
+        """executemany each statement's binds and commit; returns the rows loaded
+
+        Binds are (row index, params) pairs. If the batch fails as a whole
+        (e.g. a concurrent writer took an email), it is rolled back and
+        replayed row by row under a savepoint so only the offending rows
+        are rejected.
+        """
+        try:
+            for sql, binds in statements:
+                if binds:
+                    cursor.executemany(self.backend.prepare(sql),
+                                       [params for _, params in binds])
+            connection.commit()
+            return rows
+        except Exception:
+            connection.rollback()
+        by_row: Dict[int, List[Tuple[str, Dict]]] = {}
+        for sql, binds in statements:
+            for index, params in binds:
+                by_row.setdefault(index, []).append((self.backend.prepare(sql), params))
+        loaded = []
+        for index, row in enumerate(rows):
+            cursor.execute("SAVEPOINT import_row")
+            try:
+                for sql, params in by_row.get(index, []):
+                    cursor.execute(sql, params)
+                loaded.append(row)
+            except Exception as e:
+                cursor.execute("ROLLBACK TO import_row")
+                self._reject(source, row[0], row[1], [str(e)])
+        connection.commit()
+        return loaded
+
+    def import_customers(self, path: str) -> Dict:
+        """Load a customer file; returns counts and throughput"""
+        source = os.path.basename(path)
+        report = {'file': path, 'read': 0, 'imported': 0, 'rejected': 0}
+        started = time.perf_counter()
+        with self.backend.session() as (connection, cursor):
+            for results in self._validated_chunks(path, validate_customers):
+                report['read'] += len(results)
+                accepted = []
+                for line_number, record, row, errors in results:
+                    if errors:
+                        self._reject(source, line_number, record, errors)
+                    else:
+                        accepted.append((line_number, record, row))
+                existing = self._lookup_emails(cursor, [row['email'] for _, _, row in accepted])
+                fresh, seen = [], set()
+                for line_number, record, row in accepted:
+                    if row['email'] in existing or row['email'] in seen:
+                        self._reject(source, line_number, record, ["Email already exists"])
+                    else:
+                        seen.add(row['email'])
+                        fresh.append((line_number, record, row))
+                if fresh:
+                    ids = self.backend.allocate_ids(cursor, 'customer_seq', len(fresh))
+                    binds = [(index, dict(row, customer_id=customer_id))
+                             for index, ((_, _, row), customer_id) in enumerate(zip(fresh, ids))]
+                    loaded = self._write(connection, cursor,
+                                         [(self.INSERT_CUSTOMER, binds)], fresh, source)
+                    report['imported'] += len(loaded)
+        return self._finish(report, started)
+
+    def import_accounts(self, path: str) -> Dict:
+        """Load an account file, with opening deposits; returns counts and throughput"""
+        source = os.path.basename(path)
+        report = {'file': path, 'read': 0, 'imported': 0, 'rejected': 0,
+                  'opening_deposits': 0}
+        started = time.perf_counter()
+        with self.backend.session() as (connection, cursor):
+            for results in self._validated_chunks(path, validate_accounts):
+                report['read'] += len(results)
+                accepted = []
+                for line_number, record, row, errors in results:
+                    if errors:
+                        self._reject(source, line_number, record, errors)
+                    else:
+                        accepted.append((line_number, record, row))
+                owners = self._lookup_emails(cursor, sorted({row['email'] for _, _, row in accepted}))
+                owned = []
+                for line_number, record, row in accepted:
+                    if row['email'] in owners:
+                        owned.append((line_number, record, row))
+                    else:
+                        self._reject(source, line_number, record, ["No customer with this email"])
+                if not owned:
+                    continue
+                account_ids = self.backend.allocate_ids(cursor, 'account_seq', len(owned))
+                deposits = sum(1 for _, _, row in owned if row['deposit'] > 0)
+                transaction_ids = iter(self.backend.allocate_ids(cursor, 'transaction_seq', deposits)
+                                       if deposits else [])
+                accounts, openings = [], []
+                for index, ((_, _, row), account_id) in enumerate(zip(owned, account_ids)):
+                    accounts.append((index, {
+                        'account_id': account_id,
+                        'customer_id': owners[row['email']],
+                        'account_number': 'ACC' + str(account_id).rjust(10, '0'),
+                        'account_type': row['account_type'],
+                        'balance': row['deposit'],
+                        'interest_rate': ACCOUNT_TYPES[row['account_type']]
+                    }))
+                    if row['deposit'] > 0:
+                        openings.append((index, {'transaction_id': next(transaction_ids),
+                                                 'account_id': account_id,
+                                                 'amount': row['deposit']}))
+                loaded = self._write(connection, cursor,
+                                     [(self.INSERT_ACCOUNT, accounts),
+                                      (self.INSERT_OPENING_DEPOSIT, openings)], owned, source)
+                report['imported'] += len(loaded)
+                report['opening_deposits'] += sum(1 for _, _, row in loaded if row['deposit'] > 0)
+                for customer_id in {owners[row['email']] for _, _, row in loaded}:
+                    self.db._invalidate_customer(customer_id)
+        return self._finish(report, started)
+
+    @staticmethod
+    def _finish(report: Dict, started: float) -> Dict:
+        elapsed = time.perf_counter() - started
+        report['rejected'] = report['read'] - report['imported']
+        report['elapsed_seconds'] = elapsed
+        report['rows_per_minute'] = report['read'] / elapsed * 60 if elapsed > 0 else 0.0
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import customers and accounts")
+    parser.add_argument('--customers', help="customer file (.csv or .jsonl)")
+    parser.add_argument('--accounts', help="account file (.csv or .jsonl), loaded after customers")
+    parser.add_argument('--rejects', default='rejects.jsonl', help="side file for rejected rows")
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=None, help="validation processes")
+    parser.add_argument('--sqlite', metavar='PATH', help="load into an embedded SQLite database")
+    args = parser.parse_args()
+    configure_logging()
+    if not args.customers and not args.accounts:
+        parser.error("nothing to import: give --customers and/or --accounts")
+
+    if args.sqlite:
+        from bank_backends import SQLiteBackend
+        db = BankDatabase(backend=SQLiteBackend(args.sqlite))
+    else:
+        db = BankDatabase("SYS", "oracle@express", "localhost:1521/XE")
+    if not db.connect():
+        return 1
+
+    reports = []
+    try:
+        with BulkImporter(db, args.rejects, args.chunk_size, args.workers) as importer:
+            if args.customers:
+                reports.append(importer.import_customers(args.customers))
+            if args.accounts:
+                reports.append(importer.import_accounts(args.accounts))
+    finally:
+        db.disconnect()
+    for report in reports:
+        print(f"✅ {report['file']}: {report['imported']:,}/{report['read']:,} rows imported "
+              f"in {report['elapsed_seconds']:.2f}s ({report['rows_per_minute']:,.0f} rows/min)")
+    rejected = sum(report['rejected'] for report in reports)
+    if rejected:
+        print(f"⚠️  {rejected:,} rows rejected, see {args.rejects}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
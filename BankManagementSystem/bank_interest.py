@@ -0,0 +1,307 @@
+"""
+Bank Account Management System - Interest Posting
+Posts a period's interest to every active interest-bearing account
+
+Accounts are read in account_id order, chunk_size at a time, with the
+table locked against postings for the duration of the chunk. Interest is
+computed for the whole chunk at once with NumPy on integer paise, then
+the new balances and the 'Interest' Transactions rows are written with
+two executemany calls and committed together with the run's progress.
+
+Interest_Runs holds one row per period (YYYY-MM): last_account_id is the
+restart point, so an interrupted run resumes after the last committed
+chunk, and a Completed period is never posted again. Every chunk first
+claims the run row at its expected restart point, so two jobs started
+for the same period cannot both post a chunk.
+
+Methods (annual rate from Accounts.interest_rate, balance at posting time):
+  monthly - balance x rate / 12
+  daily   - interest compounded daily over the days of the period (actual/365)
+
+Usage:
+    python bank_interest.py --period 2026-09 [--method daily] [--sqlite bank.db]
+"""
+
+import argparse
+import calendar
+import logging
+import sys
+import time
+from datetime import date
+from typing import Dict, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from bank_database import BankDatabase
+from bank_metrics import configure_logging, log_event
+
+log = logging.getLogger('bank.interest')
+
+ACCOUNT_TYPES = ('Savings', 'Current', 'Fixed Deposit')
+METHODS = ('monthly', 'daily')
+
+
+def previous_period(today: date = None) -> str:
+    """The calendar month before today, as YYYY-MM"""
+    today = today or date.today()
+    year, month = (today.year, today.month - 1) if today.month > 1 else (today.year - 1, 12)
+    return f"{year:04d}-{month:02d}"
+
+
+def interest_paise(balance_paise, rates, method: str, days: int):
+    """Interest in whole paise (rounded half up) for arrays of balances and annual % rates"""
+    if method == 'monthly':
+        factor = rates / 1200.0
+    else:
+        factor = np.power(1.0 + rates / 36500.0, days) - 1.0
+    return np.floor(balance_paise * factor + 0.5).astype(np.int64)
+
+
+class InterestEngine:
+    """Vectorized interest posting against a connected BankDatabase"""
+
+    SELECT_CHUNK = """
+        SELECT account_id, account_number, account_type, balance, interest_rate
+        FROM Accounts
+        WHERE account_id > :after AND status = 'Active' AND interest_rate > 0
+        ORDER BY account_id
+        FETCH FIRST :chunk_size ROWS ONLY
+        """
+
+    UPDATE_BALANCE = "UPDATE Accounts SET balance = :balance WHERE account_id = :account_id"
+
+    INSERT_INTEREST = """
+        INSERT INTO Transactions
+        (transaction_id, account_id, transaction_type, amount, balance_after,
+         transaction_date, description, reference_account)
+        VALUES (:transaction_id, :account_id, 'Interest', :amount, :balance_after,
+                SYSDATE, :description, NULL)
+        """
+
+    def __init__(self, db: BankDatabase, chunk_size: int = 20000):
+        if np is None:
+            raise ImportError("numpy is required for interest posting (pip install numpy)")
+        self.db = db
+        self.backend = db.backend
+        self.chunk_size = chunk_size
+
+    def post(self, period: str = None, method: str = 'monthly') -> Optional[Dict]:
+        """Post interest for period (default: last month); returns the run report or None
+
+        The report has the run status, accounts posted and total interest
+        per account type (for the whole period, including chunks committed
+        by an earlier interrupted run) and this invocation's throughput.
+        """
+        period = period or previous_period()
+        try:
+            year, month = (int(part) for part in period.split('-'))
+            days = calendar.monthrange(year, month)[1]
+        except ValueError:
+            log_event(log, logging.ERROR, 'interest_failed',
+                      "Invalid period {period!r}: expected YYYY-MM", period=period)
+            return None
+        if method not in METHODS:
+            log_event(log, logging.ERROR, 'interest_failed',
+                      "Unknown interest method {method!r}", method=method)
+            return None
+
+        started = time.perf_counter()
+        posted = 0
+        try:
+            with self.backend.session() as (connection, cursor):
+                run = self._open_run(connection, cursor, period, method)
+                if run is None:
+                    return None
+                last_account_id, status = run
+                while status != 'Completed':
+                    count, last_account_id = self._post_chunk(
+                        connection, cursor, period, method, days, last_account_id)
+                    posted += count
+                    if count == 0:
+                        cursor.execute(self.backend.prepare("""
+                            UPDATE Interest_Runs SET status = 'Completed', completed_date = SYSDATE
+                            WHERE period = :period
+                            """), {'period': period})
+                        connection.commit()
+                        status = 'Completed'
+                report = self._report(cursor, period)
+        except Exception as e:
+            log_event(log, logging.ERROR, 'interest_failed',
+                      "Interest run {period} stopped after {posted:,} accounts: {error}",
+                      period=period, posted=posted, error=str(e))
+            return None
+
+        elapsed = time.perf_counter() - started
+        report['posted_now'] = posted
+        report['elapsed_seconds'] = elapsed
+        report['accounts_per_second'] = posted / elapsed if elapsed > 0 else 0.0
+        log_event(log, logging.INFO, 'interest_posted',
+                  "Interest {period} ({method}): {accounts:,} accounts, ₹{total:,.2f} "
+                  "({posted:,} posted now, {rate:,.0f} accounts/sec)",
+                  period=period, method=method, accounts=report['accounts_posted'],
+                  total=report['total_interest'], posted=posted,
+                  rate=report['accounts_per_second'])
+        return report
+
+    def _open_run(self, connection, cursor, period: str, method: str):
+        """Create or resume the period's run; (last_account_id, status) or None"""
+        select_run = self.backend.prepare("""
+            SELECT method, status, last_account_id FROM Interest_Runs WHERE period = :period
+            """)
+        cursor.execute(select_run, {'period': period})
+        row = cursor.fetchone()
+        if row is None:
+            try:
+                cursor.execute(self.backend.prepare("""
+                    INSERT INTO Interest_Runs (period, method, status, last_account_id,
+                                               accounts_posted, total_interest, started_date)
+                    VALUES (:period, :method, 'Running', 0, 0, 0, SYSDATE)
+                    """), {'period': period, 'method': method})
+                cursor.executemany(self.backend.prepare("""
+                    INSERT INTO Interest_Run_Totals (period, account_type, accounts_posted, total_interest)
+                    VALUES (:period, :account_type, 0, 0)
+                    """), [{'period': period, 'account_type': account_type}
+                           for account_type in ACCOUNT_TYPES])
+                connection.commit()
+            except self.backend.IntegrityError:
+                # Another job created the run first; resume it like any other
+                connection.rollback()
+            cursor.execute(select_run, {'period': period})
+            row = cursor.fetchone()
+        existing_method, status, last_account_id = row
+        if existing_method != method:
+            log_event(log, logging.ERROR, 'interest_failed',
+                      "Interest for {period} was started with the {existing} method",
+                      period=period, existing=existing_method)
+            return None
+        if status == 'Completed':
+            log_event(log, logging.WARNING, 'interest_skipped',
+                      "Interest for {period} was already posted", period=period)
+        elif last_account_id:
+            log_event(log, logging.INFO, 'interest_resumed',
+                      "Resuming interest for {period} after account {account_id}",
+                      period=period, account_id=last_account_id)
+        return int(last_account_id), status
+
+    def _post_chunk(self, connection, cursor, period: str, method: str, days: int,
+                    after: int):
+        """Post one chunk in one transaction; (accounts posted, new restart point)"""
+        self.backend.lock_tables(cursor, ['Accounts'])
+        cursor.execute(self.backend.prepare("""
+            UPDATE Interest_Runs SET last_account_id = last_account_id
+            WHERE period = :period AND last_account_id = :after AND status = 'Running'
+            """), {'period': period, 'after': after})
+        if cursor.rowcount != 1:
+            connection.rollback()
+            raise RuntimeError(f"interest run {period} was advanced by another job")
+
+        cursor.arraysize = self.chunk_size
+        cursor.execute(self.backend.prepare(self.SELECT_CHUNK),
+                       {'after': after, 'chunk_size': self.chunk_size})
+        rows = cursor.fetchall()
+        if not rows:
+            connection.commit()
+            return 0, after
+        account_ids, numbers, types, balances, rates = zip(*rows)
+        account_ids = np.array(account_ids, dtype=np.int64)
+        types = np.array(types, dtype=object)
+        balance = np.rint(np.array(balances, dtype=np.float64) * 100).astype(np.int64)
+        interest = interest_paise(balance, np.array(rates, dtype=np.float64), method, days)
+        due = interest > 0
+        new_balance = balance[due] + interest[due]
+
+        ids = account_ids[due].tolist()
+        amounts = (interest[due] / 100).tolist()
+        balances_after = (new_balance / 100).tolist()
+        description = f"Interest {period}"
+        transaction_ids = self.backend.allocate_ids(cursor, 'transaction_seq', len(ids))
+        cursor.executemany(self.backend.prepare(self.UPDATE_BALANCE),
+                           [{'balance': balance_after, 'account_id': account_id}
+                            for account_id, balance_after in zip(ids, balances_after)])
+        cursor.executemany(self.backend.prepare(self.INSERT_INTEREST),
+                           [{'transaction_id': transaction_id, 'account_id': account_id,
+                             'amount': amount, 'balance_after': balance_after,
+                             'description': description}
+                            for transaction_id, account_id, amount, balance_after
+                            in zip(transaction_ids, ids, amounts, balances_after)])
+
+        totals = []
+        for account_type in ACCOUNT_TYPES:
+            mask = due & (types == account_type)
+            if mask.any():
+                totals.append({'period': period, 'account_type': account_type,
+                               'accounts': int(mask.sum()),
+                               'interest': int(interest[mask].sum()) / 100})
+        if totals:
+            cursor.executemany(self.backend.prepare("""
+                UPDATE Interest_Run_Totals
+                SET accounts_posted = accounts_posted + :accounts,
+                    total_interest = total_interest + :interest
+                WHERE period = :period AND account_type = :account_type
+                """), totals)
+        last_account_id = int(account_ids[-1])
+        cursor.execute(self.backend.prepare("""
+            UPDATE Interest_Runs
+            SET last_account_id = :last_account_id,
+                accounts_posted = accounts_posted + :accounts,
+                total_interest = total_interest + :interest
+            WHERE period = :period
+            """), {'last_account_id': last_account_id, 'accounts': len(ids),
+                   'interest': int(interest[due].sum()) / 100, 'period': period})
+        connection.commit()
+        self.db._invalidate_accounts(*[number for number, posted in zip(numbers, due) if posted])
+        return len(ids), last_account_id
+
+    def _report(self, cursor, period: str) -> Dict:
+        cursor.execute(self.backend.prepare("""
+            SELECT method, status, accounts_posted, total_interest FROM Interest_Runs
+            WHERE period = :period
+            """), {'period': period})
+        method, status, accounts_posted, total_interest = cursor.fetchone()
+        cursor.execute(self.backend.prepare("""
+            SELECT account_type, accounts_posted, total_interest FROM Interest_Run_Totals
+            WHERE period = :period ORDER BY account_type
+            """), {'period': period})
+        by_type = {account_type: {'accounts': int(accounts), 'interest': round(float(total), 2),
+                                  'average': round(float(total) / accounts, 2) if accounts else 0.0}
+                   for account_type, accounts, total in cursor.fetchall()}
+        return {'period': period, 'method': method, 'status': status,
+                'accounts_posted': int(accounts_posted),
+                'total_interest': round(float(total_interest), 2), 'by_type': by_type}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Post a period's interest to all accounts")
+    parser.add_argument('--period', help="YYYY-MM (default: last month)")
+    parser.add_argument('--method', choices=METHODS, default='monthly')
+    parser.add_argument('--chunk-size', type=int, default=20000)
+    parser.add_argument('--sqlite', metavar='PATH', help="post to an embedded SQLite database")
+    args = parser.parse_args()
+    configure_logging()
+
+    if args.sqlite:
+        from bank_backends import SQLiteBackend
+        db = BankDatabase(backend=SQLiteBackend(args.sqlite))
+    else:
+        db = BankDatabase("SYS", "oracle@express", "localhost:1521/XE")
+    if not db.connect():
+        return 1
+    try:
+        report = InterestEngine(db, args.chunk_size).post(args.period, args.method)
+    finally:
+        db.disconnect()
+    if report is None:
+        return 1
+    print(f"\n{'Account type':<16}{'Accounts':>12}{'Interest':>20}{'Average':>14}")
+    for account_type, totals in report['by_type'].items():
+        print(f"{account_type:<16}{totals['accounts']:>12,}{totals['interest']:>20,.2f}"
+              f"{totals['average']:>14,.2f}")
+    print(f"{'Total':<16}{report['accounts_posted']:>12,}{report['total_interest']:>20,.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,504 @@
+"""
+Bank Account Management System - Instrumentation
+Per-method metrics, per-statement SQL counters, slow-query log and logging
+
+Metrics collects, with one short lock hold per observation:
+  - calls, errors and a latency histogram for every instrumented method
+  - executions, round trips, rows fetched and time per SQL statement,
+    keyed by bank_sql catalog name (normalized text for other SQL)
+  - a slow-query log (logger 'bank.sql') with bind values redacted
+render_prometheus() emits the Prometheus text exposition format and
+serve_prometheus() publishes it on /metrics from a daemon thread.
+
+log_event() attaches structured fields to a log record; configure_logging()
+prints them as console lines or as one JSON object per line.
+"""
+
+import inspect
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from datetime import date, datetime
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+from bank_sql import statement_name
+
+sql_log = logging.getLogger('bank.sql')
+
+# Histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def log_event(logger: logging.Logger, level: int, event: str, message: str, **fields):
+    """Log message.format(**fields) with event and fields attached to the record"""
+    if logger.isEnabledFor(level):
+        fields['event'] = event
+        logger.log(level, message.format(**fields), extra={'fields': fields}, stacklevel=2)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: timestamp, level, logger, message and fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        entry.update(getattr(record, 'fields', {}))
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class ConsoleFormatter(logging.Formatter):
+    """The module's console style: a status marker per level, then the message"""
+
+    MARKERS = {logging.INFO: '✅', logging.WARNING: '⚠️ ', logging.ERROR: '❌'}
+
+    def format(self, record: logging.LogRecord) -> str:
+        marker = self.MARKERS.get(record.levelno, '  ')
+        return f"{marker} {super().format(record)}"
+
+
+def configure_logging(level: int = logging.INFO, json_format: bool = False):
+    """Send the bank loggers to stderr, as console lines or JSON lines"""
+    handler = logging.StreamHandler()
+    handler.setFormatter(JsonFormatter() if json_format else ConsoleFormatter('%(message)s'))
+    logger = logging.getLogger('bank')
+    logger.handlers[:] = [handler]
+    logger.setLevel(level)
+    logger.propagate = False
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (not thread-safe; Metrics holds the lock)"""
+
+    __slots__ = ('bounds', 'counts', 'total', 'count')
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def cumulative(self) -> List[int]:
+        running, result = 0, []
+        for count in self.counts:
+            running += count
+            result.append(running)
+        return result
+
+    def quantile(self, fraction: float) -> Optional[float]:
+        """Upper bound of the bucket holding the given quantile"""
+        if not self.count:
+            return None
+        target = fraction * self.count
+        for bound, running in zip(self.bounds + (float('inf'),), self.cumulative()):
+            if running >= target:
+                return bound
+        return float('inf')
+
+
+def _redact(value):
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return '<bool>'
+    if isinstance(value, (int, float)):
+        return '<number>'
+    if isinstance(value, (datetime, date)):
+        return '<date>'
+    if isinstance(value, str):
+        return f'<str len={len(value)}>'
+    return f'<{type(value).__name__}>'
+
+
+class _Call:
+    __slots__ = ('method', 'started', 'failed')
+
+    def __init__(self, method: str):
+        self.method = method
+        self.started = time.perf_counter()
+        self.failed = False
+
+
+class Metrics:
+    """Registry for method and SQL statement metrics
+
+    slow_query_ms enables the slow-query log for statements that take at
+    least that long; bind values are logged as type placeholders unless
+    redact_binds is False.
+    """
+
+    def __init__(self, slow_query_ms: float = None, redact_binds: bool = True):
+        self.slow_query_ms = slow_query_ms
+        self.redact_binds = redact_binds
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._statement_keys: Dict[str, str] = {}
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.calls: Dict[str, int] = {}
+            self.errors: Dict[str, int] = {}
+            self.retries: Dict[str, int] = {}
+            self.latency: Dict[str, Histogram] = {}
+            self.statements: Dict[str, Dict] = {}
+
+    # --- methods ---
+
+    def begin(self, method: str) -> _Call:
+        call = _Call(method)
+        stack = getattr(self._local, 'calls', None)
+        if stack is None:
+            stack = self._local.calls = []
+        stack.append(call)
+        return call
+
+    def end(self, call: _Call, error: bool = False, elapsed: float = None):
+        stack = self._local.calls
+        if stack and stack[-1] is call:
+            stack.pop()
+        self.observe(call.method, time.perf_counter() - call.started if elapsed is None else elapsed,
+                     error or call.failed)
+
+    def mark_failed(self):
+        """Count the innermost running method call as an error (for handled failures)"""
+        stack = getattr(self._local, 'calls', None)
+        if stack:
+            stack[-1].failed = True
+
+    def mark_retry(self):
+        """Count one retried attempt (deadlock, busy, ...) of the innermost running method"""
+        stack = getattr(self._local, 'calls', None)
+        if stack:
+            with self._lock:
+                method = stack[-1].method
+                self.retries[method] = self.retries.get(method, 0) + 1
+
+    def observe(self, method: str, seconds: float, error: bool = False):
+        with self._lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+            if error:
+                self.errors[method] = self.errors.get(method, 0) + 1
+            histogram = self.latency.get(method)
+            if histogram is None:
+                histogram = self.latency[method] = Histogram()
+            histogram.observe(seconds)
+
+    # --- SQL statements ---
+
+    def statement_key(self, sql: str) -> str:
+        key = self._statement_keys.get(sql)
+        if key is None:
+            key = self._statement_keys[sql] = statement_name(sql) or ' '.join(sql.split())
+        return key
+
+    def merge_statements(self, pending: Dict[str, List]):
+        """Add per-statement [executions, round_trips, rows_fetched, seconds] counts"""
+        with self._lock:
+            for key, (executions, round_trips, rows, seconds) in pending.items():
+                stats = self.statements.get(key)
+                if stats is None:
+                    stats = self.statements[key] = {'executions': 0, 'round_trips': 0,
+                                                    'rows_fetched': 0, 'seconds': 0.0}
+                stats['executions'] += executions
+                stats['round_trips'] += round_trips
+                stats['rows_fetched'] += rows
+                stats['seconds'] += seconds
+
+    def slow_query(self, key: str, seconds: float, params):
+        if isinstance(params, dict):
+            binds = {name: (_redact(value) if self.redact_binds else value)
+                     for name, value in params.items()}
+        elif isinstance(params, (list, tuple)) and params and isinstance(params[0], (dict, list, tuple)):
+            binds = f'<{len(params)} rows>'
+        elif isinstance(params, (list, tuple)):
+            binds = [_redact(value) if self.redact_binds else value for value in params]
+        else:
+            binds = None
+        log_event(sql_log, logging.WARNING, 'slow_query',
+                  "Slow statement ({elapsed_ms:.1f} ms): {statement}",
+                  elapsed_ms=seconds * 1000, statement=key, binds=binds)
+
+    def session(self, session) -> '_InstrumentedSession':
+        """Wrap a backend session() so it yields (connection, InstrumentedCursor)"""
+        return _InstrumentedSession(session, self)
+
+    # --- export ---
+
+    def snapshot(self) -> Dict:
+        """Plain-dict copy of every counter, with approximate p50/p95/p99"""
+        with self._lock:
+            methods = {}
+            for method, histogram in self.latency.items():
+                methods[method] = {
+                    'calls': self.calls.get(method, 0),
+                    'errors': self.errors.get(method, 0),
+                    'retries': self.retries.get(method, 0),
+                    'seconds': histogram.total,
+                    'p50_le': histogram.quantile(0.50),
+                    'p95_le': histogram.quantile(0.95),
+                    'p99_le': histogram.quantile(0.99),
+                }
+            statements = {key: dict(stats) for key, stats in self.statements.items()}
+        return {'methods': methods, 'statements': statements}
+
+    def render_prometheus(self, prefix: str = 'bank') -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)"""
+        def label(value: str) -> str:
+            return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+        def bound(value: float) -> str:
+            return '+Inf' if value == float('inf') else repr(value)
+
+        lines = []
+        with self._lock:
+            methods = sorted(self.latency)
+            lines += [f"# HELP {prefix}_method_calls_total BankDatabase method calls",
+                      f"# TYPE {prefix}_method_calls_total counter"]
+            lines += [f'{prefix}_method_calls_total{{method="{m}"}} {self.calls.get(m, 0)}'
+                      for m in methods]
+            lines += [f"# HELP {prefix}_method_errors_total BankDatabase method calls that failed",
+                      f"# TYPE {prefix}_method_errors_total counter"]
+            lines += [f'{prefix}_method_errors_total{{method="{m}"}} {self.errors.get(m, 0)}'
+                      for m in methods]
+            lines += [f"# HELP {prefix}_method_retries_total Attempts retried after a deadlock "
+                      f"or lock timeout",
+                      f"# TYPE {prefix}_method_retries_total counter"]
+            lines += [f'{prefix}_method_retries_total{{method="{m}"}} {self.retries.get(m, 0)}'
+                      for m in methods]
+            lines += [f"# HELP {prefix}_method_latency_seconds BankDatabase method latency",
+                      f"# TYPE {prefix}_method_latency_seconds histogram"]
+            for m in methods:
+                histogram = self.latency[m]
+                for upper, running in zip(histogram.bounds + (float('inf'),),
+                                          histogram.cumulative()):
+                    lines.append(f'{prefix}_method_latency_seconds_bucket'
+                                 f'{{method="{m}",le="{bound(upper)}"}} {running}')
+                lines.append(f'{prefix}_method_latency_seconds_sum{{method="{m}"}} {histogram.total!r}')
+                lines.append(f'{prefix}_method_latency_seconds_count{{method="{m}"}} {histogram.count}')
+            for name, field, kind, help_text in (
+                    ('sql_executions_total', 'executions', 'counter', "SQL statement executions"),
+                    ('sql_round_trips_total', 'round_trips', 'counter',
+                     "SQL round trips (executes plus fetch batches)"),
+                    ('sql_rows_fetched_total', 'rows_fetched', 'counter', "Rows fetched per statement"),
+                    ('sql_seconds_total', 'seconds', 'counter', "Time spent executing per statement")):
+                lines += [f"# HELP {prefix}_{name} {help_text}", f"# TYPE {prefix}_{name} {kind}"]
+                for key in sorted(self.statements):
+                    lines.append(f'{prefix}_{name}{{statement="{label(key)}"}} '
+                                 f'{self.statements[key][field]!r}')
+        return '\n'.join(lines) + '\n'
+
+
+class InstrumentedCursor:
+    """Cursor proxy that counts statements locally; everything else passes through
+
+    Counts are kept on the proxy and merged into Metrics by flush(), which
+    the session wrapper calls once when the operation ends, so the shared
+    lock is taken once per session rather than once per statement.
+    """
+
+    def __init__(self, cursor, metrics: Metrics):
+        object.__setattr__(self, '_cursor', cursor)
+        object.__setattr__(self, '_metrics', metrics)
+        object.__setattr__(self, '_pending', {})
+        object.__setattr__(self, '_current', None)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._cursor, name, value)
+
+    def _begin(self, key: str) -> List:
+        # [executions, round_trips, rows_fetched, seconds]
+        stats = self._pending.get(key)
+        if stats is None:
+            stats = self._pending[key] = [0, 0, 0, 0.0]
+        object.__setattr__(self, '_current', stats)
+        return stats
+
+    def _done(self, stats: List, key: str, started: float, params):
+        elapsed = time.perf_counter() - started
+        stats[0] += 1
+        stats[1] += 1
+        stats[3] += elapsed
+        metrics = self._metrics
+        if metrics.slow_query_ms is not None and elapsed * 1000 >= metrics.slow_query_ms:
+            metrics.slow_query(key, elapsed, params)
+
+    def execute(self, sql, params=None, **kwargs):
+        key = self._metrics.statement_key(sql)
+        stats = self._begin(key)
+        started = time.perf_counter()
+        try:
+            if params is None:
+                return self._cursor.execute(sql, **kwargs)
+            return self._cursor.execute(sql, params, **kwargs)
+        finally:
+            self._done(stats, key, started, kwargs if params is None else params)
+
+    def executemany(self, sql, params, **kwargs):
+        params = params if isinstance(params, list) else list(params)
+        key = self._metrics.statement_key(sql)
+        stats = self._begin(key)
+        started = time.perf_counter()
+        try:
+            return self._cursor.executemany(sql, params, **kwargs)
+        finally:
+            self._done(stats, key, started, params)
+
+    def callproc(self, name, params=None, **kwargs):
+        key = f'CALL {name}'
+        stats = self._begin(key)
+        started = time.perf_counter()
+        try:
+            return self._cursor.callproc(name, params or [], **kwargs)
+        finally:
+            self._done(stats, key, started, params)
+
+    def _fetched(self, rows: int, round_trips: int = 1):
+        stats = self._current
+        if stats is not None:
+            stats[1] += round_trips
+            stats[2] += rows
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        self._fetched(0 if row is None else 1)
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._cursor.fetchmany(size) if size is not None else self._cursor.fetchmany()
+        self._fetched(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._fetched(len(rows))
+        return rows
+
+    def __iter__(self):
+        batch = max(1, getattr(self._cursor, 'arraysize', 1) or 1)
+        rows = 0
+        try:
+            for row in self._cursor:
+                rows += 1
+                yield row
+        finally:
+            self._fetched(rows, round_trips=rows // batch + 1)
+
+    def flush(self):
+        """Merge the counts gathered so far into Metrics"""
+        if self._pending:
+            self._metrics.merge_statements(self._pending)
+            object.__setattr__(self, '_pending', {})
+            object.__setattr__(self, '_current', None)
+
+
+class _InstrumentedSession:
+    __slots__ = ('_session', '_metrics', '_cursor')
+
+    def __init__(self, session, metrics: Metrics):
+        self._session = session
+        self._metrics = metrics
+
+    def __enter__(self):
+        connection, cursor = self._session.__enter__()
+        self._cursor = InstrumentedCursor(cursor, self._metrics)
+        return connection, self._cursor
+
+    def __exit__(self, *exc_info):
+        try:
+            return self._session.__exit__(*exc_info)
+        finally:
+            self._cursor.flush()
+
+
+def instrumented(function):
+    """Record calls, errors and latency of a BankDatabase method in self.metrics
+
+    Generator methods are timed over the time spent producing items, from
+    the first next() to exhaustion or close. Handled failures are counted
+    when the method calls Metrics.mark_failed() (see BankDatabase._failed).
+    """
+    name = function.__name__
+
+    if inspect.isgeneratorfunction(function):
+        @wraps(function)
+        def generator_wrapper(self, *args, **kwargs):
+            metrics = self.metrics
+            if metrics is None:
+                yield from function(self, *args, **kwargs)
+                return
+            inner = function(self, *args, **kwargs)
+            elapsed, error = 0.0, False
+            try:
+                while True:
+                    started = time.perf_counter()
+                    try:
+                        item = next(inner)
+                    except StopIteration:
+                        elapsed += time.perf_counter() - started
+                        return
+                    except Exception:
+                        elapsed += time.perf_counter() - started
+                        error = True
+                        raise
+                    elapsed += time.perf_counter() - started
+                    yield item
+            finally:
+                inner.close()
+                metrics.observe(name, elapsed, error)
+        return generator_wrapper
+
+    @wraps(function)
+    def wrapper(self, *args, **kwargs):
+        metrics = self.metrics
+        if metrics is None:
+            return function(self, *args, **kwargs)
+        call = metrics.begin(name)
+        error = True
+        try:
+            result = function(self, *args, **kwargs)
+            error = False
+            return result
+        finally:
+            metrics.end(call, error)
+    return wrapper
+
+
+def serve_prometheus(metrics: Metrics, port: int = 9464, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+    """Serve metrics.render_prometheus() at http://host:port/metrics from a daemon thread"""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = metrics.render_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name='bank-metrics', daemon=True).start()
+    return server
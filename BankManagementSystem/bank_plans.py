@@ -0,0 +1,196 @@
+"""
+Bank Account Management System - Query Plan Regression Check
+EXPLAINs every statement BankDatabase issues against a seeded embedded bank
+
+A synthetic bank is generated in a temporary SQLite database (no server
+needed), every public BankDatabase method is exercised while the engine's
+trace hook captures the SQL it runs, and each distinct statement is run
+through EXPLAIN QUERY PLAN. Plans are written to a JSON file, and the run
+fails if any statement full-scans Transactions or Accounts outside the
+methods that are meant to (ledger-wide verification and exports). It also
+fails if an exercised method captures no statement at all, so a trace
+filter that stops matching cannot pass as a clean run.
+
+Usage:
+    python bank_plans.py [--customers 2000] [--output query_plans.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from bank_backends import SQLiteBackend
+from bank_database import BankDatabase
+from bank_metrics import configure_logging
+from bank_synthetic import populate
+
+WATCHED_TABLES = {'transactions', 'transactions_archive', 'accounts'}
+
+# Methods whose job is a whole-ledger pass; full scans there are expected
+# (the dashboard snapshot is the account_statistics view, its periodic resync;
+# account_columns returns every account, read in primary key order)
+FULL_SCAN_ALLOWED = {'verify_aggregates', 'rebuild_aggregates', 'export_all_accounts',
+                     'get_dashboard_snapshot', 'account_columns'}
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_TABLE_REFS = re.compile(r'\b(?:FROM|JOIN|UPDATE|INTO)\s+(\w+)(?:\s+(?!ON\b|WHERE\b|SET\b|JOIN\b|VALUES\b)(\w+))?',
+                         re.IGNORECASE)
+_SCAN = re.compile(r'^SCAN (\w+)')
+
+
+def normalize(sql: str) -> str:
+    """Collapse whitespace and literals so executions of one statement group together"""
+    return ' '.join(_LITERALS.sub('?', sql).split())
+
+
+def full_scans(sql: str, plan: List[str]) -> List[str]:
+    """Watched tables that appear as a SCAN step in the plan"""
+    aliases = {}
+    for table, alias in _TABLE_REFS.findall(sql):
+        aliases[table.lower()] = table.lower()
+        if alias:
+            aliases[alias.lower()] = table.lower()
+    scanned = []
+    for step in plan:
+        match = _SCAN.match(step)
+        if match:
+            table = aliases.get(match.group(1).lower(), match.group(1).lower())
+            if table in WATCHED_TABLES:
+                scanned.append(table)
+    return scanned
+
+
+def exercise(db: BankDatabase) -> List:
+    """(label, callable) pairs covering every public method"""
+    since = datetime.now() - timedelta(days=30)
+    until = datetime.now() + timedelta(days=1)
+    return [
+        ('customer_login', lambda: db.customer_login('customer1001@synthetic.bank', 'synthetic')),
+        ('register_customer', lambda: db.register_customer(
+            'Plan Check', 'plan.check@example.com', '9000000000', 'Nowhere', '1990-01-01', 'pw')),
+        ('create_account', lambda: db.create_account(1001, 'Savings', 500)),
+        ('get_customer_accounts', lambda: db.get_customer_accounts(1001)),
+        ('get_account_details', lambda: db.get_account_details('ACC0000100001')),
+        ('get_transaction_history', lambda: db.get_transaction_history('ACC0000100001')),
+        ('get_mini_statement', lambda: db.get_mini_statement('ACC0000100001')),
+        ('iter_transaction_pages', lambda: list(db.iter_transaction_pages('ACC0000100001', page_size=5))),
+        ('count_transactions', lambda: db.count_transactions('ACC0000100001', since, until)),
+        ('get_transaction_page', lambda: db.get_transaction_page('ACC0000100001', offset=5, limit=5)),
+        ('sorted_transaction_page', lambda: db.get_transaction_page(
+            'ACC0000100001', limit=5, sort='amount', descending=False, start_date=since)),
+        ('get_account_summary', lambda: db.get_account_summary(1001)),
+        ('deposit_money', lambda: db.deposit_money('ACC0000100001', 100)),
+        ('withdraw_money', lambda: db.withdraw_money('ACC0000100001', 50)),
+        ('deposit_many', lambda: db.deposit_many([('ACC0000100002', 10, 'plan')] * 3)),
+        ('withdraw_many', lambda: db.withdraw_many([('ACC0000100002', 5, 'plan')] * 3)),
+        ('transfer_money', lambda: db.transfer_money('ACC0000100001', 'ACC0000100002', 10)),
+        ('transfer_many', lambda: db.transfer_many([('ACC0000100001', 'ACC0000100003', 1)] * 3)),
+        ('post_group', lambda: db.post_group([('Deposit', ('ACC0000100002', 10, 'plan')),
+                                              ('Transfer', ('ACC0000100002', 'ACC0000100003', 1))])),
+        ('get_bank_stats', lambda: db.get_bank_stats()),
+        ('get_dashboard_snapshot', lambda: db.get_dashboard_snapshot()),
+        ('get_dashboard_delta', lambda: db.get_dashboard_delta(0, 0)),
+        ('update_customer_info', lambda: db.update_customer_info(1001, phone='9999999999')),
+        ('export_accounts', lambda: list(db.iter_statement_batches(
+            since, until, ['ACC0000100001', 'ACC0000100002']))),
+        ('export_all_accounts', lambda: list(db.iter_statement_batches(since, until))),
+        ('ledger_columns', lambda: db.ledger_columns(since, until)),
+        ('ledger_columns_for_accounts', lambda: db.ledger_columns(
+            since, until, ['ACC0000100001', 'ACC0000100002'])),
+        ('account_columns', lambda: db.account_columns()),
+        ('verify_aggregates', lambda: db.verify_aggregates()),
+        ('rebuild_aggregates', lambda: db.rebuild_aggregates()),
+        ('archive_transactions', lambda: db.archive_transactions(horizon_days=365, batch_size=500)),
+        ('archived_history', lambda: list(db.iter_transaction_pages('ACC0000100001', page_size=50))),
+        ('archived_transaction_page', lambda: db.get_transaction_page('ACC0000100001', offset=20)),
+        ('archived_statement', lambda: list(db.iter_statement_batches(
+            since - timedelta(days=700), until, ['ACC0000100001']))),
+    ]
+
+
+def check_plans(customers: int = 2000, accounts_per_customer: int = 3,
+                transactions_per_account: int = 20) -> Dict:
+    """Seed a bank, capture every statement and EXPLAIN it"""
+    statements: Dict[str, Dict] = {}
+    current = {'method': None}
+    captured: Dict[str, int] = {}
+
+    def trace(sql):
+        text = sql.strip()
+        # Catalog statements start with their /* bank:<name> */ tag
+        if current['method'] is None or not re.match(
+                r'(?:/\*.*?\*/\s*)?(SELECT|INSERT|UPDATE|DELETE|WITH)\b', text, re.IGNORECASE):
+            return
+        entry = statements.setdefault(normalize(text), {'sql': text, 'methods': set()})
+        entry['methods'].add(current['method'])
+        captured[current['method']] += 1
+
+    directory = tempfile.mkdtemp(prefix='bms_plans_')
+    backend = SQLiteBackend(os.path.join(directory, 'bank.db'), trace=trace)
+    db = BankDatabase(backend=backend)
+    with contextlib.redirect_stdout(io.StringIO()):
+        db.connect()
+        populate(db, customers=customers, accounts_per_customer=accounts_per_customer,
+                 transactions_per_account=transactions_per_account)
+        with backend.session() as (connection, cursor):
+            cursor.execute("ANALYZE")
+            connection.commit()
+        for label, call in exercise(db):
+            current['method'] = label
+            captured.setdefault(label, 0)
+            call()
+        current['method'] = None
+
+    with backend.session() as (connection, cursor):
+        report = {'statements': [], 'violations': [],
+                  'silent': sorted(label for label, count in captured.items() if not count)}
+        for key, entry in sorted(statements.items()):
+            cursor.execute("EXPLAIN QUERY PLAN " + entry['sql'])
+            plan = [row[3] for row in cursor.fetchall()]
+            methods = sorted(entry['methods'])
+            scans = full_scans(entry['sql'], plan)
+            report['statements'].append({'statement': key, 'methods': methods,
+                                         'plan': plan, 'full_scans': scans})
+            if scans and not set(methods) <= FULL_SCAN_ALLOWED:
+                report['violations'].append({'statement': key, 'methods': methods,
+                                             'full_scans': scans, 'plan': plan})
+    with contextlib.redirect_stdout(io.StringIO()):
+        db.disconnect()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query plan regression check")
+    parser.add_argument('--customers', type=int, default=2000)
+    parser.add_argument('--output', default='query_plans.json',
+                        help="where to record the captured plans")
+    args = parser.parse_args()
+    # Benchmark output only; the operations' own log lines are noise here
+    configure_logging(logging.CRITICAL)
+
+    report = check_plans(customers=args.customers)
+    with open(args.output, 'w', encoding='utf-8') as handle:
+        json.dump(report, handle, indent=2)
+    print(f"Checked {len(report['statements'])} statements, plans written to {args.output}")
+    for violation in report['violations']:
+        print(f"❌ Full scan of {', '.join(violation['full_scans'])} in "
+              f"{', '.join(violation['methods'])}:\n   {violation['statement']}\n   "
+              + '\n   '.join(violation['plan']))
+    if report['silent']:
+        print(f"❌ No statements captured for {', '.join(report['silent'])} "
+              f"(is the trace filter still matching?)")
+    if not report['violations']:
+        print("✅ No unexpected full scans on Transactions or Accounts")
+    return 1 if report['violations'] or report['silent'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
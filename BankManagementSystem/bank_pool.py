@@ -0,0 +1,194 @@
+"""
+Bank Account Management System - Session Pool Concurrency Check
+Shows that pooled sessions really run side by side, and how reads scale with pool_max
+
+For each pool size in --pool-sizes the run opens a fresh BankDatabase
+whose backend pool holds at most that many sessions, and:
+
+  - concurrency: pool_max threads each check out a session and wait on a
+    barrier inside it. The barrier only opens if the pool handed out
+    pool_max distinct sessions at the same time. One extra thread must
+    then be kept waiting while all of them are held.
+  - throughput: --threads threads read account details and recent
+    history on random accounts for --seconds. Operations per second per
+    pool size show how far a bigger pool lets the same load scale; the
+    last pool size has to reach at least half the ideal speedup over
+    the first.
+
+The default is a scratch SQLite bank (a WAL file with its own connection
+pool). In-process SQLite has no network round trip, so its reads are
+bound by Python itself and gain nothing from more sessions. Instead,
+--round-trip-ms makes every statement hold its session that long,
+standing in for a server call. The session pool then limits throughput,
+as it does against a real server. --oracle runs the same sweep against
+the Oracle pool (pooled=True).
+
+Usage:
+    python bank_pool.py --pool-sizes 1 2 4 8 16 --threads 16 --seconds 5 [--round-trip-ms 2]
+    python bank_pool.py --oracle
+"""
+
+import argparse
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List
+
+from bank_backends import SQLiteBackend
+from bank_database import BankDatabase
+from bank_metrics import configure_logging
+from bank_synthetic import populate
+
+
+def check(name: str, ok: bool, detail: str) -> bool:
+    print(f"{'✅' if ok else '❌'} {name}: {detail}")
+    return ok
+
+
+def sessions_overlap(db: BankDatabase, sessions: int, wait: float) -> bool:
+    """True if sessions threads could all hold a session at the same moment"""
+    barrier = threading.Barrier(sessions, timeout=wait)
+    held = []
+    errors = []
+
+    def hold():
+        try:
+            with db.backend.session() as (connection, cursor):
+                held.append(id(connection))
+                barrier.wait()
+        except Exception as error:
+            # The barrier timed out, or was broken by a thread that gave up
+            barrier.abort()
+            errors.append(error)
+
+    threads = [threading.Thread(target=hold) for _ in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return not errors and len(set(held)) == sessions
+
+
+def account_sample(db: BankDatabase, count: int = 1000) -> List[str]:
+    with db.backend.session() as (connection, cursor):
+        cursor.execute(db.backend.prepare(
+            "SELECT account_number FROM Accounts WHERE status = 'Active' "
+            "ORDER BY account_id FETCH FIRST :count ROWS ONLY"), {'count': count})
+        return [row[0] for row in cursor.fetchall()]
+
+
+def read_throughput(db: BankDatabase, accounts: List[str], threads: int,
+                    seconds: float) -> Dict:
+    """Operations/sec of threads readers sharing db for seconds"""
+    counts = [0] * threads
+    failures = [0] * threads
+    stop = threading.Event()
+
+    def reader(slot: int):
+        rng = random.Random(slot)
+        while not stop.is_set():
+            account = rng.choice(accounts)
+            ok = (db.get_account_details(account) is not None
+                  and db.get_transaction_history(account, limit=20) is not None)
+            counts[slot] += ok
+            failures[slot] += not ok
+
+    workers = [threading.Thread(target=reader, args=(slot,)) for slot in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    time.sleep(seconds)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    return {'ops_per_sec': sum(counts) / elapsed, 'failures': sum(failures)}
+
+
+def sweep(open_db: Callable[[int], BankDatabase], pool_sizes: List[int], threads: int,
+          seconds: float, wait: float, expect_scaling: bool = True) -> bool:
+    results = []
+    rates = {}
+    for pool_max in pool_sizes:
+        db = open_db(pool_max)
+        if not db.connect():
+            return check(f"pool_max={pool_max}", False, "could not connect")
+        try:
+            overlap = sessions_overlap(db, pool_max, wait)
+            bounded = not sessions_overlap(db, pool_max + 1, wait)
+            results.append(check(
+                f"pool_max={pool_max} concurrency", overlap and bounded,
+                f"{pool_max} sessions {'held at once' if overlap else 'NOT held at once'}, "
+                f"session {pool_max + 1} {'kept waiting' if bounded else 'NOT kept waiting'}"))
+            throughput = read_throughput(db, account_sample(db), threads, seconds)
+            rates[pool_max] = throughput['ops_per_sec']
+            results.append(check(
+                f"pool_max={pool_max} throughput", throughput['failures'] == 0,
+                f"{throughput['ops_per_sec']:,.0f} reads/sec from {threads} threads "
+                f"({rates[pool_max] / rates[pool_sizes[0]]:.2f}x pool_max={pool_sizes[0]}), "
+                f"{throughput['failures']} failed"))
+        finally:
+            db.disconnect()
+    smallest, largest = pool_sizes[0], pool_sizes[-1]
+    if expect_scaling and min(largest, threads) > smallest:
+        # Half the ideal speedup, capped by the readers there are to share the pool
+        wanted = min(largest, threads) / smallest / 2
+        results.append(check(
+            "scaling", rates[largest] >= rates[smallest] * wanted,
+            f"pool_max={largest} ran {rates[largest] / rates[smallest]:.2f}x "
+            f"pool_max={smallest} (wanted at least {wanted:.1f}x)"))
+    return all(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Session pool concurrency and pool_max sweep")
+    parser.add_argument('--pool-sizes', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    parser.add_argument('--threads', type=int, default=16, help="readers in the throughput run")
+    parser.add_argument('--seconds', type=float, default=3.0, help="throughput run per pool size")
+    parser.add_argument('--wait', type=float, default=2.0,
+                        help="how long the concurrency check's sessions wait for each other")
+    parser.add_argument('--customers', type=int, default=2000, help="scratch SQLite bank size")
+    parser.add_argument('--round-trip-ms', type=float, default=2.0,
+                        help="simulated server time per SQLite statement (0: none)")
+    parser.add_argument('--oracle', action='store_true',
+                        help="sweep the Oracle session pool instead of a scratch SQLite bank")
+    args = parser.parse_args()
+    # Check output only; the operations' own log lines are noise here
+    configure_logging(logging.CRITICAL)
+
+    if args.oracle:
+        ok = sweep(lambda pool_max: BankDatabase(
+            "SYS", "oracle@express", "localhost:1521/XE", pooled=True, pool_min=pool_max,
+            pool_max=pool_max, metrics=False),
+            args.pool_sizes, args.threads, args.seconds, args.wait)
+        return 0 if ok else 1
+
+    directory = tempfile.mkdtemp(prefix='bms_pool_')
+    try:
+        path = os.path.join(directory, 'pool.db')
+        setup = BankDatabase(backend=SQLiteBackend(path), metrics=False)
+        setup.connect()
+        try:
+            populate(setup, customers=args.customers, accounts_per_customer=3,
+                     transactions_per_account=20)
+        finally:
+            setup.disconnect()
+        # The trace hook runs inside each statement, while its session is held
+        round_trip = ((lambda sql: time.sleep(args.round_trip_ms / 1000))
+                      if args.round_trip_ms > 0 else None)
+        ok = sweep(lambda pool_max: BankDatabase(
+            backend=SQLiteBackend(path, pool_max=pool_max, trace=round_trip), metrics=False),
+            args.pool_sizes, args.threads, args.seconds, args.wait,
+            expect_scaling=args.round_trip_ms > 0)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""
+Bank Account Management System - Typed Rows
+Compact record types for the typed_rows result mode, and their benchmark
+
+BankDatabase(..., typed_rows=True) returns AccountRow and TransactionRow
+records from get_customer_accounts, get_transaction_history and the
+history iterators instead of one dict per row. Records are named tuples:
+no per-row key table, immutable (so the account cache can hand out the
+same list every time), and amounts are Decimal to the paisa rather than
+float, so money read back is exactly the NUMBER(15,2) the database holds.
+Transaction types are interned: a long history shares one string per type.
+
+    for row in db.get_transaction_history('ACC0000100001', limit=1000):
+        row.amount          # Decimal('2500.00')
+        row.as_dict()       # the dict the default mode returns
+
+Backends build the records in records(cursor, record, sql, params) with
+record.from_row(). On Oracle an output type handler fetches the scaled
+NUMBER columns as Decimal and from_row is the cursor's rowfactory; SQLite
+stores amounts as REAL, which from_row formats to the paisa.
+
+Usage (benchmark: memory per row and fetch throughput, dict vs typed):
+    python bank_rows.py --rows 1000000
+"""
+
+import argparse
+import gc
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, NamedTuple, Sequence
+
+DATE_FORMAT = '%d-%b-%Y %H:%M:%S'
+
+CENT = Decimal('0.01')
+
+
+def money(value) -> Decimal:
+    """Decimal to the paisa for a fetched amount (None stays None)"""
+    if value is None:
+        return None
+    if isinstance(value, Decimal):
+        return value.quantize(CENT)
+    # REAL amounts were stored rounded to the paisa, so this is exact
+    return Decimal(f'{value:.2f}')
+
+
+class AccountRow(NamedTuple):
+    """One row of get_customer_accounts"""
+    account_id: int
+    account_number: str
+    account_type: str
+    balance: Decimal
+    interest_rate: Decimal
+    status: str
+    created_date: str
+
+    @classmethod
+    def from_row(cls, row: Sequence) -> 'AccountRow':
+        return cls(row[0], row[1], row[2], money(row[3]), money(row[4]), row[5], row[6])
+
+    def as_dict(self) -> Dict:
+        return {
+            'account_id': self.account_id,
+            'account_number': self.account_number,
+            'account_type': self.account_type,
+            'balance': float(self.balance),
+            'interest_rate': float(self.interest_rate),
+            'status': self.status,
+            'created_date': self.created_date
+        }
+
+
+class TransactionRow(NamedTuple):
+    """One ledger row of the transaction history (date is a datetime)"""
+    transaction_id: int
+    type: str
+    amount: Decimal
+    balance_after: Decimal
+    description: str
+    reference: str
+    date: datetime
+
+    @classmethod
+    def from_row(cls, row: Sequence) -> 'TransactionRow':
+        return cls(row[0], sys.intern(row[1]), money(row[2]), money(row[3]),
+                   row[4], row[5], row[6])
+
+    def as_dict(self) -> Dict:
+        return {
+            'transaction_id': self.transaction_id,
+            'type': self.type,
+            'amount': float(self.amount),
+            'balance_after': float(self.balance_after),
+            'description': self.description,
+            'reference': self.reference,
+            'date': self.date.strftime(DATE_FORMAT).upper()
+        }
+
+
+# --- benchmark ---
+
+def build_history(db, rows: int) -> str:
+    """Open an account and give it a ledger of rows transactions, oldest first"""
+    account = db.create_account(1001, 'Savings', 1000.00)
+    started = datetime.now() - timedelta(seconds=rows)
+    with db.backend.session() as (connection, cursor):
+        cursor.execute(db.backend.prepare(
+            "SELECT account_id FROM Accounts WHERE account_number = :account_number"
+        ), {'account_number': account})
+        (account_id,) = cursor.fetchone()
+        insert = db.backend.prepare("""
+            INSERT INTO Transactions
+            (transaction_id, account_id, transaction_type, amount, balance_after,
+             transaction_date, description, reference_account)
+            VALUES (:transaction_id, :account_id, 'Deposit', :amount, :balance_after,
+                    :transaction_date, 'Benchmark deposit', NULL)
+            """)
+        for offset in range(0, rows, 50000):
+            count = min(50000, rows - offset)
+            ids = db.backend.allocate_ids(cursor, 'transaction_seq', count)
+            cursor.executemany(insert, [
+                {'transaction_id': transaction_id, 'account_id': account_id,
+                 'amount': 10.25, 'balance_after': 1000.00 + 10.25 * (offset + index + 1),
+                 'transaction_date': started + timedelta(seconds=offset + index)}
+                for index, transaction_id in enumerate(ids)])
+            connection.commit()
+    return account
+
+
+def measure_memory(db, account: str, rows: int) -> float:
+    """Bytes retained per row by a get_transaction_history result"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    history = db.get_transaction_history(account, limit=rows)
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return retained / len(history)
+
+
+def measure_throughput(db, account: str, page_size: int) -> float:
+    """Rows/second streaming the whole history through iter_transaction_pages"""
+    started = time.perf_counter()
+    fetched = sum(len(page) for page, _ in db.iter_transaction_pages(account, page_size))
+    return fetched / (time.perf_counter() - started)
+
+
+def main():
+    # Imported here: bank_database imports this module for the record types
+    from bank_backends import SQLiteBackend
+    from bank_database import BankDatabase
+    from bank_metrics import configure_logging
+
+    parser = argparse.ArgumentParser(description="Dict rows vs typed rows on a long history")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--memory-rows', type=int, default=100_000,
+                        help="rows held in memory for the bytes-per-row measurement")
+    parser.add_argument('--page-size', type=int, default=5000)
+    args = parser.parse_args()
+    # Benchmark output only; the operations' own log lines are noise here
+    configure_logging(logging.CRITICAL)
+
+    directory = tempfile.mkdtemp(prefix='bms_rows_')
+    results = {}
+    try:
+        path = os.path.join(directory, 'rows.db')
+        setup = BankDatabase(backend=SQLiteBackend(path), metrics=False)
+        setup.connect()
+        try:
+            started = time.perf_counter()
+            account = build_history(setup, args.rows)
+            print(f"{args.rows:,} ledger rows built in {time.perf_counter() - started:.1f}s")
+        finally:
+            setup.disconnect()
+        for typed in (False, True):
+            db = BankDatabase(backend=SQLiteBackend(path), metrics=False, typed_rows=typed)
+            db.connect()
+            try:
+                results[typed] = (measure_memory(db, account, min(args.memory_rows, args.rows)),
+                                  measure_throughput(db, account, args.page_size))
+                sample = db.get_transaction_history(account, limit=1)[0]
+            finally:
+                db.disconnect()
+            label = 'typed rows' if typed else 'dict rows'
+            print(f"{label:<12} {results[typed][0]:>7.0f} bytes/row  "
+                  f"{results[typed][1]:>12,.0f} rows/sec   e.g. {sample!r}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    (dict_bytes, dict_rate), (typed_bytes, typed_rate) = results[False], results[True]
+    ok = typed_bytes < dict_bytes
+    print(f"{'✅' if ok else '❌'} typed rows use {typed_bytes / dict_bytes:.0%} of the memory "
+          f"of dict rows, at {typed_rate / dict_rate:.2f}x the fetch throughput")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,439 @@
+"""
+Bank Account Management System - SQL Statement Catalog
+Every statement BankDatabase and AsyncBankDatabase run, registered once by name
+
+Statements are fixed texts in the Oracle dialect (backends adapt them with
+prepare()). Nothing is assembled per call: a statement that varies by
+ledger tier or by an optional filter is registered once per variant, and
+optional values are bound as NULL rather than left out. The set of texts
+the server ever sees is therefore fixed, and STATEMENT_CACHE_SIZE - the
+catalog plus the stored procedure calls, with headroom - is what the
+backends size their statement caches to, so no catalog statement is
+re-parsed once a connection has run it.
+
+Each text starts with a /* bank:<name> */ tag. Metrics counts executions
+under that name, and on Oracle the tag finds the statements in V$SQLAREA
+for their server-side parse counts (see 'statement_parse_counts').
+
+    cursor.execute(backend.prepare(sql('customer_login')), {...})
+"""
+
+import re
+from typing import Dict, Optional
+
+STATEMENTS: Dict[str, str] = {}
+
+_TAG = re.compile(r'^/\* bank:(\w+) \*/')
+
+
+def register(name: str, text: str) -> str:
+    """Add a named statement to the catalog and return its tagged text"""
+    if name in STATEMENTS:
+        raise ValueError(f"SQL statement {name!r} is already registered")
+    STATEMENTS[name] = f"/* bank:{name} */ {text.strip()}"
+    return STATEMENTS[name]
+
+
+def sql(name: str) -> str:
+    """The catalog text of a statement (KeyError for unknown names)"""
+    return STATEMENTS[name]
+
+
+def statement_name(text: str) -> Optional[str]:
+    """Catalog name of a statement text, or None for SQL from outside the catalog"""
+    match = _TAG.match(text)
+    return match.group(1) if match else None
+
+
+# --- customers and accounts ---
+
+register('customer_login', """
+    SELECT customer_id, full_name, email, phone, address
+    FROM Customers
+    WHERE email = :email AND password_hash = :password AND status = 'Active'
+    """)
+
+register('register_customer', """
+    INSERT INTO Customers
+    (customer_id, full_name, email, phone, address, date_of_birth,
+     created_date, password_hash, status)
+    VALUES (customer_seq.NEXTVAL, :full_name, :email, :phone, :address,
+            TO_DATE(:dob, 'YYYY-MM-DD'), SYSDATE, :password, 'Active')
+    """)
+
+# One shape whichever fields are given: a NULL bind keeps the current value
+register('update_customer_contact', """
+    UPDATE Customers
+    SET phone = NVL(:phone, phone),
+        address = NVL(:address, address)
+    WHERE customer_id = :customer_id
+    """)
+
+register('customer_accounts', """
+    SELECT a.account_id, a.account_number, a.account_type,
+           a.balance, a.interest_rate, a.status,
+           TO_CHAR(a.created_date, 'DD-MON-YYYY') as created_date
+    FROM Accounts a
+    WHERE a.customer_id = :customer_id
+    ORDER BY a.created_date DESC
+    """)
+
+register('account_details', """
+    SELECT c.full_name, c.email, c.phone,
+           a.account_number, a.account_type, a.balance,
+           a.interest_rate, a.status,
+           TO_CHAR(a.created_date, 'DD-MON-YYYY') as created,
+           c.customer_id
+    FROM Accounts a
+    JOIN Customers c ON a.customer_id = c.customer_id
+    WHERE a.account_number = :account_number
+    """)
+
+register('account_id', """
+    SELECT account_id FROM Accounts WHERE account_number = :account_number
+    """)
+
+# Transaction counts come from the trigger-maintained counters
+register('account_summary', """
+    SELECT COUNT(CASE WHEN a.status = 'Active' THEN 1 END) as total_accounts,
+           SUM(CASE WHEN a.status = 'Active' THEN a.balance END) as total_balance,
+           SUM(ac.transaction_count) as total_transactions
+    FROM Accounts a
+    JOIN Account_Counters ac ON ac.account_id = a.account_id
+    WHERE a.customer_id = :customer_id
+    """)
+
+# --- ledger reads, one statement per tier (see BankDatabase.LEDGER_TIERS) ---
+
+_HISTORY = """
+    SELECT t.transaction_id, t.transaction_type, t.amount,
+           t.balance_after, t.description, t.reference_account,
+           {date}
+    FROM {ledger} t
+    JOIN Accounts a ON t.account_id = a.account_id
+    WHERE a.account_number = :account_number
+    ORDER BY t.transaction_date DESC, t.transaction_id DESC
+    FETCH FIRST :limit ROWS ONLY
+    """
+
+_HISTORY_PAGE = """
+    SELECT t.transaction_id, t.transaction_type, t.amount,
+           t.balance_after, t.description, t.reference_account,
+           t.transaction_date
+    FROM {ledger} t
+    WHERE t.account_id = :account_id
+      AND t.transaction_date <= :last_date
+      AND (t.transaction_date < :last_date OR t.transaction_id < :last_id)
+    ORDER BY t.transaction_date DESC, t.transaction_id DESC
+    FETCH FIRST :page_size ROWS ONLY
+    """
+
+# history_rows* return the raw date, for typed rows (see bank_rows.py)
+for _tier, _suffix in (('Transactions', ''), ('Transactions_Archive', '_archive')):
+    register('transaction_history' + _suffix, _HISTORY.format(
+        ledger=_tier, date="TO_CHAR(t.transaction_date, 'DD-MON-YYYY HH24:MI:SS') as trans_date"))
+    register('history_rows' + _suffix, _HISTORY.format(ledger=_tier, date='t.transaction_date'))
+    register('history_page' + _suffix, _HISTORY_PAGE.format(ledger=_tier))
+
+# One page of an account's history in [start_date, end_date), at any offset
+# and in the order of any column (BankDatabase.get_transaction_page); the
+# date bounds are always bound, so a filter is not a separate statement
+HISTORY_SORT_COLUMNS = {
+    'date': 't.transaction_date',
+    'type': 't.transaction_type',
+    'amount': 't.amount',
+    'balance_after': 't.balance_after',
+    'description': 't.description',
+}
+
+_HISTORY_WINDOW = """
+    SELECT t.transaction_id, t.transaction_type, t.amount,
+           t.balance_after, t.description, t.reference_account,
+           t.transaction_date
+    FROM {ledger} t
+    WHERE t.account_id = :account_id
+      AND t.transaction_date >= :start_date
+      AND t.transaction_date < :end_date
+    ORDER BY {column} {direction}, t.transaction_id {direction}
+    OFFSET :offset ROWS FETCH NEXT :limit ROWS ONLY
+    """
+
+_HISTORY_COUNT = """
+    SELECT COUNT(*)
+    FROM {ledger} t
+    WHERE t.account_id = :account_id
+      AND t.transaction_date >= :start_date
+      AND t.transaction_date < :end_date
+    """
+
+for _tier, _suffix in (('Transactions', ''), ('Transactions_Archive', '_archive')):
+    register('history_count' + _suffix, _HISTORY_COUNT.format(ledger=_tier))
+
+for _ledger, _suffix in (
+        ('Transactions', ''),
+        ('(SELECT * FROM Transactions UNION ALL SELECT * FROM Transactions_Archive)',
+         '_tiered')):
+    for _key, _column in HISTORY_SORT_COLUMNS.items():
+        for _direction in ('ASC', 'DESC'):
+            register(f'history_window{_suffix}_{_key}_{_direction.lower()}',
+                     _HISTORY_WINDOW.format(ledger=_ledger, column=_column,
+                                            direction=_direction))
+
+register('archive_range_probe', """
+    SELECT 1 FROM Transactions_Archive
+    WHERE transaction_date >= :start_date AND transaction_date < :end_date
+    FETCH FIRST 1 ROWS ONLY
+    """)
+
+_STATEMENT_ROWS = """
+    SELECT t.transaction_id, t.transaction_date, a.account_number,
+           a.account_type, c.customer_id, c.full_name,
+           t.transaction_type, t.amount, t.balance_after,
+           t.description, t.reference_account
+    FROM {ledger} t
+    JOIN Accounts a ON t.account_id = a.account_id
+    JOIN Customers c ON a.customer_id = c.customer_id
+    WHERE t.transaction_date >= :start_date
+      AND t.transaction_date < :end_date
+    {account_filter}
+    ORDER BY t.account_id, t.transaction_date, t.transaction_id
+    """
+
+for _ledger, _suffix in (
+        ('Transactions', ''),
+        ('(SELECT * FROM Transactions UNION ALL SELECT * FROM Transactions_Archive)',
+         '_tiered')):
+    register('statement_rows' + _suffix,
+             _STATEMENT_ROWS.format(ledger=_ledger, account_filter=''))
+    register('statement_rows' + _suffix + '_for_accounts', _STATEMENT_ROWS.format(
+        ledger=_ledger,
+        account_filter="AND a.account_number IN (SELECT column_value FROM TABLE(:accounts))"))
+
+# --- columnar analytics (BankDatabase.ledger_columns / account_columns) ---
+
+# String columns come back as their index in these tuples, so every column
+# of these statements is numeric and fetches straight into an array
+ACCOUNT_TYPES = ('Savings', 'Current', 'Fixed Deposit')
+TRANSACTION_TYPES = ('Deposit', 'Withdrawal', 'Transfer-In', 'Transfer-Out', 'Interest')
+
+# Transaction types that add to the balance; the rest take from it
+INFLOW_TYPES = ('Deposit', 'Transfer-In', 'Interest')
+
+
+def _code(column: str, values) -> str:
+    whens = ' '.join(f"WHEN '{value}' THEN {index}" for index, value in enumerate(values))
+    return f"CASE {column} {whens} END"
+
+
+_LEDGER_SLICE = f"""
+    SELECT t.account_id,
+           {_code('a.account_type', ACCOUNT_TYPES)} AS account_type,
+           {_code('t.transaction_type', TRANSACTION_TYPES)} AS transaction_type,
+           t.amount, t.balance_after, t.transaction_date
+    FROM {{ledger}} t
+    JOIN Accounts a ON t.account_id = a.account_id
+    WHERE t.transaction_date >= :start_date
+      AND t.transaction_date < :end_date
+    {{account_filter}}
+    ORDER BY t.account_id, t.transaction_date, t.transaction_id
+    """
+
+for _ledger, _suffix in (
+        ('Transactions', ''),
+        ('(SELECT * FROM Transactions UNION ALL SELECT * FROM Transactions_Archive)',
+         '_tiered')):
+    register('ledger_columns' + _suffix,
+             _LEDGER_SLICE.format(ledger=_ledger, account_filter=''))
+    register('ledger_columns' + _suffix + '_for_accounts', _LEDGER_SLICE.format(
+        ledger=_ledger,
+        account_filter="AND a.account_number IN (SELECT column_value FROM TABLE(:accounts))"))
+
+register('account_columns', f"""
+    SELECT account_id, {_code('account_type', ACCOUNT_TYPES)} AS account_type,
+           balance, interest_rate,
+           CASE status WHEN 'Active' THEN 1 ELSE 0 END AS active
+    FROM Accounts
+    ORDER BY account_id
+    """)
+
+# --- ledger writes outside the procedures (transfer_many) ---
+
+register('set_account_balance', """
+    UPDATE Accounts SET balance = :balance WHERE account_id = :account_id
+    """)
+
+register('insert_ledger_row', """
+    INSERT INTO Transactions
+    (transaction_id, account_id, transaction_type, amount, balance_after,
+     transaction_date, description, reference_account)
+    VALUES (transaction_seq.NEXTVAL, :account_id, :transaction_type, :amount,
+            :balance_after, SYSDATE, :description, :reference)
+    """)
+
+# --- running aggregates ---
+
+# Reads the 16 trigger-maintained Bank_Totals slots, not the ledger
+register('bank_totals', """
+    SELECT NVL(SUM(active_accounts), 0) AS total_active_accounts,
+           NVL(SUM(total_balance), 0) AS total_balance,
+           NVL(SUM(total_transactions), 0) AS total_transactions
+    FROM Bank_Totals
+    """)
+
+# Aggregates recomputed from the base tables, for verify/rebuild
+register('actual_totals', """
+    SELECT
+        (SELECT COUNT(account_id) FROM Accounts WHERE status = 'Active'),
+        (SELECT NVL(SUM(balance), 0) FROM Accounts),
+        (SELECT COUNT(transaction_id) FROM Transactions) +
+        (SELECT COUNT(transaction_id) FROM Transactions_Archive)
+    FROM DUAL
+    """)
+
+register('counter_drift', """
+    SELECT COUNT(*)
+    FROM Accounts a
+    LEFT JOIN Account_Counters ac ON ac.account_id = a.account_id
+    WHERE NVL(ac.transaction_count, -1) <>
+          (SELECT COUNT(*) FROM Transactions t WHERE t.account_id = a.account_id) +
+          (SELECT COUNT(*) FROM Transactions_Archive x WHERE x.account_id = a.account_id)
+    """)
+
+register('clear_account_counters', "DELETE FROM Account_Counters")
+
+register('rebuild_account_counters', """
+    INSERT INTO Account_Counters (account_id, transaction_count)
+    SELECT a.account_id,
+           (SELECT COUNT(*) FROM Transactions t WHERE t.account_id = a.account_id) +
+           (SELECT COUNT(*) FROM Transactions_Archive x
+            WHERE x.account_id = a.account_id)
+    FROM Accounts a
+    """)
+
+register('clear_bank_totals', "DELETE FROM Bank_Totals")
+
+register('insert_bank_totals', """
+    INSERT INTO Bank_Totals (slot, active_accounts, total_balance, total_transactions)
+    VALUES (:slot, :active, :balance, :transactions)
+    """)
+
+# --- live admin dashboard (BankDatabase.get_dashboard_snapshot / _delta) ---
+
+# Counters plus the high-water marks the next delta starts from, read by
+# one statement so they describe the same moment
+register('dashboard_snapshot', """
+    SELECT NVL(SUM(active_accounts), 0), NVL(SUM(total_balance), 0),
+           NVL(SUM(total_transactions), 0),
+           (SELECT NVL(MAX(transaction_id), 0) FROM Transactions),
+           (SELECT NVL(MAX(account_id), 0) FROM Accounts)
+    FROM Bank_Totals
+    """)
+
+register('dashboard_type_stats', """
+    SELECT account_type, total_accounts, total_balance, average_balance,
+           highest_balance, lowest_balance
+    FROM account_statistics
+    """)
+
+# Only ledger rows and accounts above the marks: primary key range scans
+register('dashboard_ledger_delta', """
+    SELECT a.account_type, t.transaction_type,
+           CASE a.status WHEN 'Active' THEN 1 ELSE 0 END AS active,
+           COUNT(*), NVL(SUM(t.amount), 0), MAX(t.transaction_id)
+    FROM Transactions t
+    JOIN Accounts a ON a.account_id = t.account_id
+    WHERE t.transaction_id > :since
+    GROUP BY a.account_type, t.transaction_type,
+             CASE a.status WHEN 'Active' THEN 1 ELSE 0 END
+    """)
+
+register('dashboard_new_accounts', """
+    SELECT account_type, SUM(CASE status WHEN 'Active' THEN 1 ELSE 0 END), MAX(account_id)
+    FROM Accounts
+    WHERE account_id > :since
+    GROUP BY account_type
+    """)
+
+# --- ledger archive job ---
+
+register('archive_next_batch', """
+    SELECT transaction_date, transaction_id FROM Transactions
+    WHERE transaction_date < :cutoff
+    ORDER BY transaction_date, transaction_id
+    FETCH FIRST :batch_size ROWS ONLY
+    """)
+
+# Rows up to and including the (transaction_date, transaction_id) key of
+# the batch's last row; the same predicate drives the copy and the delete
+_ARCHIVE_BATCH_FILTER = """
+    WHERE transaction_date <= :last_date
+      AND (transaction_date < :last_date OR transaction_id <= :last_id)
+    """
+
+_LEDGER_COLUMNS = ('transaction_id, account_id, transaction_type, amount, balance_after, '
+                   'transaction_date, description, reference_account')
+
+register('archive_copy_batch',
+         f"INSERT INTO Transactions_Archive ({_LEDGER_COLUMNS}) "
+         f"SELECT {_LEDGER_COLUMNS} FROM Transactions {_ARCHIVE_BATCH_FILTER}")
+
+register('archive_delete_batch', f"DELETE FROM Transactions {_ARCHIVE_BATCH_FILTER}")
+
+# --- backend helpers (allocate_ids / lock_tables / lock_accounts) ---
+
+# One fixed text per sequence and per lockable table (Oracle only)
+for _sequence in ('customer_seq', 'account_seq', 'transaction_seq'):
+    register('allocate_' + _sequence,
+             f"SELECT {_sequence}.NEXTVAL FROM DUAL CONNECT BY LEVEL <= :count")
+
+for _table in ('Accounts', 'Transactions', 'Transactions_Archive'):
+    register('lock_table_' + _table.lower(), f"LOCK TABLE {_table} IN SHARE MODE")
+
+register('lock_accounts_resolve', """
+    SELECT account_id FROM Accounts
+    WHERE account_number IN (SELECT column_value FROM TABLE(:numbers))
+      AND status = 'Active'
+    ORDER BY account_id
+    """)
+
+# One row lock per statement, in the order of :ids (Oracle only)
+register('lock_accounts_in_order', """
+    DECLARE
+        v_ids SYS.ODCINUMBERLIST := :ids;
+        v_id NUMBER;
+    BEGIN
+        FOR i IN 1 .. v_ids.COUNT LOOP
+            SELECT account_id INTO v_id FROM Accounts
+            WHERE account_id = v_ids(i)
+            FOR UPDATE;
+        END LOOP;
+    END;
+    """)
+
+register('locked_accounts', """
+    SELECT account_number, account_id, balance FROM Accounts
+    WHERE account_id IN (SELECT column_value FROM TABLE(:ids))
+      AND status = 'Active'
+    """)
+
+# SQLite's lock_accounts: the database write lock is already held
+register('locked_accounts_by_number', """
+    SELECT account_number, account_id, balance FROM Accounts
+    WHERE account_number IN (SELECT column_value FROM TABLE(:numbers))
+      AND status = 'Active'
+    ORDER BY account_id
+    """)
+
+# --- statement diagnostics (Oracle only) ---
+
+register('statement_parse_counts', """
+    SELECT REGEXP_SUBSTR(sql_text, 'bank:(\\w+)', 1, 1, NULL, 1) AS name,
+           SUM(parse_calls), SUM(loads), SUM(executions)
+    FROM V$SQLAREA
+    WHERE sql_text LIKE '/* bank:%'
+    GROUP BY REGEXP_SUBSTR(sql_text, 'bank:(\\w+)', 1, 1, NULL, 1)
+    """)
+
+# The catalog, the procedure calls (open/deposit/withdraw/transfer/post_many)
+# and room for ad-hoc tools sharing the connection
+STATEMENT_CACHE_SIZE = len(STATEMENTS) + 16
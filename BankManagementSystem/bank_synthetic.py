@@ -0,0 +1,112 @@
+"""
+Bank Account Management System - Synthetic Bank Generator
+Populates a database with customers, accounts and history at a chosen scale
+
+Rows are generated customer-chunk by customer-chunk and loaded with
+executemany, so memory stays bounded at any scale. Balances are
+consistent: every account's balance equals the balance_after of its
+latest transaction, and the aggregate triggers keep the counters right.
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import Dict
+
+from bank_database import BankDatabase
+
+ACCOUNT_TYPES = [('Savings', 4.00), ('Current', 0.00), ('Fixed Deposit', 6.50)]
+
+
+def populate(db: BankDatabase, customers: int = 1000, accounts_per_customer: int = 3,
+             transactions_per_account: int = 30, history_days: int = 730,
+             chunk_customers: int = 500, seed: int = 42) -> Dict:
+    """Add a synthetic population to db and return the number of rows created"""
+    rng = random.Random(seed)
+    backend = db.backend
+    insert_customer = backend.prepare("""
+        INSERT INTO Customers
+        (customer_id, full_name, email, phone, address, date_of_birth,
+         created_date, password_hash, status)
+        VALUES (:customer_id, :full_name, :email, :phone, :address, :dob,
+                :created, :password, 'Active')
+        """)
+    insert_account = backend.prepare("""
+        INSERT INTO Accounts
+        (account_id, customer_id, account_number, account_type, balance,
+         interest_rate, created_date, status)
+        VALUES (:account_id, :customer_id, :account_number, :account_type, :balance,
+                :interest_rate, :created, 'Active')
+        """)
+    insert_transaction = backend.prepare("""
+        INSERT INTO Transactions
+        (transaction_id, account_id, transaction_type, amount, balance_after,
+         transaction_date, description, reference_account)
+        VALUES (:transaction_id, :account_id, :transaction_type, :amount,
+                :balance_after, :transaction_date, :description, NULL)
+        """)
+    now = datetime.now().replace(microsecond=0)
+    counts = {'customers': 0, 'accounts': 0, 'transactions': 0}
+
+    with backend.session() as (connection, cursor):
+        for chunk_start in range(0, customers, chunk_customers):
+            chunk = min(chunk_customers, customers - chunk_start)
+            customer_ids = backend.allocate_ids(cursor, 'customer_seq', chunk)
+            account_ids = iter(backend.allocate_ids(cursor, 'account_seq',
+                                                    chunk * accounts_per_customer))
+            transaction_ids = iter(backend.allocate_ids(
+                cursor, 'transaction_seq',
+                chunk * accounts_per_customer * transactions_per_account))
+            customer_rows, account_rows, transaction_rows = [], [], []
+
+            for customer_id in customer_ids:
+                customer_rows.append({
+                    'customer_id': customer_id,
+                    'full_name': f"Customer {customer_id}",
+                    'email': f"customer{customer_id}@synthetic.bank",
+                    'phone': f"9{customer_id:09d}"[-10:],
+                    'address': rng.choice(['Mumbai', 'Delhi', 'Bangalore', 'Hyderabad', 'Pune']),
+                    'dob': datetime(1950, 1, 1) + timedelta(days=rng.randrange(20000)),
+                    'created': now - timedelta(days=history_days + 1),
+                    'password': 'synthetic'
+                })
+                for _ in range(accounts_per_customer):
+                    account_id = next(account_ids)
+                    account_type, interest_rate = rng.choice(ACCOUNT_TYPES)
+                    balance = float(rng.randrange(1000, 100000))
+                    offsets = sorted(rng.randrange(history_days * 86400)
+                                     for _ in range(transactions_per_account))
+                    for offset in offsets:
+                        amount = float(rng.randrange(100, 20000))
+                        if rng.random() < 0.5 or balance < amount:
+                            transaction_type = 'Deposit'
+                            balance += amount
+                        else:
+                            transaction_type = 'Withdrawal'
+                            balance -= amount
+                        transaction_rows.append({
+                            'transaction_id': next(transaction_ids),
+                            'account_id': account_id,
+                            'transaction_type': transaction_type,
+                            'amount': amount,
+                            'balance_after': balance,
+                            'transaction_date': now - timedelta(days=history_days, seconds=-offset),
+                            'description': f"Synthetic {transaction_type.lower()}"
+                        })
+                    account_rows.append({
+                        'account_id': account_id,
+                        'customer_id': customer_id,
+                        'account_number': 'ACC' + str(account_id).rjust(10, '0'),
+                        'account_type': account_type,
+                        'balance': balance,
+                        'interest_rate': interest_rate,
+                        'created': now - timedelta(days=history_days + 1)
+                    })
+
+            cursor.executemany(insert_customer, customer_rows)
+            cursor.executemany(insert_account, account_rows)
+            cursor.executemany(insert_transaction, transaction_rows)
+            connection.commit()
+            counts['customers'] += len(customer_rows)
+            counts['accounts'] += len(account_rows)
+            counts['transactions'] += len(transaction_rows)
+    return counts
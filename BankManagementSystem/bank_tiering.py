@@ -0,0 +1,144 @@
+"""
+Bank Account Management System - Ledger Tiering Benchmark
+Hot-path history latency as the ledger grows, with and without the archive
+
+Each scale generates the same customers and accounts with history_days and
+transactions_per_account multiplied by the scale, so every account keeps
+about the same number of rows inside the hot horizon while the ledger
+grows. The history reads are timed on the untiered ledger, then
+archive_transactions() runs and they are timed again. The run fails if
+tiered hot-path latency grows by more than --max-growth from the smallest
+to the largest scale.
+
+Usage:
+    python bank_tiering.py --scales 1 10 100
+"""
+
+import argparse
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from bank_backends import SQLiteBackend
+from bank_bench import summarize
+from bank_database import BankDatabase
+from bank_metrics import configure_logging
+from bank_synthetic import populate
+
+# The hot path: what the GUI and statements read on every visit
+HOT_READS = ('mini_statement', 'first_page')
+
+
+def history_cases(db: BankDatabase, accounts: List[str], rng: random.Random) -> Dict[str, Callable]:
+    def account():
+        return rng.choice(accounts)
+
+    return {
+        'mini_statement': lambda: db.get_mini_statement(account()),
+        'first_page': lambda: next(db.iter_transaction_pages(account(), page_size=10), None),
+        # Longer than the hot tier holds, so it continues into the archive
+        'history_50': lambda: db.get_transaction_history(account(), limit=50),
+    }
+
+
+def time_cases(cases: Dict[str, Callable], iterations: int) -> Dict[str, Dict]:
+    results = {}
+    for name, call in cases.items():
+        for _ in range(10):
+            call()
+        samples = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            call()
+            samples.append(time.perf_counter() - started)
+        results[name] = summarize(samples)
+    return results
+
+
+def run_scale(directory: str, scale: int, customers: int, transactions_per_account: int,
+              history_days: int, horizon_days: int, iterations: int) -> Dict:
+    """Generate one ledger size, time the reads untiered, archive, time them again"""
+    db = BankDatabase(backend=SQLiteBackend(os.path.join(directory, f'tiering_{scale}x.db')),
+                      metrics=False)
+    db.connect()
+    try:
+        counts = populate(db, customers=customers, accounts_per_customer=2,
+                          transactions_per_account=transactions_per_account * scale,
+                          history_days=history_days * scale)
+        with db.backend.session() as (connection, cursor):
+            cursor.execute("ANALYZE")
+            cursor.execute("SELECT account_number FROM Accounts WHERE account_number LIKE 'ACC%'")
+            accounts = [row[0] for row in cursor.fetchall()]
+        untiered = time_cases(history_cases(db, accounts, random.Random(scale)), iterations)
+        archived = db.archive_transactions(horizon_days=horizon_days)
+        with db.backend.session() as (connection, cursor):
+            cursor.execute("ANALYZE")
+            cursor.execute("SELECT COUNT(*) FROM Transactions")
+            (hot_rows,) = cursor.fetchone()
+        tiered = time_cases(history_cases(db, accounts, random.Random(scale)), iterations)
+    finally:
+        db.disconnect()
+    return {
+        'scale': scale,
+        'ledger_rows': counts['transactions'],
+        'hot_rows': hot_rows,
+        'archive_rows_per_second': archived['rows_per_second'],
+        'untiered': untiered,
+        'tiered': tiered,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hot-path history latency vs ledger size")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--customers', type=int, default=250)
+    parser.add_argument('--transactions-per-account', type=int, default=20,
+                        help="history rows per account at scale 1")
+    parser.add_argument('--history-days', type=int, default=120,
+                        help="days of history at scale 1")
+    parser.add_argument('--horizon-days', type=int, default=90)
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--max-growth', type=float, default=0.5,
+                        help="allowed tiered hot-path p50 growth, smallest to largest scale")
+    args = parser.parse_args()
+    # Benchmark output only; the operations' own log lines are noise here
+    configure_logging(logging.CRITICAL)
+
+    directory = tempfile.mkdtemp(prefix='bms_tiering_')
+    runs = []
+    try:
+        for scale in sorted(args.scales):
+            started = time.perf_counter()
+            run = run_scale(directory, scale, args.customers, args.transactions_per_account,
+                            args.history_days, args.horizon_days, args.iterations)
+            runs.append(run)
+            print(f"{scale:>4}x  {run['ledger_rows']:>10,} rows, {run['hot_rows']:>8,} hot "
+                  f"({time.perf_counter() - started:.0f}s to build and measure)")
+            for name in run['tiered']:
+                before, after = run['untiered'][name], run['tiered'][name]
+                print(f"      {name:<16} untiered p50 {before['p50_ms']:7.3f} ms  "
+                      f"p95 {before['p95_ms']:7.3f} ms   tiered p50 {after['p50_ms']:7.3f} ms  "
+                      f"p95 {after['p95_ms']:7.3f} ms")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    if len(runs) < 2:
+        return 0
+    ok = True
+    for name in HOT_READS:
+        first, last = runs[0]['tiered'][name]['p50_ms'], runs[-1]['tiered'][name]['p50_ms']
+        growth = last / first - 1
+        flat = growth <= args.max_growth
+        ok = ok and flat
+        print(f"{'✅' if flat else '❌'} {name}: tiered p50 {first:.3f} -> {last:.3f} ms "
+              f"({growth:+.0%}) from {runs[0]['scale']}x to {runs[-1]['scale']}x")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""
+Bank Account Management System - GUI Worker Pool
+Runs database calls off the Tk thread and delivers results back to it
+
+Calls are submitted to a thread pool; the Tk thread polls finished futures
+with root.after() and runs their callbacks, so widgets are only ever
+touched from the event loop. Screen-bound requests are dropped when the
+user navigates away (cancel_stale), and keyed requests are refused while
+one with the same key is still in flight, so a double-click cannot post
+the same transfer twice.
+
+Usage (headless responsiveness check, no display needed):
+    python bank_worker.py
+"""
+
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, List, Optional
+
+from bank_metrics import log_event
+
+log = logging.getLogger('bank.worker')
+
+
+class DbWorker:
+    """Thread pool for database calls whose results come back via root.after"""
+
+    def __init__(self, root, max_workers: int = 4, poll_ms: int = 30):
+        self.root = root
+        self.poll_ms = poll_ms
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='bank-db')
+        self._pending: List[Dict] = []
+        self._keys = set()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._polling = False
+        self._closed = False
+
+    def submit(self, call: Callable, *args, on_done: Callable = None,
+               on_error: Callable = None, key: Hashable = None,
+               screen_bound: bool = True, **kwargs) -> Optional[Future]:
+        """Run call(*args, **kwargs) on the pool; None if key is already in flight
+
+        on_done(result) / on_error(exception) run on the Tk thread. A
+        screen-bound request is discarded by cancel_stale(); writes should
+        pass screen_bound=False so their outcome is always reported.
+        """
+        if self._closed:
+            return None
+        with self._lock:
+            if key is not None and key in self._keys:
+                return None
+            if key is not None:
+                self._keys.add(key)
+        future = self._executor.submit(call, *args, **kwargs)
+        self._pending.append({
+            'future': future,
+            'call': getattr(call, '__name__', repr(call)),
+            'on_done': on_done,
+            'on_error': on_error,
+            'key': key,
+            'generation': self._generation if screen_bound else None
+        })
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_ms, self._poll)
+        return future
+
+    @property
+    def generation(self) -> int:
+        """Bumped by cancel_stale(); compare to tell if the screen has changed"""
+        return self._generation
+
+    def busy(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._keys
+
+    def cancel_stale(self):
+        """Drop every screen-bound request; called when the screen changes"""
+        self._generation += 1
+        for request in self._pending:
+            if request['generation'] is not None:
+                request['future'].cancel()
+
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def shutdown(self):
+        self._closed = True
+        self.cancel_stale()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _poll(self):
+        finished = [request for request in self._pending if request['future'].done()]
+        self._pending = [request for request in self._pending if not request['future'].done()]
+        for request in finished:
+            if request['key'] is not None:
+                with self._lock:
+                    self._keys.discard(request['key'])
+            self._deliver(request)
+        if self._pending and not self._closed:
+            self.root.after(self.poll_ms, self._poll)
+        else:
+            self._polling = False
+
+    def _deliver(self, request: Dict):
+        future = request['future']
+        stale = (request['generation'] is not None
+                 and request['generation'] != self._generation)
+        if future.cancelled() or stale or self._closed:
+            return
+        error = future.exception()
+        if error is not None:
+            if request['on_error']:
+                request['on_error'](error)
+            else:
+                log_event(log, logging.ERROR, 'background_call_failed',
+                          "Background database call {call} failed: {error}",
+                          call=request['call'], error=str(error))
+        elif request['on_done']:
+            request['on_done'](future.result())
+
+
+def check_responsiveness(slow_seconds: float = 1.0, tick_ms: int = 10) -> Dict:
+    """Run a slow database call while timing the gaps between event-loop ticks
+
+    Uses a bare Tcl interpreter, so it needs no display. Also checks that a
+    keyed duplicate is refused and that a stale request's callback never runs.
+    """
+    import tkinter
+    from bank_backends import SQLiteBackend
+    from bank_database import BankDatabase
+
+    root = tkinter.Tcl()
+    worker = DbWorker(root)
+    db = BankDatabase(backend=SQLiteBackend())
+    db.connect()
+    state = {'result': None, 'done': False, 'stale_called': False,
+             'max_gap': 0.0, 'ticks': 0, 'last_tick': time.perf_counter()}
+
+    def slow_stats():
+        time.sleep(slow_seconds)
+        return db.get_bank_stats()
+
+    def on_done(stats):
+        state['result'] = stats
+        state['done'] = True
+
+    def tick():
+        now = time.perf_counter()
+        state['max_gap'] = max(state['max_gap'], now - state['last_tick'])
+        state['last_tick'] = now
+        state['ticks'] += 1
+        if not state['done']:
+            root.after(tick_ms, tick)
+
+    def stale_done(_):
+        state['stale_called'] = True
+
+    worker.submit(time.sleep, slow_seconds / 2, on_done=stale_done)
+    worker.cancel_stale()
+    first = worker.submit(slow_stats, on_done=on_done, key='stats')
+    duplicate = worker.submit(slow_stats, on_done=on_done, key='stats')
+    started = time.perf_counter()
+    root.after(tick_ms, tick)
+    while not state['done'] and time.perf_counter() - started < slow_seconds * 10:
+        root.dooneevent()
+    worker.shutdown()
+    db.disconnect()
+    return {
+        'elapsed_seconds': time.perf_counter() - started,
+        'ticks': state['ticks'],
+        'max_tick_gap_ms': state['max_gap'] * 1000,
+        'result_delivered': state['result'] is not None,
+        'duplicate_refused': first is not None and duplicate is None,
+        'stale_dropped': not state['stale_called']
+    }
+
+
+if __name__ == "__main__":
+    report = check_responsiveness()
+    responsive = report['max_tick_gap_ms'] < 250
+    print(f"   {'✅' if responsive else '❌'} Event loop ticked {report['ticks']} times during "
+          f"a {report['elapsed_seconds']:.2f}s call (worst gap {report['max_tick_gap_ms']:.0f} ms)")
+    print(f"   {'✅' if report['result_delivered'] else '❌'} Result delivered on the loop thread")
+    print(f"   {'✅' if report['duplicate_refused'] else '❌'} Duplicate keyed request refused")
+    print(f"   {'✅' if report['stale_dropped'] else '❌'} Stale request dropped")
+    ok = (responsive and report['result_delivered'] and report['duplicate_refused']
+          and report['stale_dropped'])
+    sys.exit(0 if ok else 1)